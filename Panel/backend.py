@@ -17,6 +17,8 @@ from typing import Any, Dict, List, Optional
 from concurrent.futures import ProcessPoolExecutor, TimeoutError
 import traceback
 
+from tool_worker import init_tool_worker, run_connector_call, run_connector_call_once
+
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, Query, Depends, Body
 from fastapi.middleware.cors import CORSMiddleware
@@ -123,12 +125,34 @@ cache_client = redis_client if _has_redis else SimpleCache()
 class ToolExecutionIsolator:
     """Opus Pattern: Isolates tool execution in separate processes to prevent crashes"""
 
-    def __init__(self, max_workers: int = 2, timeout: int = 15):
-        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+    def __init__(self, max_workers: int = 2, timeout: int = 15, warm_workers: Optional[bool] = None):
+        # Worker-initializer mode: each worker keeps one event loop + warm connector
+        if warm_workers is None:
+            warm_workers = os.getenv("TOOL_WORKER_WARM", "1").lower() not in ("0", "false", "no")
+        self.warm_workers = warm_workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_tool_worker if warm_workers else None
+        )
         self.timeout = timeout
         self.failure_count = {}
         self.circuit_breaker_threshold = 3
 
+    def __getstate__(self):
+        # Only worker-side settings cross the process boundary (executor is not picklable)
+        return {"timeout": self.timeout, "warm_workers": self.warm_workers}
+
+    def _run_connector(self, call):
+        """Run a RealLegalAPIConnector coroutine inside the worker process"""
+        if self.warm_workers:
+            return run_connector_call(call)
+        return run_connector_call_once(call)
+
+    @staticmethod
+    def _connector_kwargs(args: Dict[str, Any], *consumed: str) -> Dict[str, Any]:
+        """Remaining args for **kwargs, minus those already passed explicitly"""
+        return {k: v for k, v in args.items() if k not in consumed}
+
     async def execute_tool_safely(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """
         Opus Pattern: Execute tool in isolated process with circuit breaker
@@ -202,29 +226,15 @@ class ToolExecutionIsolator:
     def _real_yargitay_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Real Yargıtay API connection - NOW USING REAL API CONNECTOR"""
         try:
-            # Import real API connector
-            import sys
-            import os
-            sys.path.append(os.path.dirname(__file__))
-            from real_api_connector import real_api_connector
-            
-            # Use real API connector
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(
-                    real_api_connector.search_yargitay_real(
-                        keyword=args.get("keyword", ""),
-                        page_size=args.get("page_size", 10),
-                        **args
-                    )
+            result = self._run_connector(
+                lambda connector: connector.search_yargitay_real(
+                    keyword=args.get("keyword", ""),
+                    page_size=args.get("page_size", 10),
+                    **self._connector_kwargs(args, "keyword", "page_size")
                 )
-                return {"success": True, "data": result}
-            finally:
-                loop.close()
-                
+            )
+            return {"success": True, "data": result}
+
         except Exception as e:
             logger.error(f"Real Yargıtay API error: {str(e)}")
             # Fallback to enhanced mock
@@ -233,27 +243,15 @@ class ToolExecutionIsolator:
     def _real_danistay_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Real Danıştay API connection - NOW USING REAL API CONNECTOR"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(__file__))
-            from real_api_connector import real_api_connector
-            
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(
-                    real_api_connector.search_danistay_real(
-                        keyword=args.get("keyword", ""),
-                        page_size=args.get("page_size", 10),
-                        **args
-                    )
+            result = self._run_connector(
+                lambda connector: connector.search_danistay_real(
+                    keyword=args.get("keyword", ""),
+                    page_size=args.get("page_size", 10),
+                    **self._connector_kwargs(args, "keyword", "page_size")
                 )
-                return {"success": True, "data": result}
-            finally:
-                loop.close()
-                
+            )
+            return {"success": True, "data": result}
+
         except Exception as e:
             logger.error(f"Real Danıştay API error: {str(e)}")
             return self._fallback_danistay_search(args)
@@ -261,27 +259,15 @@ class ToolExecutionIsolator:
     def _real_emsal_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Real UYAP Emsal API connection - NOW USING REAL API CONNECTOR"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(__file__))
-            from real_api_connector import real_api_connector
-            
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(
-                    real_api_connector.search_uyap_emsal_real(
-                        keyword=args.get("keyword", ""),
-                        page_size=args.get("results_per_page", 10),
-                        **args
-                    )
+            result = self._run_connector(
+                lambda connector: connector.search_uyap_emsal_real(
+                    keyword=args.get("keyword", ""),
+                    page_size=args.get("results_per_page", 10),
+                    **self._connector_kwargs(args, "keyword", "results_per_page")
                 )
-                return {"success": True, "data": result}
-            finally:
-                loop.close()
-                
+            )
+            return {"success": True, "data": result}
+
         except Exception as e:
             logger.error(f"Real UYAP Emsal API error: {str(e)}")
             return {"success": False, "error": str(e)}
@@ -289,27 +275,15 @@ class ToolExecutionIsolator:
     def _real_bedesten_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Real Bedesten Unified API connection - NOW USING REAL API CONNECTOR"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(__file__))
-            from real_api_connector import real_api_connector
-            
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(
-                    real_api_connector.search_bedesten_unified_real(
-                        phrase=args.get("phrase", ""),
-                        page_size=args.get("pageSize", 20),
-                        **args
-                    )
+            result = self._run_connector(
+                lambda connector: connector.search_bedesten_unified_real(
+                    phrase=args.get("phrase", ""),
+                    page_size=args.get("pageSize", 20),
+                    **self._connector_kwargs(args, "phrase", "pageSize")
                 )
-                return {"success": True, "data": result}
-            finally:
-                loop.close()
-                
+            )
+            return {"success": True, "data": result}
+
         except Exception as e:
             logger.error(f"Real Bedesten API error: {str(e)}")
             return {"success": False, "error": str(e)}
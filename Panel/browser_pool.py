@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Warm Playwright browser pool for the HTML proxy fallbacks.
+
+Launching Chromium for every fallback call costs seconds and hundreds of
+MB. BrowserPool keeps N browsers running, each serving a few leases at a
+time, and hands out pages through a lease:
+
+    async with browser_pool.lease() as page:
+        await page.goto(url)
+
+- every lease gets a new browser context, closed on release, so cookies,
+  storage and cache never carry over from one caller to the next (a context
+  is cheap next to a browser launch); a disconnected browser is relaunched
+- callers queue FIFO for a free slot; waiting longer than `lease_timeout`
+  raises BrowserPoolTimeout
+- the pool starts lazily on first lease, or eagerly from the app lifespan; a
+  start that fails partway closes whatever it had already launched
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+try:
+    from playwright.async_api import async_playwright  # type: ignore
+    _has_playwright = True
+except Exception:
+    async_playwright = None  # type: ignore
+    _has_playwright = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAUNCH_ARGS = ["--no-sandbox", "--disable-dev-shm-usage"]
+DEFAULT_CONTEXT_OPTIONS = {
+    "locale": "tr-TR",
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36",
+}
+
+
+class BrowserPoolTimeout(TimeoutError):
+    """No browser context became free within the lease timeout"""
+
+
+class _ContextSlot:
+    """One concurrent lease on a pooled browser"""
+
+    def __init__(self, browser_index: int):
+        self.browser_index = browser_index
+
+
+class BrowserPool:
+    def __init__(self, size: int = 2, contexts_per_browser: int = 2,
+                 lease_timeout: float = 20.0, launch_args: Optional[List[str]] = None,
+                 context_options: Optional[Dict[str, Any]] = None):
+        self.size = size
+        self.contexts_per_browser = contexts_per_browser
+        self.lease_timeout = lease_timeout
+        self.launch_args = launch_args or DEFAULT_LAUNCH_ARGS
+        self.context_options = context_options or DEFAULT_CONTEXT_OPTIONS
+
+        self._playwright = None
+        self._browsers: List[Any] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        self._started = False
+
+        self.leases = 0
+        self.lease_timeouts = 0
+        self.waiting = 0
+        self.in_use = 0
+        self.contexts_created = 0
+        self.browsers_launched = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def available(self) -> bool:
+        return _has_playwright
+
+    async def start(self):
+        """Launch the browsers (idempotent); each lease creates its own context"""
+        async with self._start_lock:
+            if self._started:
+                return
+            if not _has_playwright:
+                raise RuntimeError("Playwright kurulu değil. Kur: pip install playwright && python -m playwright install --with-deps chromium")
+            self._playwright = await async_playwright().start()
+            try:
+                for _ in range(self.size):
+                    self._browsers.append(await self._launch())
+            except BaseException:
+                await self._close_all()
+                raise
+            self._idle = asyncio.Queue()
+            for index in range(self.size):
+                for _ in range(self.contexts_per_browser):
+                    self._idle.put_nowait(_ContextSlot(index))
+            self._started = True
+            logger.info(f"Browser pool started: {self.size} browsers x {self.contexts_per_browser} contexts")
+
+    async def stop(self):
+        async with self._start_lock:
+            if not self._started:
+                return
+            self._started = False
+            await self._close_all()
+            logger.info("Browser pool stopped")
+
+    async def _close_all(self):
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers = []
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    async def _launch(self):
+        self.browsers_launched += 1
+        return await self._playwright.chromium.launch(headless=True, args=self.launch_args)
+
+    async def _new_context(self, slot: _ContextSlot):
+        browser = self._browsers[slot.browser_index]
+        if not browser.is_connected():
+            logger.warning(f"Pooled browser {slot.browser_index} disconnected - relaunching")
+            browser = self._browsers[slot.browser_index] = await self._launch()
+        context = await browser.new_context(**self.context_options)
+        self.contexts_created += 1
+        return context
+
+    @asynccontextmanager
+    async def lease(self, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """Borrow a page in a new context on a warm browser; the context is closed on release"""
+        if not self._started:
+            await self.start()
+
+        queued = time.monotonic()
+        self.waiting += 1
+        try:
+            slot = await asyncio.wait_for(self._idle.get(), timeout or self.lease_timeout)
+        except asyncio.TimeoutError:
+            self.lease_timeouts += 1
+            raise BrowserPoolTimeout(f"No browser context free within {timeout or self.lease_timeout:.1f}s")
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - queued
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+        self.in_use += 1
+        self.leases += 1
+        context = None
+        try:
+            context = await self._new_context(slot)
+            yield await context.new_page()
+        finally:
+            if context is not None:
+                try:
+                    # Drops the page along with the lease's cookies, storage and cache
+                    await context.close()
+                except Exception:
+                    pass
+            self.in_use -= 1
+            self._idle.put_nowait(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "available": _has_playwright,
+            "started": self._started,
+            "browsers": self.size,
+            "contexts": self.size * self.contexts_per_browser,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "leases": self.leases,
+            "lease_timeouts": self.lease_timeouts,
+            "avg_wait_ms": round(self._wait_total / self.leases * 1000, 1) if self.leases else 0.0,
+            "max_wait_ms": round(self._wait_max * 1000, 1),
+            "contexts_created": self.contexts_created,
+            "browsers_launched": self.browsers_launched,
+        }
+
+
+# Process-wide pool shared by the proxy fallbacks
+browser_pool = BrowserPool(
+    size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+    contexts_per_browser=int(os.getenv("BROWSER_POOL_CONTEXTS", "2")),
+    lease_timeout=float(os.getenv("BROWSER_LEASE_TIMEOUT", "20"))
+)
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Direct JSON client for the Yargıtay Karar Arama and UYAP Emsal sites.
+
+Both search pages are thin shells over two JSON endpoints, which the
+Selenium scrapers drive by clicking table rows and reading #kararAlani:
+
+    POST /aramadetaylist   {"data": {"arananKelime": ..., "pageSize": n, "pageNumber": p}}
+         -> {"data": {"data": [{"id", "daire", "esasNo", "kararNo", "kararTarihi", ...}],
+                      "recordsTotal": n}}
+    GET  /getDokuman?id=…  -> {"data": "<decision html>"}
+
+CourtJsonClient calls them directly:
+- a browser (from webdriver_pool) is used only to bootstrap the session
+  cookies; without Selenium a plain GET of the home page does the same
+- result pages are fetched in parallel through pagination.fan_out_pages and
+  decision texts concurrently; every request takes its slot from the shared
+  per-host rate limiter, so the site sees the same request rate as before -
+  only the per-decision click, render and scroll time is gone
+- requests in flight are capped at the host's burst (DECISION_FETCH_CONCURRENCY
+  at most): more would only queue inside the limiter. Requests wait for their
+  slot however long the queue is (these are background jobs) and 429/503 or
+  transport errors are retried COURT_JSON_RETRIES times with backoff
+- texts that still fail are reported: the decision gets `karar_metni_hatasi`
+  and its id lands in `failed_documents`; failed pages go to `on_page_failed`
+  and `failed_pages` instead of being delivered as empty pages
+- a non-JSON answer (captcha, maintenance page, changed API) raises
+  CourtJsonError so callers can fall back to the Selenium path
+
+The client keeps its own cookie jar: these cookies belong to one scraping job
+and must not go into the shared http_clients.
+"""
+
+import asyncio
+import html
+import logging
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from http_clients import DEFAULT_TIMEOUT
+from pagination import PAGINATION_CONCURRENCY, fan_out_pages
+from rate_limiter import RateLimitedError, parse_retry_after, rate_limits
+
+try:
+    from bs4 import BeautifulSoup  # type: ignore
+    _has_bs4 = True
+except ImportError:
+    BeautifulSoup = None  # type: ignore
+    _has_bs4 = False
+
+logger = logging.getLogger(__name__)
+
+COURT_SITES = {
+    "yargitay": "https://karararama.yargitay.gov.tr",
+    "uyap": "https://emsal.uyap.gov.tr",
+}
+SITE_NAMES = {"yargitay": "Yargıtay", "uyap": "UYAP"}
+
+DECISION_FETCH_CONCURRENCY = int(os.getenv("DECISION_FETCH_CONCURRENCY", "8"))
+DECISION_PAGE_SIZE = int(os.getenv("DECISION_PAGE_SIZE", "10"))
+COURT_JSON_RETRIES = int(os.getenv("COURT_JSON_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("COURT_JSON_RETRY_BACKOFF", "2"))
+BROWSER_BOOTSTRAP = os.getenv("COURT_JSON_BROWSER_BOOTSTRAP", "1").lower() not in ("0", "false", "no")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+class CourtJsonError(Exception):
+    """The JSON endpoints did not answer with the expected JSON"""
+
+
+def html_to_text(markup: str) -> str:
+    if _has_bs4:
+        return BeautifulSoup(markup, "html.parser").get_text("\n", strip=True)
+    text = _TAG_RE.sub("\n", re.sub(r"(?i)<br\s*/?>", "\n", markup))
+    return _BLANK_LINES_RE.sub("\n", html.unescape(text)).strip()
+
+
+class CourtJsonClient:
+    def __init__(self, site: str, concurrency: int = DECISION_FETCH_CONCURRENCY,
+                 page_size: int = DECISION_PAGE_SIZE, timeout: httpx.Timeout = DEFAULT_TIMEOUT):
+        if site not in COURT_SITES:
+            raise ValueError(f"Unknown court site: {site}")
+        self.site = site
+        self.base_url = COURT_SITES[site]
+        self.page_size = page_size
+        # More requests in flight than the host's burst would only queue inside the limiter
+        burst = rate_limits.bucket(self.base_url).burst
+        self.concurrency = max(1, min(concurrency, burst))
+        self.page_concurrency = max(1, min(PAGINATION_CONCURRENCY, burst))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            follow_redirects=True,
+            headers={
+                "Accept": "application/json, text/plain, */*",
+                "Accept-Language": "tr-TR,tr;q=0.9",
+                "X-Requested-With": "XMLHttpRequest",
+            },
+            event_hooks={"request": [self._on_request], "response": [self._on_response]}
+        )
+        self.documents_fetched = 0
+        self.documents_failed = 0
+        self.retries = 0
+        self.failed_documents: List[str] = []
+        self.failed_pages: List[int] = []
+
+    async def __aenter__(self) -> "CourtJsonClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+
+    async def _on_request(self, request: httpx.Request):
+        # Background scraping: wait for the slot instead of failing with RateLimitedError
+        await rate_limits.acquire(self.base_url)
+
+    async def _on_response(self, response: httpx.Response):
+        await rate_limits.feedback(self.base_url, response.status_code, response.headers.get("Retry-After"))
+
+    # ------------------------------------------------------------------
+    # Session bootstrap
+    # ------------------------------------------------------------------
+
+    def _browser_session(self, headless: bool) -> Tuple[List[Dict[str, Any]], str]:
+        from webdriver_pool import webdriver_pool
+        with webdriver_pool.lease(headless, start_url=self.base_url + "/") as driver:
+            return driver.get_cookies(), driver.execute_script("return navigator.userAgent")
+
+    async def bootstrap(self, headless: bool = True):
+        """Obtain the site's session cookies (browser when available, else a plain GET)"""
+        if BROWSER_BOOTSTRAP:
+            try:
+                cookies, user_agent = await asyncio.to_thread(self._browser_session, headless)
+                for cookie in cookies:
+                    self._client.cookies.set(cookie["name"], cookie["value"],
+                                             domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+                self._client.headers["User-Agent"] = user_agent
+                logger.info(f"{self.site}: session bootstrapped from browser ({len(cookies)} cookies)")
+                return
+            except Exception as e:
+                logger.warning(f"{self.site}: browser bootstrap failed, using plain GET: {e}")
+        from webdriver_pool import DEFAULT_USER_AGENT
+        self._client.headers["User-Agent"] = DEFAULT_USER_AGENT
+        response = await self._client.get("/")
+        if response.status_code >= 400:
+            raise CourtJsonError(f"{self.site}: home page returned HTTP {response.status_code}")
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Rate-limited request; throttling answers and transport errors are retried with backoff"""
+        for attempt in range(COURT_JSON_RETRIES + 1):
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == COURT_JSON_RETRIES:
+                    raise
+                delay = RETRY_BACKOFF * 2 ** attempt
+                logger.info(f"{self.site}: {url} failed ({e.__class__.__name__}), retrying in {delay:.0f}s")
+            else:
+                if response.status_code not in (429, 503) or attempt == COURT_JSON_RETRIES:
+                    return response
+                # The limiter has already paused the host; this only spaces our own retries
+                delay = parse_retry_after(response.headers.get("Retry-After")) or RETRY_BACKOFF * 2 ** attempt
+                logger.info(f"{self.site}: {url} answered {response.status_code}, retrying in {delay:.0f}s")
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _json(response: httpx.Response) -> Any:
+        if response.status_code >= 400:
+            raise CourtJsonError(f"{response.request.url.path} returned HTTP {response.status_code}")
+        try:
+            return response.json()
+        except ValueError:
+            raise CourtJsonError(f"{response.request.url.path} did not return JSON "
+                                 f"({response.headers.get('content-type', 'unknown')})")
+
+    async def search_page(self, keyword: str, page: int, **filters) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of decision summaries and the total hit count"""
+        payload = {"data": {"arananKelime": keyword, "pageSize": self.page_size, "pageNumber": page, **filters}}
+        body = self._json(await self._request("POST", "/aramadetaylist", json=payload))
+        data = body.get("data") if isinstance(body, dict) else None
+        if not isinstance(data, dict) or not isinstance(data.get("data"), list):
+            raise CourtJsonError(f"{self.site}: unexpected search response shape")
+        items = [self._decision(item, page) for item in data["data"]]
+        return items, int(data.get("recordsTotal") or 0)
+
+    def _decision(self, item: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """Search hit in the field names the Selenium scrapers produce"""
+        return {
+            "document_id": str(item.get("id", "")),
+            "daire": item.get("daire", ""),
+            "esas_no": item.get("esasNo", ""),
+            "karar_no": item.get("kararNo", ""),
+            "karar_tarihi": item.get("kararTarihi", ""),
+            "karar_durumu": item.get("durum", "") or "KESİNLEŞTİ",
+            "sistem": SITE_NAMES[self.site],
+            "sayfa": page,
+        }
+
+    async def document(self, document_id: str) -> str:
+        """Plain text of one decision"""
+        body = self._json(await self._request("GET", "/getDokuman", params={"id": document_id}))
+        markup = body.get("data") if isinstance(body, dict) else None
+        if not isinstance(markup, str):
+            raise CourtJsonError(f"{self.site}: document {document_id} has no content")
+        return html_to_text(markup)
+
+    async def fill_documents(self, decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fetch `karar_metni` for all decisions concurrently; returns the ones whose text failed
+        (marked with `karar_metni_hatasi`)"""
+        failed = []
+
+        async def fill(decision: Dict[str, Any]):
+            try:
+                decision["karar_metni"] = await self.document(decision["document_id"])
+                self.documents_fetched += 1
+            except (CourtJsonError, httpx.HTTPError, RateLimitedError) as e:
+                self.documents_failed += 1
+                self.failed_documents.append(decision["document_id"])
+                decision["karar_metni_hatasi"] = str(e) or e.__class__.__name__
+                failed.append(decision)
+                logger.warning(f"{self.site}: decision {decision.get('esas_no')} text not fetched: {e}")
+        await asyncio.gather(*(fill(d) for d in decisions if d.get("document_id")))
+        return failed
+
+    async def collect(self, keyword: str, max_pages: int, start_page: int = 1, limit: Optional[int] = None,
+                      on_page: Optional[Callable[[int, List[Dict[str, Any]], int], bool]] = None,
+                      on_page_failed: Optional[Callable[[int, Exception], None]] = None) -> List[Dict[str, Any]]:
+        """Pages `start_page`.. with decision texts, fetched in parallel and returned in page order;
+        `on_page` returning False stops early. Pages that fail after the first are reported to
+        `on_page_failed` (and kept in `failed_pages`) instead of `on_page`."""
+        async def fetch(page: int):
+            decisions, total = await self.search_page(keyword, page)
+            if limit is not None:
+                decisions = decisions[:max(0, limit - (page - start_page) * self.page_size)]
+            await self.fill_documents(decisions)
+            return decisions, total
+
+        run = await fan_out_pages(fetch, max_pages, page_size=self.page_size, start_page=start_page,
+                                  limit=limit, concurrency=self.page_concurrency,
+                                  on_page=on_page, on_page_failed=on_page_failed)
+        self.failed_pages.extend(run.failed_pages)
+        return run.items
+
+
+def collect_decisions(site: str, keyword: str, max_pages: int, start_page: int = 1, limit: Optional[int] = None,
+                      headless: bool = True, on_page=None, on_page_failed=None) -> List[Dict[str, Any]]:
+    """Blocking entry point for the scraping threads"""
+    async def run():
+        async with CourtJsonClient(site) as client:
+            try:
+                await client.bootstrap(headless)
+                decisions = await client.collect(keyword, max_pages, start_page, limit, on_page, on_page_failed)
+            except (httpx.HTTPError, RateLimitedError) as e:
+                raise CourtJsonError(f"{site}: {e.__class__.__name__}: {e}") from e
+            if client.failed_pages or client.failed_documents:
+                logger.warning(f"{site}: '{keyword}' collected with {len(client.failed_pages)} failed page(s) "
+                               f"{client.failed_pages} and {len(client.failed_documents)} missing text(s)")
+            return decisions
+    return asyncio.run(run())
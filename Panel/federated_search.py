@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Federated multi-source search with deadlines.
+
+Sources are queried concurrently. Each source has a soft deadline and the
+whole search has a global deadline:
+- once any source has answered, sources past their soft deadline are cut off
+- if nothing has answered yet, every source may run until the global deadline
+- sources that failed or were cut off are reported (status + error) and the
+  response is marked partial instead of silently dropping them
+
+`stream_federated` yields each source's outcome as soon as it lands (used by
+the NDJSON/SSE endpoints); `run_federated` collects the same outcomes into one
+response.
+
+`merge_page` paginates across sources: per-source streams (already sorted by
+score) are merged with a heap, each source is fetched lazily only as deep as
+the requested page needs, and the per-source offsets are handed back as an
+opaque continuation token.
+"""
+
+import asyncio
+import base64
+import hashlib
+import heapq
+import json
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FederatedSource:
+    """One upstream of a federated search; `call()` returns a connector-style result dict"""
+
+    def __init__(self, name: str, label: str, call: Callable[[], Awaitable[Dict[str, Any]]],
+                 soft_deadline: float):
+        self.name = name
+        self.label = label
+        self.call = call
+        self.soft_deadline = soft_deadline
+
+
+def _outcome(source: FederatedSource, status: str, elapsed: float,
+             result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    results = (result or {}).get("results", []) if status == "ok" else []
+    outcome = {
+        "source": source.name,
+        "label": source.label,
+        "status": status,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "count": len(results),
+        "results": results,
+    }
+    if error:
+        outcome["error"] = error
+    if result and status == "ok":
+        outcome["total_results"] = result.get("total_results", len(results))
+    return outcome
+
+
+async def stream_federated(sources: List[FederatedSource], deadline: float) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one outcome per source (status ok / error / timeout) in arrival order"""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    tasks = {asyncio.ensure_future(source.call()): source for source in sources}
+    pending = set(tasks)
+    answered = False
+
+    def cutoff(task) -> float:
+        return min(tasks[task].soft_deadline, deadline) if answered else deadline
+
+    try:
+        while pending:
+            elapsed = loop.time() - started
+            for task in [t for t in pending if elapsed >= cutoff(t)]:
+                pending.discard(task)
+                task.cancel()
+                yield _outcome(tasks[task], "timeout", elapsed, error=f"no answer within {cutoff(task):.1f}s")
+            if not pending:
+                break
+
+            wait = min(cutoff(t) for t in pending) - elapsed
+            done, _ = await asyncio.wait(pending, timeout=max(0.0, wait), return_when=asyncio.FIRST_COMPLETED)
+            elapsed = loop.time() - started
+            for task in done:
+                pending.discard(task)
+                source = tasks[task]
+                if task.exception() is not None:
+                    yield _outcome(source, "error", elapsed, error=str(task.exception()))
+                    continue
+                result = task.result()
+                if isinstance(result, dict) and result.get("success"):
+                    answered = True
+                    yield _outcome(source, "ok", elapsed, result=result)
+                else:
+                    error = result.get("error") if isinstance(result, dict) else "invalid response"
+                    yield _outcome(source, "error", elapsed, error=error)
+    finally:
+        # Consumer went away (or deadline hit): don't leave upstream calls running
+        for task in pending:
+            task.cancel()
+
+
+def summarize(outcomes: List[Dict[str, Any]], deadline: float) -> Dict[str, Any]:
+    """Per-source status block shared by the collected and streamed responses"""
+    missing = [o["source"] for o in outcomes if o["status"] != "ok"]
+    return {
+        "partial": bool(missing),
+        "missing_sources": missing,
+        "deadline_ms": round(deadline * 1000),
+        "sources": {
+            o["source"]: {k: v for k, v in o.items() if k not in ("source", "results")}
+            for o in outcomes
+        },
+    }
+
+
+async def run_federated(sources: List[FederatedSource], deadline: float) -> Dict[str, Any]:
+    """Collect every source outcome into one response (results are not ranked here)"""
+    outcomes = [outcome async for outcome in stream_federated(sources, deadline)]
+    for outcome in outcomes:
+        if outcome["status"] != "ok":
+            logger.warning(f"Federated source {outcome['source']} {outcome['status']}: {outcome.get('error')}")
+    return {
+        "results": [r for o in outcomes for r in o["results"]],
+        "outcomes": outcomes,
+        **summarize(outcomes, deadline),
+    }
+
+
+class PagedSource:
+    """A source that can be read page by page; `fetch(page, size)` returns a result dict"""
+
+    def __init__(self, name: str, label: str, fetch: Callable[[int, int], Awaitable[Dict[str, Any]]],
+                 soft_deadline: float):
+        self.name = name
+        self.label = label
+        self.fetch = fetch
+        self.soft_deadline = soft_deadline
+
+
+class InvalidCursorError(ValueError):
+    """Continuation token is malformed or belongs to a different query"""
+
+
+def query_fingerprint(*parts: Any) -> str:
+    return hashlib.blake2b(json.dumps(parts, sort_keys=True, default=str).encode(), digest_size=6).hexdigest()
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    # Lowercase base32: opaque, URL-safe and unaffected by case-folding cache-key normalization
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.b32encode(raw).decode().rstrip("=").lower()
+
+
+def decode_cursor(token: str, fingerprint: str) -> Dict[str, Any]:
+    try:
+        padded = token.upper() + "=" * (-len(token) % 8)
+        state = json.loads(base64.b32decode(padded))
+    except Exception:
+        raise InvalidCursorError("malformed continuation token")
+    if not isinstance(state, dict) or state.get("q") != fingerprint:
+        raise InvalidCursorError("continuation token does not match this query")
+    return state
+
+
+class _SourceStream:
+    """Lazily paged, already-sorted result stream of one source"""
+
+    def __init__(self, source: PagedSource, offset: int, fetch_size: int):
+        self.source = source
+        self.offset = offset  # Results of this source consumed by previous pages
+        self.fetch_size = fetch_size
+        self.next_page = offset // fetch_size + 1
+        self.skip = offset % fetch_size
+        self.buffer: Deque[Dict[str, Any]] = deque()
+        self.exhausted = False
+        self.total: Optional[int] = None
+
+    def load(self, result: Dict[str, Any]):
+        items = result.get("results", [])
+        self.total = result.get("total_results", self.total)
+        self.buffer.extend(items[self.skip:])
+        self.skip = 0
+        self.next_page += 1
+        if len(items) < self.fetch_size or (self.total is not None and (self.next_page - 1) * self.fetch_size >= self.total):
+            self.exhausted = True
+
+    async def refill(self, timeout: float) -> bool:
+        """Fetch the next page if the buffer ran dry; False if nothing more can be read now"""
+        if self.buffer:
+            return True
+        if self.exhausted or timeout <= 0:
+            return False
+        result = await asyncio.wait_for(self.source.fetch(self.next_page, self.fetch_size), timeout)
+        if not (isinstance(result, dict) and result.get("success")):
+            raise RuntimeError(result.get("error") if isinstance(result, dict) else "invalid response")
+        self.load(result)
+        return bool(self.buffer)
+
+
+async def merge_page(sources: List[PagedSource], page_size: int, deadline: float,
+                     cursor: Optional[str] = None, fingerprint: str = "",
+                     score_key: str = "relevanceScore") -> Dict[str, Any]:
+    """
+    One page of a k-way merge over score-sorted sources.
+
+    The first page of every source is fetched concurrently (with the usual
+    deadlines); afterwards a source is only fetched again when the heap needs
+    its next item. Each page costs O(page_size * log k) plus the fetches it
+    actually needs, independent of how deep the page is.
+    """
+    state = decode_cursor(cursor, fingerprint) if cursor else {"q": fingerprint, "p": 1, "o": {}, "x": []}
+    streams = {
+        source.name: _SourceStream(source, int(state["o"].get(source.name, 0)), page_size)
+        for source in sources if source.name not in state["x"]
+    }
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    # Initial fetch of each live source at its current offset
+    initial = [
+        FederatedSource(s.source.name, s.source.label,
+                        (lambda s=s: s.source.fetch(s.next_page, s.fetch_size)), s.source.soft_deadline)
+        for s in streams.values()
+    ]
+    outcomes = []
+    async for outcome in stream_federated(initial, deadline):
+        outcomes.append(outcome)
+        stream = streams[outcome["source"]]
+        if outcome["status"] == "ok":
+            stream.load({"results": outcome["results"], "total_results": outcome.get("total_results")})
+    live = {o["source"] for o in outcomes if o["status"] == "ok"}
+
+    heap = []
+    for order, name in enumerate(sorted(live)):
+        stream = streams[name]
+        if stream.buffer:
+            heapq.heappush(heap, (-stream.buffer[0].get(score_key, 0), order, name))
+
+    page: List[Dict[str, Any]] = []
+    failed: Dict[str, str] = {}
+    while heap and len(page) < page_size:
+        _, order, name = heapq.heappop(heap)
+        stream = streams[name]
+        page.append(stream.buffer.popleft())
+        stream.offset += 1
+        if len(page) >= page_size:
+            # Page is full: a prefetch would be discarded, the next page re-reads from the cursor
+            break
+        try:
+            more = await stream.refill(min(stream.source.soft_deadline, deadline - (loop.time() - started)))
+        except Exception as e:
+            failed[name] = str(e) or type(e).__name__
+            more = False
+        if more:
+            heapq.heappush(heap, (-stream.buffer[0].get(score_key, 0), order, name))
+
+    summary = summarize(outcomes, deadline)
+    for name, error in failed.items():
+        logger.warning(f"Federated source {name} failed while paging: {error}")
+        summary["sources"][name].update(status="error", error=error)
+        if name not in summary["missing_sources"]:
+            summary["missing_sources"].append(name)
+    summary["partial"] = bool(summary["missing_sources"])
+
+    # Sources that failed or ran dry keep their offsets; a later page retries the failed ones
+    next_state = {
+        "q": fingerprint,
+        "p": state["p"] + 1,
+        "o": {name: stream.offset for name, stream in streams.items()},
+        "x": sorted(set(state["x"]) | {name for name, stream in streams.items()
+                                        if stream.exhausted and not stream.buffer and name in live}),
+    }
+    has_more = len(next_state["x"]) < len(sources)
+    return {
+        "results": page,
+        "page": state["p"],
+        "has_more": has_more,
+        "next_cursor": encode_cursor(next_state) if has_more else None,
+        "outcomes": outcomes,
+        **summary,
+    }
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Shared upstream HTTP clients, one per host.
+
+Creating an httpx.AsyncClient per request means a fresh TCP + TLS handshake
+for every proxy call. HttpClientRegistry keeps one long-lived client per
+upstream host (karararama.yargitay.gov.tr, emsal.uyap.gov.tr,
+bedesten.adalet.gov.tr, mevzuat.gov.tr, ...) with:
+- HTTP/2 multiplexing when the `h2` package is installed (httpx[http2])
+- tuned keep-alive and per-host connection limits
+- connection-reuse metrics from httpcore trace events
+- the per-host token bucket from rate_limiter, applied in the request hook,
+  with 429/Retry-After responses fed back into it
+- no cookie persistence: the clients are shared by every user's requests, so a
+  Set-Cookie (e.g. a UYAP session id) must not leak into someone else's call;
+  callers that need a session pass their cookies per request
+
+Clients are bound to the event loop they were created on; a call from a
+different loop (e.g. per-call loops in tool workers) gets its own client.
+The application lifespan closes everything via `await http_clients.aclose()`.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from rate_limiter import rate_limits
+
+try:
+    import h2  # noqa: F401  (required by httpx for http2=True)
+    _has_http2 = True
+except ImportError:
+    _has_http2 = False
+
+logger = logging.getLogger(__name__)
+
+# Per-host connection limits: (max_connections, max_keepalive_connections)
+DEFAULT_HOST_LIMITS = (10, 5)
+HOST_LIMITS = {
+    "karararama.yargitay.gov.tr": (8, 4),
+    "emsal.uyap.gov.tr": (8, 4),
+    "bedesten.adalet.gov.tr": (20, 10),
+    "www.mevzuat.gov.tr": (6, 3),
+    "mevzuat.gov.tr": (6, 3),
+}
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+# Longest a request may queue for a rate-limit slot before RateLimitedError
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "15"))
+
+
+def _no_cookies_jar() -> CookieJar:
+    """Cookie jar that refuses to store any Set-Cookie (empty allowed-domain list)"""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+class _HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.errors = 0
+        self.http2_requests = 0
+        self.created_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        reused = max(0, self.requests - self.new_connections)
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "tls_handshakes": self.tls_handshakes,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self.requests, 4) if self.requests else 0.0,
+            "http2_requests": self.http2_requests,
+            "errors": self.errors,
+        }
+
+
+class HttpClientRegistry:
+    """Lazily creates and shares one httpx.AsyncClient per (host, event loop)"""
+
+    def __init__(self, http2: bool = True, timeout: httpx.Timeout = DEFAULT_TIMEOUT):
+        self.http2 = http2 and _has_http2
+        self.timeout = timeout
+        self._clients: Dict[Tuple[str, int], Tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+        self._stats: Dict[str, _HostStats] = {}
+
+    @staticmethod
+    def host_of(url_or_host: str) -> str:
+        if "://" in url_or_host:
+            return urlsplit(url_or_host).hostname or url_or_host
+        return url_or_host
+
+    def client(self, url_or_host: str) -> httpx.AsyncClient:
+        """Shared client for the host of `url_or_host` (a full URL or a bare host name)"""
+        host = self.host_of(url_or_host)
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get((host, id(loop)))
+        if entry is not None and not entry[0].is_closed:
+            return entry[0]
+        # Drop clients whose event loop is gone (they can't be used or closed anymore)
+        for key in [k for k, (_, l) in self._clients.items() if l.is_closed()]:
+            del self._clients[key]
+        client = self._build(host)
+        self._clients[(host, id(loop))] = (client, loop)
+        return client
+
+    def _build(self, host: str) -> httpx.AsyncClient:
+        max_connections, max_keepalive = HOST_LIMITS.get(host, DEFAULT_HOST_LIMITS)
+        stats = self._stats.setdefault(host, _HostStats())
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if event_name == "connection.connect_tcp.complete":
+                stats.new_connections += 1
+            elif event_name == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+
+        async def on_request(request: httpx.Request):
+            await rate_limits.acquire(host, max_wait=RATE_LIMIT_MAX_WAIT)
+            stats.requests += 1
+            request.extensions["trace"] = trace
+
+        async def on_response(response: httpx.Response):
+            await rate_limits.feedback(host, response.status_code, response.headers.get("Retry-After"))
+            if response.http_version == "HTTP/2":
+                stats.http2_requests += 1
+            if response.status_code >= 500:
+                stats.errors += 1
+
+        logger.info(f"HTTP client for {host} (http2={self.http2}, max_connections={max_connections})")
+        return httpx.AsyncClient(
+            http2=self.http2,
+            cookies=_no_cookies_jar(),
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            ),
+            event_hooks={"request": [on_request], "response": [on_response]}
+        )
+
+    async def aclose(self):
+        """Close the clients of the current event loop and forget the rest"""
+        clients, self._clients = self._clients, {}
+        try:
+            loop_id = id(asyncio.get_running_loop())
+        except RuntimeError:
+            loop_id = None
+        for (host, client_loop), (client, _) in clients.items():
+            if client_loop == loop_id and not client.is_closed:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.warning(f"Closing HTTP client for {host} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2_enabled": self.http2,
+            "open_clients": sum(1 for c, _ in self._clients.values() if not c.is_closed),
+            "hosts": {host: stats.snapshot() for host, stats in self._stats.items()},
+        }
+
+
+# Process-wide registry shared by proxies, Mevzuat client and API connector
+http_clients = HttpClientRegistry(http2=os.getenv("HTTP2_ENABLED", "1").lower() not in ("0", "false", "no"))
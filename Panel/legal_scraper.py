@@ -15,6 +15,9 @@ from dataclasses import dataclass
 from bs4 import BeautifulSoup
 import logging
 
+from pagination import fan_out_pages_blocking
+from rate_limiter import rate_limits
+
 # Logging ayarları
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -44,6 +47,8 @@ class LegalScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
+        # Host başına paylaşılan rate limit; 429/Retry-After yanıtları hızı düşürür
+        self.session.hooks["response"].append(rate_limits.requests_hook)
         
     def search_yargitay(self, query: str, max_pages: int = 5) -> List[LegalDecision]:
         """Yargıtay karar arama"""
@@ -65,46 +70,44 @@ class LegalScraper:
                 'Siralama': 'Esas No\'ya Göre'
             }
             
-            for page in range(1, max_pages + 1):
-                try:
-                    logger.info(f"Yargıtay Sayfa {page}/{max_pages} çekiliyor...")
-                    
-                    # Sayfa parametresi ekle
-                    if page > 1:
-                        search_params['Sayfa'] = page
-                    
-                    response = self.session.post(search_url, data=search_params, timeout=30)
-                    response.raise_for_status()
-                    
-                    # HTML parse et
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Karar listesi bul
-                    decision_rows = soup.find_all('tr', class_='karar-satir')
-                    
-                    if not decision_rows:
-                        # Alternatif selector dene
-                        decision_rows = soup.find_all('tr')[1:]  # Header'ı atla
-                    
-                    page_decisions = []
-                    for row in decision_rows:
-                        try:
-                            decision = self._parse_yargitay_row(row, base_url)
-                            if decision:
-                                page_decisions.append(decision)
-                        except Exception as e:
-                            logger.warning(f"Yargıtay satır parse hatası: {e}")
-                            continue
-                    
-                    decisions.extend(page_decisions)
-                    logger.info(f"Yargıtay Sayfa {page} tamamlandı: {len(page_decisions)} karar eklendi")
-                    
-                    # Sayfa arası bekleme
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Yargıtay Sayfa {page} hatası: {e}")
-                    continue
+            def fetch_page(page: int):
+                logger.info(f"Yargıtay Sayfa {page}/{max_pages} çekiliyor...")
+                
+                # Sayfa parametresi ekle (sayfalar paralel çekildiği için kopya üzerinde)
+                page_params = dict(search_params)
+                if page > 1:
+                    page_params['Sayfa'] = page
+                
+                rate_limits.acquire_blocking(search_url)
+                response = self.session.post(search_url, data=page_params, timeout=30)
+                response.raise_for_status()
+                
+                # HTML parse et
+                soup = BeautifulSoup(response.content, 'html.parser')
+                
+                # Karar listesi bul
+                decision_rows = soup.find_all('tr', class_='karar-satir')
+                
+                if not decision_rows:
+                    # Alternatif selector dene
+                    decision_rows = soup.find_all('tr')[1:]  # Header'ı atla
+                
+                page_decisions = []
+                for row in decision_rows:
+                    try:
+                        decision = self._parse_yargitay_row(row, base_url)
+                        if decision:
+                            page_decisions.append(decision)
+                    except Exception as e:
+                        logger.warning(f"Yargıtay satır parse hatası: {e}")
+                        continue
+                
+                logger.info(f"Yargıtay Sayfa {page} tamamlandı: {len(page_decisions)} karar eklendi")
+                return page_decisions, None
+            
+            # Sayfa boyu 1. sayfadan öğrenilir; kalan sayfalar sınırlı eşzamanlılıkla çekilir,
+            # sırayla birleştirilir ve kısa sayfada durulur
+            decisions = fan_out_pages_blocking(fetch_page, max_pages).items
                     
         except Exception as e:
             logger.error(f"Yargıtay arama hatası: {e}")
@@ -202,46 +205,44 @@ class LegalScraper:
                 'Siralama': 'Esas No\'ya Göre'
             }
             
-            for page in range(1, max_pages + 1):
-                try:
-                    logger.info(f"UYAP Sayfa {page}/{max_pages} çekiliyor...")
-                    
-                    # Sayfa parametresi ekle
-                    if page > 1:
-                        search_params['Sayfa'] = page
-                    
-                    response = self.session.post(search_url, data=search_params, timeout=30)
-                    response.raise_for_status()
-                    
-                    # HTML parse et
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Karar listesi bul
-                    decision_rows = soup.find_all('tr', class_='karar-satir')
-                    
-                    if not decision_rows:
-                        # Alternatif selector dene
-                        decision_rows = soup.find_all('tr')[1:]  # Header'ı atla
-                    
-                    page_decisions = []
-                    for row in decision_rows:
-                        try:
-                            decision = self._parse_uyap_row(row, base_url)
-                            if decision:
-                                page_decisions.append(decision)
-                        except Exception as e:
-                            logger.warning(f"UYAP satır parse hatası: {e}")
-                            continue
-                    
-                    decisions.extend(page_decisions)
-                    logger.info(f"UYAP Sayfa {page} tamamlandı: {len(page_decisions)} karar eklendi")
-                    
-                    # Sayfa arası bekleme
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"UYAP Sayfa {page} hatası: {e}")
-                    continue
+            def fetch_page(page: int):
+                logger.info(f"UYAP Sayfa {page}/{max_pages} çekiliyor...")
+                
+                # Sayfa parametresi ekle (sayfalar paralel çekildiği için kopya üzerinde)
+                page_params = dict(search_params)
+                if page > 1:
+                    page_params['Sayfa'] = page
+                
+                rate_limits.acquire_blocking(search_url)
+                response = self.session.post(search_url, data=page_params, timeout=30)
+                response.raise_for_status()
+                
+                # HTML parse et
+                soup = BeautifulSoup(response.content, 'html.parser')
+                
+                # Karar listesi bul
+                decision_rows = soup.find_all('tr', class_='karar-satir')
+                
+                if not decision_rows:
+                    # Alternatif selector dene
+                    decision_rows = soup.find_all('tr')[1:]  # Header'ı atla
+                
+                page_decisions = []
+                for row in decision_rows:
+                    try:
+                        decision = self._parse_uyap_row(row, base_url)
+                        if decision:
+                            page_decisions.append(decision)
+                    except Exception as e:
+                        logger.warning(f"UYAP satır parse hatası: {e}")
+                        continue
+                
+                logger.info(f"UYAP Sayfa {page} tamamlandı: {len(page_decisions)} karar eklendi")
+                return page_decisions, None
+            
+            # Sayfa boyu 1. sayfadan öğrenilir; kalan sayfalar sınırlı eşzamanlılıkla çekilir,
+            # sırayla birleştirilir ve kısa sayfada durulur
+            decisions = fan_out_pages_blocking(fetch_page, max_pages).items
                     
         except Exception as e:
             logger.error(f"UYAP arama hatası: {e}")
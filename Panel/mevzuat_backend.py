@@ -23,6 +23,7 @@ import uvicorn
 
 # Import mevzuat modules
 from mevzuat_client import MevzuatApiClient
+from mevzuat_converter import markdown_converter
 from mevzuat_models import (
     MevzuatSearchRequest, MevzuatSearchResult,
     MevzuatTurEnum, SortFieldEnum, SortDirectionEnum,
@@ -91,6 +92,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🔄 Shutting down Mevzuat Backend...")
     await mevzuat_client.close()
+    markdown_converter.shutdown()
     logger.info("✅ Mevzuat Backend shutdown completed")
 
 # Create FastAPI app
@@ -124,6 +126,8 @@ async def health_mevzuat():
         "message": "Mevzuat Backend operational",
         "uptime_seconds": uptime,
         "api_source": "Adalet Bakanlığı Mevzuat API",
+        "document_store": mevzuat_client.store.stats() if mevzuat_client.store else None,
+        "markdown_conversion": markdown_converter.stats(),
         "endpoints_available": [
             "/api/mevzuat/search",
             "/api/mevzuat/article-tree", 
@@ -4,19 +4,27 @@ API Client for interacting with the Adalet Bakanlığı Mevzuat API (bedesten.ad
 This client handles the business logic of making HTTP requests and parsing responses.
 """
 
+import asyncio
 import httpx
+import json
 import logging
 import base64
-import io
-from bs4 import BeautifulSoup
-from markitdown import MarkItDown
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
+from http_clients import http_clients
+from mevzuat_collector import YearRangeCollector
+from mevzuat_converter import markdown_converter
+from mevzuat_date_index import SearchPageError, SortedPageCache, SortedResultIndex
+from mevzuat_store import StoredDocument, default_store
+from mevzuat_stream import DecodedDocument, read_document_content
 from mevzuat_models import (
     MevzuatSearchRequest, MevzuatSearchResult, MevzuatDocument, MevzuatTur,
     MevzuatArticleNode, MevzuatArticleContent, MevzuatDateRangeRequest, MevzuatCollectionResult
 )
 logger = logging.getLogger(__name__)
 
+class MevzuatContentError(Exception):
+    """The API answered without the requested content (FMTE message)"""
+
 class MevzuatApiClient:
     BASE_URL = "https://bedesten.adalet.gov.tr/mevzuat"
     HEADERS = {
@@ -28,11 +36,25 @@ class MevzuatApiClient:
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     }
     def __init__(self, timeout: float = 30.0):
-        self._http_client = httpx.AsyncClient(headers=self.HEADERS, timeout=timeout, follow_redirects=True)
-        self._md_converter = MarkItDown()
+        self._timeout = timeout
+        # Pages of the sorted result list read by date-range searches
+        self._sorted_pages = SortedPageCache()
+        # Local copies of article texts, full documents and trees (None when disabled)
+        self.store = default_store()
+        self._revalidating: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    async def _post(self, url: str, extra_headers: Optional[Dict[str, str]] = None, **kwargs) -> httpx.Response:
+        """POST through the shared keep-alive client for bedesten.adalet.gov.tr"""
+        headers = {**self.HEADERS, **extra_headers} if extra_headers else self.HEADERS
+        return await http_clients.client(url).post(url, headers=headers, timeout=self._timeout, **kwargs)
+
+    def _stream(self, url: str, extra_headers: Optional[Dict[str, str]] = None, **kwargs):
+        """Streaming POST (async context manager) through the same shared client"""
+        headers = {**self.HEADERS, **extra_headers} if extra_headers else self.HEADERS
+        return http_clients.client(url).stream("POST", url, headers=headers, timeout=self._timeout, **kwargs)
 
     async def close(self):
-        await self._http_client.aclose()
+        await http_clients.aclose()
 
     def _html_from_base64(self, b64_string: str) -> str:
         try:
@@ -40,21 +62,14 @@ class MevzuatApiClient:
             return decoded_bytes.decode('utf-8')
         except Exception: return ""
 
-    def _markdown_from_html(self, html_content: str) -> str:
-        if not html_content: return ""
-        try:
-            html_bytes = html_content.encode('utf-8')
-            html_io = io.BytesIO(html_bytes)
-            conv_res = self._md_converter.convert(html_io)
-            if conv_res and conv_res.text_content:
-                return conv_res.text_content.strip()
-            return ""
-        except Exception:
-            soup = BeautifulSoup(html_content, 'lxml')
-            return soup.get_text(separator='\n', strip=True)
-
     async def search_documents(self, request: MevzuatSearchRequest) -> MevzuatSearchResult:
-        """Performs a detailed search for legislation documents."""
+        """Performs a detailed search for legislation documents.
+        With resmi_gazete_tarihi_start/end set, pages are counted within that date range only."""
+        if request.resmi_gazete_tarihi_start or request.resmi_gazete_tarihi_end:
+            return await self._search_date_range(request)
+        return await self._search_page(request)
+
+    async def _search_page(self, request: MevzuatSearchRequest) -> MevzuatSearchResult:
         payload = {
             "data": {
                 "pageSize": request.page_size,
@@ -77,7 +92,7 @@ class MevzuatApiClient:
             payload["data"]["resmiGazeteSayi"] = request.resmi_gazete_sayisi
             
         try:
-            response = await self._http_client.post(f"{self.BASE_URL}/searchDocuments", json=payload)
+            response = await self._post(f"{self.BASE_URL}/searchDocuments", json=payload)
             response.raise_for_status()
             data = response.json()
             if data.get("metadata", {}).get("FMTY") != "SUCCESS":
@@ -96,75 +111,180 @@ class MevzuatApiClient:
         except Exception as e:
             return MevzuatSearchResult(documents=[], total_results=0, current_page=request.page_number, page_size=request.page_size, total_pages=0, query_used=request.model_dump(), error_message=f"An unexpected error occurred: {e}")
 
-    async def get_article_tree(self, mevzuat_id: str) -> List[MevzuatArticleNode]:
-        payload = { "data": {"mevzuatId": mevzuat_id}, "applicationName": "UyapMevzuat" }
+    async def _search_date_range(self, request: MevzuatSearchRequest) -> MevzuatSearchResult:
+        """
+        The API has no date filter, but results sorted by RESMI_GAZETE_TARIHI are
+        ordered by date: binary-search that order for the offsets where the range
+        starts and ends, then read only the pages covering the requested slice.
+        """
+        def failed(message: str) -> MevzuatSearchResult:
+            return MevzuatSearchResult(documents=[], total_results=0, current_page=request.page_number, page_size=request.page_size, total_pages=0, query_used=request.model_dump(mode="json"), error_message=message)
+
+        if request.sort_field != "RESMI_GAZETE_TARIHI":
+            return failed("Date range search requires sort_field=RESMI_GAZETE_TARIHI")
+        index = SortedResultIndex(self, request)
+        try:
+            first, last = await index.date_range_offsets(request.resmi_gazete_tarihi_start, request.resmi_gazete_tarihi_end)
+            start = first + (request.page_number - 1) * request.page_size
+            documents = await index.slice(start, min(start + request.page_size, last))
+        except SearchPageError as e:
+            return failed(str(e))
+        total_results = last - first
+        return MevzuatSearchResult(
+            documents=documents, total_results=total_results, current_page=request.page_number, page_size=request.page_size,
+            total_pages=(total_results + request.page_size - 1) // request.page_size,
+            query_used={**request.model_dump(mode="json"), "result_offset": first}
+        )
+
+    # ------------------------------------------------------------------
+    # Article trees and contents (read through the local document store)
+    # ------------------------------------------------------------------
+
+    async def _store_lookup(self, kind: str, key: str) -> Optional[StoredDocument]:
+        if self.store is None:
+            return None
         try:
-            response = await self._http_client.post(f"{self.BASE_URL}/mevzuatMaddeTree", json=payload)
+            return await asyncio.to_thread(self.store.lookup, kind, key)
+        except Exception as e:
+            logger.warning(f"Document store lookup failed for {kind} {key}: {e}")
+            return None
+
+    async def _store_call(self, method: str, *args) -> Any:
+        """Run a store method off the event loop; store problems never fail a request"""
+        if self.store is None:
+            return None
+        try:
+            return await asyncio.to_thread(getattr(self.store, method), *args)
+        except Exception as e:
+            logger.warning(f"Document store {method} failed: {e}")
+            return None
+
+    def _revalidate_later(self, stored: StoredDocument, refresh: Callable[[StoredDocument], Awaitable[Any]]):
+        """Serve the stale entry now and refresh it in the background (once per entry)"""
+        key = (stored.kind, stored.key)
+        if key in self._revalidating:
+            return
+
+        async def run():
+            try:
+                await refresh(stored)
+            except Exception as e:
+                logger.warning(f"Revalidation of {stored.kind} {stored.key} failed: {e}")
+            finally:
+                self._revalidating.pop(key, None)
+
+        self._revalidating[key] = asyncio.create_task(run())
+
+    async def _fetch_document(self, document_id: str, document_type: str, error_default: str,
+                              validators: Optional[Dict[str, str]] = None) -> Tuple[Optional[DecodedDocument], httpx.Headers]:
+        """Streamed getDocumentContent; returns (None, headers) when the server answers 304 Not Modified"""
+        payload = {"data": {"id": document_id, "documentType": document_type}, "applicationName": "UyapMevzuat"}
+        async with self._stream(f"{self.BASE_URL}/getDocumentContent", json=payload, extra_headers=validators) as response:
+            if response.status_code == 304:
+                return None, response.headers
             response.raise_for_status()
-            data = response.json()
-            if data.get("metadata", {}).get("FMTY") != "SUCCESS": return []
-            root_node = data.get("data", {})
-            return [MevzuatArticleNode.model_validate(child) for child in root_node.get("children", [])]
+            data, document = await read_document_content(response)
+        if data.get("metadata", {}).get("FMTY") != "SUCCESS":
+            document.close()
+            raise MevzuatContentError(data.get("metadata", {}).get("FMTE", error_default))
+        return document, response.headers
+
+    async def _document_markdown(self, kind: str, document_id: str, document_type: str, error_default: str,
+                                 stored: Optional[StoredDocument] = None) -> str:
+        """Fetch a document's markdown and store it; with `stored`, a conditional revalidation of that entry"""
+        document, headers = await self._fetch_document(
+            document_id, document_type, error_default, stored.validators if stored else None)
+        if document is None:
+            await self._store_call("touch", kind, document_id)
+            return stored.text
+
+        with document:
+            digest, media_type = document.digest, document.media_type
+            if stored is not None and stored.content_hash == digest:
+                # Unchanged upstream: keep the markdown, refresh validators and timestamps
+                await self._save_document(kind, document_id, document, None, headers)
+                return stored.text
+
+            markdown = await self._store_call("derived_markdown", digest)
+            if markdown is None:
+                markdown, converted = await markdown_converter.convert(document.source, media_type, digest)
+                if not converted:
+                    logger.warning(f"Could not convert {kind} {document_id} ({media_type}, {document.size} bytes)")
+                    return markdown
+            await self._save_document(kind, document_id, document, markdown, headers)
+            return markdown
+
+    async def _save_document(self, kind: str, document_id: str, document: DecodedDocument,
+                             markdown: Optional[str], headers: httpx.Headers):
+        if self.store is None:
+            return
+        with document.open() as original:
+            await self._store_call("save", kind, document_id, original, document.media_type, markdown, headers, document.digest)
+
+    async def _stored_markdown(self, kind: str, document_id: str, document_type: str, error_default: str) -> str:
+        stored = await self._store_lookup(kind, document_id)
+        if stored is None:
+            return await self._document_markdown(kind, document_id, document_type, error_default)
+        if not stored.is_fresh(self.store.max_age):
+            self._revalidate_later(stored, lambda entry: self._document_markdown(
+                kind, document_id, document_type, error_default, entry))
+        return stored.text
+
+    async def _fetch_article_tree(self, mevzuat_id: str, stored: Optional[StoredDocument] = None) -> List[Dict[str, Any]]:
+        payload = { "data": {"mevzuatId": mevzuat_id}, "applicationName": "UyapMevzuat" }
+        response = await self._post(f"{self.BASE_URL}/mevzuatMaddeTree", json=payload,
+                                    extra_headers=stored.validators if stored else None)
+        if response.status_code == 304:
+            await self._store_call("touch", "tree", mevzuat_id)
+            return json.loads(stored.text)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("metadata", {}).get("FMTY") != "SUCCESS": return []
+        root_node = data.get("data", {})
+        children = root_node.get("children", [])
+        original = json.dumps(children, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        await self._store_call("save", "tree", mevzuat_id, original, "application/json", None, response.headers)
+        return children
+
+    async def get_article_tree(self, mevzuat_id: str) -> List[MevzuatArticleNode]:
+        try:
+            stored = await self._store_lookup("tree", mevzuat_id)
+            if stored is None:
+                children = await self._fetch_article_tree(mevzuat_id)
+            else:
+                if not stored.is_fresh(self.store.max_age):
+                    self._revalidate_later(stored, lambda entry: self._fetch_article_tree(mevzuat_id, entry))
+                children = json.loads(stored.text)
+            return [MevzuatArticleNode.model_validate(child) for child in children]
         except Exception as e:
             logger.exception(f"Error fetching article tree for mevzuatId {mevzuat_id}")
             return []
 
     async def get_article_content(self, madde_id: str, mevzuat_id: str) -> MevzuatArticleContent:
-        payload = {"data": {"id": madde_id, "documentType": "MADDE"}, "applicationName": "UyapMevzuat"}
         try:
-            response = await self._http_client.post(f"{self.BASE_URL}/getDocumentContent", json=payload)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("metadata", {}).get("FMTY") != "SUCCESS":
-                return MevzuatArticleContent(madde_id=madde_id, mevzuat_id=mevzuat_id, markdown_content="", error_message=data.get("metadata", {}).get("FMTE", "Failed to retrieve content."))
-            content_data = data.get("data", {})
-            b64_content = content_data.get("content", "")
-            html_content = self._html_from_base64(b64_content)
-            markdown_content = self._markdown_from_html(html_content)
+            markdown_content = await self._stored_markdown("madde", madde_id, "MADDE", "Failed to retrieve content.")
             return MevzuatArticleContent(madde_id=madde_id, mevzuat_id=mevzuat_id, markdown_content=markdown_content)
+        except MevzuatContentError as e:
+            return MevzuatArticleContent(madde_id=madde_id, mevzuat_id=mevzuat_id, markdown_content="", error_message=str(e))
         except Exception as e:
             logger.exception(f"Error fetching content for maddeId {madde_id}")
             return MevzuatArticleContent(madde_id=madde_id, mevzuat_id=mevzuat_id, markdown_content="", error_message=f"An unexpected error occurred: {e}")
     
     async def get_full_document_content(self, mevzuat_id: str) -> MevzuatArticleContent:
         """Retrieves the full content of a legislation document as a single unit."""
-        payload = {"data": {"id": mevzuat_id, "documentType": "MEVZUAT"}, "applicationName": "UyapMevzuat"}
         try:
-            response = await self._http_client.post(f"{self.BASE_URL}/getDocumentContent", json=payload)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("metadata", {}).get("FMTY") != "SUCCESS":
-                return MevzuatArticleContent(
-                    madde_id=mevzuat_id, mevzuat_id=mevzuat_id,
-                    markdown_content="", 
-                    error_message=data.get("metadata", {}).get("FMTE", "Failed to retrieve full document content.")
-                )
-            
-            content_data = data.get("data", {})
-            b64_content = content_data.get("content", "")
-            
-            # Handle PDF content - try to extract if it's a PDF
-            if b64_content.startswith("JVBERi0"):  # PDF header in base64
-                try:
-                    import base64
-                    pdf_bytes = base64.b64decode(b64_content)
-                    # Use markitdown to convert PDF to markdown
-                    from markitdown import MarkItDown
-                    md = MarkItDown()
-                    result = md.convert_stream(pdf_bytes, file_extension=".pdf")
-                    markdown_content = result.text_content
-                except Exception as pdf_error:
-                    logger.warning(f"PDF extraction failed for {mevzuat_id}: {pdf_error}")
-                    markdown_content = f"PDF content available but could not be extracted. Content length: {len(b64_content)} characters."
-            else:
-                # Handle HTML content
-                html_content = self._html_from_base64(b64_content)
-                markdown_content = self._markdown_from_html(html_content)
-            
+            markdown_content = await self._stored_markdown(
+                "mevzuat", mevzuat_id, "MEVZUAT", "Failed to retrieve full document content.")
             return MevzuatArticleContent(
                 madde_id=mevzuat_id, mevzuat_id=mevzuat_id,
                 markdown_content=markdown_content
             )
+        except MevzuatContentError as e:
+            return MevzuatArticleContent(
+                madde_id=mevzuat_id, mevzuat_id=mevzuat_id,
+                markdown_content="", 
+                error_message=str(e)
+            )
         except Exception as e:
             logger.exception(f"Error fetching full document content for mevzuatId {mevzuat_id}")
             return MevzuatArticleContent(
@@ -173,10 +293,12 @@ class MevzuatApiClient:
                 error_message=f"An unexpected error occurred: {str(e)}"
             )
 
-    async def collect_legislation_by_year_range(self, request: "MevzuatDateRangeRequest") -> "MevzuatCollectionResult":
+    async def collect_legislation_by_year_range(self, request: "MevzuatDateRangeRequest",
+                                                on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> "MevzuatCollectionResult":
         """
         Collect legislation documents within a specific year range.
         Searches for documents published between start_year and end_year.
+        `on_progress` receives throughput/ETA snapshots while the collection runs.
         """
         import json
         import os
@@ -188,77 +310,13 @@ class MevzuatApiClient:
         
         logger.info(f"Starting legislation collection from {request.start_year} to {request.end_year}")
         
-        # Iterate through each year in the range
-        for year in range(request.start_year, request.end_year + 1):
-            year_str = str(year)
-            logger.info(f"Collecting legislation for year {year}")
-            
-            documents_by_year[year_str] = 0
-            collected_for_year = 0
-            page_num = 1
-            
-            # Continue collecting until we reach the limit or no more documents
-            while collected_for_year < request.max_documents_per_year:
-                # Create search request for this year
-                search_request = MevzuatSearchRequest(
-                    mevzuat_adi=None,  # Search all legislation
-                    phrase=None,
-                    mevzuat_no=None,
-                    resmi_gazete_sayisi=None,
-                    mevzuat_tur_list=request.mevzuat_tur_list,
-                    page_number=page_num,
-                    page_size=min(10, request.max_documents_per_year - collected_for_year),
-                    sort_field="RESMI_GAZETE_TARIHI",
-                    sort_direction="desc"
-                )
-                
-                try:
-                    # Search for documents
-                    search_result = await self.search_documents(search_request)
-                    
-                    if not search_result.documents:
-                        logger.info(f"No more documents found for year {year}")
-                        break
-                    
-                    # Filter documents by year (check if they belong to current year)
-                    year_documents = []
-                    for doc in search_result.documents:
-                        # Extract year from document data
-                        doc_year = self._extract_year_from_document(doc)
-                        if doc_year == year:
-                            year_documents.append(doc)
-                    
-                    if not year_documents:
-                        logger.info(f"No documents found for year {year} in current page")
-                        break
-                    
-                    # Add full text if requested
-                    if request.include_full_text:
-                        for doc in year_documents:
-                            try:
-                                full_content = await self.get_full_document_content(str(doc.id))
-                                if full_content.markdown_content:
-                                    # Add full content to document (this would need model extension)
-                                    pass
-                            except Exception as e:
-                                logger.warning(f"Failed to get full content for document {doc.id}: {e}")
-                    
-                    all_documents.extend(year_documents)
-                    collected_for_year += len(year_documents)
-                    documents_by_year[year_str] += len(year_documents)
-                    total_collected += len(year_documents)
-                    
-                    logger.info(f"Collected {len(year_documents)} documents for year {year}, page {page_num}")
-                    
-                    # Check if we have more pages
-                    if page_num >= search_result.total_pages:
-                        break
-                    
-                    page_num += 1
-                    
-                except Exception as e:
-                    logger.error(f"Error collecting documents for year {year}, page {page_num}: {e}")
-                    break
+        # (year, page) searches and full-text fetches run as tasks on a bounded worker pool
+        collector = YearRangeCollector(self, request, on_progress=on_progress)
+        collected = await collector.run()
+        for year, year_documents in collected.items():
+            all_documents.extend(year_documents)
+            documents_by_year[str(year)] = len(year_documents)
+            total_collected += len(year_documents)
         
         # Create collection summary
         collection_summary = {
@@ -266,6 +324,8 @@ class MevzuatApiClient:
             "years_with_documents": len([year for year, count in documents_by_year.items() if count > 0]),
             "average_documents_per_year": total_collected / (request.end_year - request.start_year + 1) if total_collected > 0 else 0,
             "legislation_types_collected": list(set([doc.mevzuat_tur.name if hasattr(doc.mevzuat_tur, 'name') else str(doc.mevzuat_tur) for doc in all_documents])),
+            "documents_with_full_text": sum(1 for doc in all_documents if doc.full_text),
+            "progress": collector.progress.snapshot(),
             "collection_date": datetime.now().isoformat()
         }
         
@@ -292,33 +352,6 @@ class MevzuatApiClient:
         logger.info(f"Collection completed. Total documents: {total_collected}")
         return result
     
-    def _extract_year_from_document(self, document: MevzuatDocument) -> int:
-        """Extract year from document date fields."""
-        try:
-            # Try to extract from various date fields
-            if hasattr(document, 'resmi_gazete_tarihi') and document.resmi_gazete_tarihi:
-                if isinstance(document.resmi_gazete_tarihi, str):
-                    # Parse date string
-                    import re
-                    year_match = re.search(r'\b(19|20)\d{2}\b', document.resmi_gazete_tarihi)
-                    if year_match:
-                        return int(year_match.group())
-                elif hasattr(document.resmi_gazete_tarihi, 'year'):
-                    return document.resmi_gazete_tarihi.year
-            
-            # Fallback: try to extract from document number or other fields
-            if hasattr(document, 'mevzuat_no') and document.mevzuat_no:
-                year_match = re.search(r'\b(19|20)\d{2}\b', str(document.mevzuat_no))
-                if year_match:
-                    return int(year_match.group())
-            
-            # Default to current year if no date found
-            return datetime.now().year
-            
-        except Exception as e:
-            logger.warning(f"Failed to extract year from document: {e}")
-            return datetime.now().year
-    
     async def _export_collection_to_file(self, documents: List[MevzuatDocument], format_type: str, filename_base: str) -> str:
         """Export collected documents to specified format."""
         import json
@@ -0,0 +1,240 @@
+# mevzuat_collector.py
+"""
+Concurrent engine behind MevzuatApiClient.collect_legislation_by_year_range.
+
+The collection used to walk years, then pages, then (with include_full_text)
+each document's content strictly one request at a time - and threw the full
+text away. Here every unit of work is a task on one shared queue drained by
+MEVZUAT_COLLECTION_CONCURRENCY workers:
+
+    collector = YearRangeCollector(client, request, on_progress=print)
+    documents_by_year = await collector.run()
+    collector.progress.snapshot()  # throughput / ETA
+
+- (year, page) tasks: each year is searched with a Resmî Gazete date range
+  (MevzuatSearchRequest.resmi_gazete_tarihi_start/end), so its first page
+  gives the exact number of matching documents and all of the year's
+  remaining pages are queued at once; idle workers pick up whatever is queued
+  next, and every fetched row belongs to the year
+- (document content) tasks are queued ahead of page tasks, so texts are
+  fetched while later pages are still being searched and pending work stays
+  small; the markdown is attached to MevzuatDocument.full_text
+- a mevzuat_id already collected (for any year) is skipped
+- all requests go through MevzuatApiClient, i.e. the shared bedesten
+  keep-alive client and its per-host rate limiter
+- progress (tasks/s, documents/s, upper-bound ETA) is logged every
+  MEVZUAT_COLLECTION_LOG_INTERVAL seconds and passed to `on_progress`
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from mevzuat_models import MevzuatDateRangeRequest, MevzuatDocument, MevzuatSearchRequest
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_PAGE_SIZE = 10
+MEVZUAT_COLLECTION_CONCURRENCY = int(os.getenv("MEVZUAT_COLLECTION_CONCURRENCY", "6"))
+PROGRESS_LOG_INTERVAL = float(os.getenv("MEVZUAT_COLLECTION_LOG_INTERVAL", "5"))
+
+# Content tasks sort before page tasks
+_CONTENT, _PAGE = 0, 1
+
+
+@dataclass
+class CollectionProgress:
+    years_total: int = 0
+    years_done: int = 0
+    pages_done: int = 0
+    pages_failed: int = 0
+    documents: int = 0
+    duplicates: int = 0
+    contents_done: int = 0
+    contents_failed: int = 0
+    tasks_pending: int = 0
+    tasks_estimated: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        tasks_done = self.pages_done + self.pages_failed + self.contents_done + self.contents_failed
+        rate = tasks_done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.tasks_estimated - tasks_done, self.tasks_pending)
+        data = asdict(self)
+        del data["started"]
+        data.update({
+            "elapsed_seconds": round(elapsed, 1),
+            "tasks_per_second": round(rate, 2),
+            "documents_per_second": round(self.documents / elapsed, 2) if elapsed > 0 else 0.0,
+            "eta_seconds": round(remaining / rate, 1) if rate > 0 else None,
+        })
+        return data
+
+
+class YearRangeCollector:
+    def __init__(self, client, request: MevzuatDateRangeRequest, page_size: int = COLLECTION_PAGE_SIZE,
+                 concurrency: int = MEVZUAT_COLLECTION_CONCURRENCY,
+                 on_progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.client = client
+        self.request = request
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+        self.years = list(range(request.start_year, request.end_year + 1))
+        self.max_pages = math.ceil(request.max_documents_per_year / page_size)
+        self.documents_by_year: Dict[int, List[MevzuatDocument]] = {year: [] for year in self.years}
+        self.progress = CollectionProgress(years_total=len(self.years))
+        self._seen: Set[str] = set()
+        # Per year: documents by page, pages still outstanding, documents expected (known after page 1)
+        self._year_pages: Dict[int, Dict[int, List[MevzuatDocument]]] = {year: {} for year in self.years}
+        self._year_outstanding: Dict[int, int] = {year: 1 for year in self.years}
+        self._year_target: Dict[int, Optional[int]] = {year: None for year in self.years}
+        self._years_done: Set[int] = set()
+        self._queue: "asyncio.PriorityQueue" = asyncio.PriorityQueue()
+        self._order = itertools.count()
+        self._last_log = 0.0
+
+    def _put(self, kind: int, *payload):
+        self.progress.tasks_pending += 1
+        self._queue.put_nowait((kind, next(self._order), payload))
+
+    def _estimate(self):
+        """Upper bound on total tasks: unfinished years may still use their whole page and document budget"""
+        p = self.progress
+        open_years = [year for year in self.years if year not in self._years_done]
+        remaining = sum(self.max_pages if self._year_target[year] is None else self._year_outstanding[year]
+                        for year in open_years)
+        if self.request.include_full_text:
+            remaining += p.documents - p.contents_done - p.contents_failed
+            remaining += sum(
+                (self.request.max_documents_per_year if self._year_target[year] is None else self._year_target[year])
+                - sum(len(documents) for documents in self._year_pages[year].values())
+                for year in open_years
+            )
+        p.tasks_estimated = p.pages_done + p.pages_failed + p.contents_done + p.contents_failed + remaining
+
+    async def run(self) -> Dict[int, List[MevzuatDocument]]:
+        for year in self.years:
+            self._put(_PAGE, year, 1)
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        try:
+            await self._queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._report(force=True)
+        return self.documents_by_year
+
+    async def _worker(self):
+        while True:
+            kind, _, payload = await self._queue.get()
+            try:
+                if kind == _PAGE:
+                    await self._page(*payload)
+                else:
+                    await self._content(*payload)
+            except Exception as e:
+                logger.warning(f"Collection task {payload} failed: {e}")
+            finally:
+                self.progress.tasks_pending -= 1
+                self._queue.task_done()
+                self._report()
+
+    # ------------------------------------------------------------------
+    # Tasks
+    # ------------------------------------------------------------------
+
+    async def _search(self, year: int, page: int) -> Tuple[List[MevzuatDocument], int]:
+        search_request = MevzuatSearchRequest(
+            mevzuat_adi=None,  # Search all legislation
+            phrase=None,
+            mevzuat_no=None,
+            resmi_gazete_sayisi=None,
+            resmi_gazete_tarihi_start=date(year, 1, 1),
+            resmi_gazete_tarihi_end=date(year, 12, 31),
+            mevzuat_tur_list=self.request.mevzuat_tur_list,
+            page_number=page,
+            page_size=self.page_size,
+            sort_field="RESMI_GAZETE_TARIHI",
+            sort_direction="desc"
+        )
+        result = await self.client.search_documents(search_request)
+        if result.error_message:
+            raise RuntimeError(result.error_message)
+        return result.documents, result.total_results
+
+    async def _page(self, year: int, page: int):
+        try:
+            documents, total = await self._search(year, page)
+        except Exception as e:
+            logger.error(f"Error collecting documents for year {year}, page {page}: {e}")
+            self.progress.pages_failed += 1
+            self._page_done(year)
+            return
+        self.progress.pages_done += 1
+
+        if page == 1:
+            target = min(total, self.request.max_documents_per_year)
+            self._year_target[year] = target
+            for next_page in range(2, math.ceil(target / self.page_size) + 1):
+                self._year_outstanding[year] += 1
+                self._put(_PAGE, year, next_page)
+            logger.info(f"Year {year}: {total} documents, collecting {target}")
+
+        page_documents = []
+        for doc in documents[:max(0, self.request.max_documents_per_year - (page - 1) * self.page_size)]:
+            if doc.mevzuat_id in self._seen:
+                self.progress.duplicates += 1
+                continue
+            self._seen.add(doc.mevzuat_id)
+            page_documents.append(doc)
+            if self.request.include_full_text:
+                self._put(_CONTENT, doc)
+        self._year_pages[year][page] = page_documents
+        self.progress.documents += len(page_documents)
+        self._page_done(year)
+
+    async def _content(self, doc: MevzuatDocument):
+        content = await self.client.get_full_document_content(doc.mevzuat_id)
+        if content.markdown_content and not content.error_message:
+            doc.full_text = content.markdown_content
+            self.progress.contents_done += 1
+        else:
+            self.progress.contents_failed += 1
+            logger.warning(f"Failed to get full content for document {doc.mevzuat_id}: {content.error_message}")
+
+    def _page_done(self, year: int):
+        """Once all of a year's pages are in, assemble its documents in page order"""
+        self._year_outstanding[year] -= 1
+        if self._year_outstanding[year] > 0:
+            return
+        pages = self._year_pages[year]
+        self.documents_by_year[year] = [doc for page in sorted(pages) for doc in pages[page]]
+        self._years_done.add(year)
+        self.progress.years_done += 1
+        logger.info(f"Year {year} done: {len(self.documents_by_year[year])} documents")
+
+    def _report(self, force: bool = False):
+        self._estimate()
+        snapshot = None
+        now = time.monotonic()
+        if force or now - self._last_log >= PROGRESS_LOG_INTERVAL:
+            self._last_log = now
+            snapshot = self.progress.snapshot()
+            eta = f"<={snapshot['eta_seconds']:.0f}s" if snapshot["eta_seconds"] is not None else "?"
+            logger.info(
+                f"Collection progress: {snapshot['years_done']}/{snapshot['years_total']} years, "
+                f"{snapshot['documents']} documents, {snapshot['contents_done']} texts, "
+                f"{snapshot['tasks_per_second']} tasks/s, ETA {eta}"
+            )
+        if self.on_progress is not None:
+            self.on_progress(snapshot or self.progress.snapshot())
@@ -0,0 +1,238 @@
+# mevzuat_converter.py
+"""
+HTML / PDF to markdown conversion for MevzuatApiClient, off the event loop.
+
+MarkItDown and BeautifulSoup are synchronous and CPU-bound; converting a long
+kanun text or a scanned PDF inside the client's async methods stalled every
+other Mevzuat request for hundreds of milliseconds, and the PDF branch built a
+new MarkItDown() per call. Conversions now go through one shared converter:
+
+    markdown, converted = await markdown_converter.convert(original, "application/pdf")
+
+The input is the document's bytes, or the path of a file holding them
+(mevzuat_stream spools large documents to disk); pool workers open such
+files themselves, so large documents are never pickled between processes.
+
+- inputs up to MEVZUAT_CONVERT_INLINE_BYTES are converted inline - cheaper
+  than pickling them to another process
+- larger ones run in a RecyclingProcessPool of MEVZUAT_CONVERT_WORKERS
+  processes, each holding one MarkItDown instance for its lifetime; a
+  conversion exceeding MEVZUAT_CONVERT_TIMEOUT seconds gets its worker
+  reclaimed and counts as failed
+- results are memoized by SHA-256 of the input (up to MEVZUAT_CONVERT_MEMO_BYTES
+  of markdown) and concurrent requests for the same content share one
+  conversion
+- stats() reports conversions per route, memo hits and conversion times
+"""
+
+import asyncio
+import io
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+from mevzuat_store import content_hash
+from tool_executor import RecyclingProcessPool
+
+logger = logging.getLogger(__name__)
+
+CONVERT_WORKERS = int(os.getenv("MEVZUAT_CONVERT_WORKERS", "2"))
+CONVERT_INLINE_BYTES = int(os.getenv("MEVZUAT_CONVERT_INLINE_BYTES", str(64 * 1024)))
+CONVERT_TIMEOUT = float(os.getenv("MEVZUAT_CONVERT_TIMEOUT", "60"))
+CONVERT_MEMO_BYTES = int(os.getenv("MEVZUAT_CONVERT_MEMO_BYTES", str(64 * 1024 * 1024)))
+
+# (markdown, converted) - converted is False when the result is only a placeholder
+Conversion = Tuple[str, bool]
+# Document bytes, or the path of a file holding them
+Source = Union[bytes, str]
+
+# Per-process MarkItDown instance (the event loop's process and every pool worker)
+_markitdown = None
+
+
+def _converter():
+    global _markitdown
+    if _markitdown is None:
+        from markitdown import MarkItDown
+        _markitdown = MarkItDown()
+    return _markitdown
+
+
+def init_converter_worker():
+    """ProcessPoolExecutor initializer: build the worker's MarkItDown once"""
+    try:
+        _converter()
+    except Exception as e:
+        logger.warning(f"Converter worker {os.getpid()} could not initialize MarkItDown: {e}")
+
+
+def source_size(source: Source) -> int:
+    return os.path.getsize(source) if isinstance(source, str) else len(source)
+
+
+def _open_source(source: Source) -> BinaryIO:
+    return open(source, "rb") if isinstance(source, str) else io.BytesIO(source)
+
+
+def markdown_from_html(html_io: BinaryIO) -> str:
+    try:
+        conv_res = _converter().convert(html_io)
+        if conv_res and conv_res.text_content:
+            return conv_res.text_content.strip()
+        return ""
+    except Exception:
+        from bs4 import BeautifulSoup
+        html_io.seek(0)
+        soup = BeautifulSoup(html_io, 'lxml')
+        return soup.get_text(separator='\n', strip=True)
+
+
+def convert_document(source: Source, media_type: str) -> Conversion:
+    """Markdown for a decoded Mevzuat document (runs inline or in a pool worker)"""
+    size = source_size(source)
+    if not size:
+        return "", True
+    with _open_source(source) as stream:
+        if media_type == "application/pdf":
+            try:
+                result = _converter().convert_stream(stream, file_extension=".pdf")
+                return result.text_content, True
+            except Exception as pdf_error:
+                logger.warning(f"PDF extraction failed: {pdf_error}")
+                return pdf_placeholder(size), False
+        return markdown_from_html(stream), True
+
+
+def pdf_placeholder(size: int) -> str:
+    return f"PDF content available but could not be extracted. Content length: {size} bytes."
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+
+    def add(self, seconds: float, size: int):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.bytes += size
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 1),
+            "input_bytes": self.bytes,
+        }
+
+
+class MarkdownConverter:
+    def __init__(self, workers: int = CONVERT_WORKERS, inline_bytes: int = CONVERT_INLINE_BYTES,
+                 timeout: float = CONVERT_TIMEOUT, memo_bytes: int = CONVERT_MEMO_BYTES):
+        self.inline_bytes = inline_bytes
+        self.timeout = timeout
+        self.memo_bytes = memo_bytes
+        self.pool = RecyclingProcessPool(max_workers=workers, initializer=init_converter_worker)
+        self._memo: "OrderedDict[str, str]" = OrderedDict()
+        self._memo_size = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._timings = {"inline": _Timing(), "pool": _Timing()}
+        self.memo_hits = 0
+        self.shared = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    async def convert(self, source: Source, media_type: str, digest: Optional[str] = None) -> Conversion:
+        """Markdown for `source`; `digest` is its SHA-256 (required for file paths)"""
+        if digest is None:
+            digest = content_hash(source)
+        markdown = self._memo.get(digest)
+        if markdown is not None:
+            self._memo.move_to_end(digest)
+            self.memo_hits += 1
+            return markdown, True
+        if digest in self._inflight:
+            self.shared += 1
+            return await asyncio.shield(self._inflight[digest])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[digest] = future
+        try:
+            result = await self._convert(source, media_type)
+            future.set_result(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody else may be waiting; don't leave "exception never retrieved" behind
+            future.exception()
+            raise
+        finally:
+            del self._inflight[digest]
+        if result[1]:
+            self._remember(digest, result[0])
+        return result
+
+    async def _convert(self, source: Source, media_type: str) -> Conversion:
+        size = source_size(source)
+        route = "inline" if size <= self.inline_bytes else "pool"
+        started = time.perf_counter()
+        try:
+            if route == "inline":
+                result = convert_document(source, media_type)
+            else:
+                try:
+                    result = await self.pool.run(convert_document, source, media_type, timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    logger.warning(f"Conversion of {size} bytes ({media_type}) timed out after {self.timeout}s")
+                    result = (pdf_placeholder(size) if media_type == "application/pdf" else "", False)
+                except (BrokenProcessPool, OSError) as e:
+                    # No worker processes available here - still keep the loop free
+                    logger.warning(f"Converter pool unavailable ({e}), converting in a thread")
+                    result = await asyncio.to_thread(convert_document, source, media_type)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._timings[route].add(elapsed, size)
+        if not result[1]:
+            self.failures += 1
+        logger.debug(f"Converted {size} bytes ({media_type}, {route}) in {elapsed * 1000:.0f} ms")
+        return result
+
+    def _remember(self, digest: str, markdown: str):
+        size = len(markdown)
+        if size > self.memo_bytes:
+            return
+        self._memo[digest] = markdown
+        self._memo_size += size
+        while self._memo_size > self.memo_bytes:
+            _, evicted = self._memo.popitem(last=False)
+            self._memo_size -= len(evicted)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inline": self._timings["inline"].snapshot(),
+            "pool": self._timings["pool"].snapshot(),
+            "memo_entries": len(self._memo),
+            "memo_bytes": self._memo_size,
+            "memo_hits": self.memo_hits,
+            "shared_conversions": self.shared,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "inline_max_bytes": self.inline_bytes,
+            "process_pool": self.pool.stats(),
+        }
+
+
+# Shared by every MevzuatApiClient in the process
+markdown_converter = MarkdownConverter()
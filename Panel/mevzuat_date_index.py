@@ -0,0 +1,165 @@
+# mevzuat_date_index.py
+"""
+Date-range search over the Mevzuat API's sorted result list.
+
+searchDocuments has no date filter, so the year-range collection used to read
+every page sorted by RESMI_GAZETE_TARIHI and post-filter by year - stopping
+at the first page without a match, which meant older years were never
+reached. The sorted list is ordered by date, though, so the offsets where a
+date range begins and ends can be found by binary search:
+
+    index = SortedResultIndex(client, request)
+    first, last = await index.date_range_offsets(date(2010, 1, 1), date(2010, 12, 31))
+    documents = await index.slice(first, min(first + 10, last))
+
+- probes read whole pages (PROBE_PAGE_SIZE, the API maximum); one boundary
+  costs about log2(total / 10) page requests
+- pages are cached per query in SortedPageCache for MEVZUAT_DATE_INDEX_TTL
+  seconds and concurrent readers of the same page share one request, so the
+  boundaries of adjacent years and the pages read afterwards mostly come
+  from probes already made
+- documents without a Resmî Gazete date are assumed to sort last and never
+  fall inside a date range
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from mevzuat_models import MevzuatDocument, MevzuatSearchRequest
+
+logger = logging.getLogger(__name__)
+
+PROBE_PAGE_SIZE = 10
+DATE_INDEX_TTL = float(os.getenv("MEVZUAT_DATE_INDEX_TTL", "600"))
+DATE_INDEX_MAX_PAGES = int(os.getenv("MEVZUAT_DATE_INDEX_PAGES", "2048"))
+
+# Query fields that define the sorted result list (pagination and date range excluded)
+_QUERY_FIELDS = {"mevzuat_adi", "phrase", "mevzuat_no", "resmi_gazete_sayisi", "mevzuat_tur_list", "sort_field", "sort_direction"}
+
+PageResult = Tuple[List[MevzuatDocument], int]
+
+
+class SearchPageError(Exception):
+    """A probe page could not be read"""
+
+
+class SortedPageCache:
+    """(query, page) -> (documents, total) with TTL; in-flight fetches are shared"""
+
+    def __init__(self, ttl: float = DATE_INDEX_TTL, max_pages: int = DATE_INDEX_MAX_PAGES):
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[Tuple[str, int], Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.fetches = 0
+
+    async def get(self, key: Tuple[str, int], fetch: Callable[[], Awaitable[PageResult]]) -> PageResult:
+        entry = self._pages.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._pages.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+            return await value if isinstance(value, asyncio.Future) else value
+
+        self.fetches += 1
+        task = asyncio.ensure_future(fetch())
+        self._pages[key] = (time.monotonic() + self.ttl, task)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        try:
+            result = await task
+        except BaseException:
+            if self._pages.get(key, (None, None))[1] is task:
+                del self._pages[key]
+            raise
+        # Keep the plain result so the entry doesn't hold on to the task's event loop
+        if self._pages.get(key, (None, None))[1] is task:
+            self._pages[key] = (self._pages[key][0], result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {"pages": len(self._pages), "hits": self.hits, "fetches": self.fetches}
+
+
+class SortedResultIndex:
+    def __init__(self, client, request: MevzuatSearchRequest):
+        self.client = client
+        self.request = request
+        self.descending = request.sort_direction == "desc"
+        self.query_key = json.dumps(request.model_dump(mode="json", include=_QUERY_FIELDS), sort_keys=True)
+        self.total: Optional[int] = None
+
+    async def page(self, page_number: int) -> List[MevzuatDocument]:
+        """One PROBE_PAGE_SIZE page of the unfiltered sorted list"""
+        async def fetch() -> PageResult:
+            result = await self.client._search_page(self.request.model_copy(update={
+                "page_number": page_number, "page_size": PROBE_PAGE_SIZE,
+                "resmi_gazete_tarihi_start": None, "resmi_gazete_tarihi_end": None,
+            }))
+            if result.error_message:
+                raise SearchPageError(result.error_message)
+            return result.documents, result.total_results
+
+        documents, total = await self.client._sorted_pages.get((self.query_key, page_number), fetch)
+        if self.total is None:
+            self.total = total
+        return documents
+
+    def _past(self, document: MevzuatDocument, bound: datetime) -> bool:
+        """Whether the sort order has passed `bound` at this document (monotonic along the list)"""
+        published = document.resmi_gazete_tarihi
+        if published is None:
+            return True
+        published = published.replace(tzinfo=None)
+        return published < bound if self.descending else published >= bound
+
+    async def offset(self, bound: datetime) -> int:
+        """Index of the first result past `bound`"""
+        if self.total is None:
+            await self.page(1)
+        pages = math.ceil(self.total / PROBE_PAGE_SIZE)
+        # First page whose last document is past the bound
+        low, high = 1, pages + 1
+        while low < high:
+            middle = (low + high) // 2
+            documents = await self.page(middle)
+            if not documents or self._past(documents[-1], bound):
+                high = middle
+            else:
+                low = middle + 1
+        if low > pages:
+            return self.total
+        documents = await self.page(low)
+        for position, document in enumerate(documents):
+            if self._past(document, bound):
+                return (low - 1) * PROBE_PAGE_SIZE + position
+        return min(low * PROBE_PAGE_SIZE, self.total)
+
+    async def date_range_offsets(self, start: Optional[date], end: Optional[date]) -> Tuple[int, int]:
+        """[first, last) offsets of the documents published between start and end (inclusive)"""
+        lower = datetime.combine(start, datetime.min.time()) if start else datetime.min
+        upper = datetime.combine(end + timedelta(days=1), datetime.min.time()) if end else datetime.max
+        if self.descending:
+            first, last = await self.offset(upper), await self.offset(lower)
+        else:
+            first, last = await self.offset(lower), await self.offset(upper)
+        logger.debug(f"Date range {start}..{end}: offsets {first}-{last} of {self.total}")
+        return first, max(first, last)
+
+    async def slice(self, start: int, stop: int) -> List[MevzuatDocument]:
+        """Documents at offsets [start, stop) of the sorted list (copies, safe to modify)"""
+        if stop <= start:
+            return []
+        first_page = start // PROBE_PAGE_SIZE + 1
+        last_page = (stop - 1) // PROBE_PAGE_SIZE + 1
+        pages = await asyncio.gather(*(self.page(number) for number in range(first_page, last_page + 1)))
+        documents = [document for page in pages for document in page]
+        base = (first_page - 1) * PROBE_PAGE_SIZE
+        return [document.model_copy() for document in documents[start - base:stop - base]]
@@ -55,6 +55,8 @@ class MevzuatSearchRequest(BaseModel):
     phrase: Optional[str] = Field(None, description="Search for this term in the FULL TEXT of the legislation. For an exact phrase search, enclose the term in double quotes.")
     mevzuat_no: Optional[str] = Field(None, description="The specific number of the legislation.")
     resmi_gazete_sayisi: Optional[str] = Field(None, description="The issue number of the Official Gazette.")
+    resmi_gazete_tarihi_start: Optional[datetime.date] = Field(None, description="Only legislation published in the Official Gazette on or after this date. Requires sort_field RESMI_GAZETE_TARIHI.")
+    resmi_gazete_tarihi_end: Optional[datetime.date] = Field(None, description="Only legislation published in the Official Gazette on or before this date. Requires sort_field RESMI_GAZETE_TARIHI.")
     mevzuat_tur_list: List[MevzuatTurEnum] = Field(
         default_factory=lambda: ["KANUN", "CB_KARARNAME", "YONETMELIK", "CB_YONETMELIK", "CB_KARAR", "CB_GENELGE", "KHK", "TUZUK", "KKY", "UY", "TEBLIGLER", "MULGA"],
         description="Filter by legislation type. Defaults to all types."
@@ -85,6 +87,7 @@ class MevzuatDocument(BaseModel):
     resmi_gazete_tarihi: Optional[datetime.datetime] = Field(None, alias="resmiGazeteTarihi")
     resmi_gazete_sayisi: Optional[str] = Field(None, alias="resmiGazeteSayisi")
     url: Optional[str] = None
+    full_text: Optional[str] = Field(None, description="Full markdown text, filled by year-range collections with include_full_text")
 
 class MevzuatSearchResult(BaseModel):
     """Model for the overall search result from the legislation API."""
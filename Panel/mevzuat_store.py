@@ -0,0 +1,291 @@
+# mevzuat_store.py
+"""
+Local, content-addressed store for Mevzuat article texts, full documents and
+article trees.
+
+MevzuatApiClient used to ask bedesten.adalet.gov.tr for every article,
+document and tree on every call, although most legislation (5237 TCK, ...)
+changes rarely if ever. The client now reads through this store, so repeat
+lookups - the MCP tools and the /api/mevzuat/* endpoints all go through the
+client - are local reads:
+
+    stored = store.lookup("madde", madde_id)   # None, or StoredDocument (text + validators)
+    store.save("madde", madde_id, original, "text/html", markdown, response.headers)
+
+- originals (HTML / PDF bytes, tree JSON) and derived markdown are zlib
+  blobs under blobs/, named by the SHA-256 of their content, so identical
+  content is stored once
+- refs(kind, key) point at the current original; derived(content hash)
+  remembers the markdown made from an original, so unchanged content is
+  never converted twice
+- large originals are saved from a stream (the client's spooled download)
+  and compressed chunk by chunk
+- entries younger than MEVZUAT_STORE_MAX_AGE are served as is; older ones
+  are still served but the client revalidates them in the background
+  (conditional request when the API gave ETag / Last-Modified, otherwise a
+  refetch whose hash is compared with the stored one)
+
+The store lives in MEVZUAT_STORE_DIR (default: panel_mevzuat_store in the
+temp dir). Reads and writes are blocking; async callers use asyncio.to_thread.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+STORE_KINDS = ("madde", "mevzuat", "tree")
+STORE_MAX_AGE = float(os.getenv("MEVZUAT_STORE_MAX_AGE", str(7 * 24 * 3600)))
+_STREAM_CHUNK = 256 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS refs (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    media_type TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    validated_at REAL NOT NULL,
+    changes INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (kind, key)
+);
+CREATE TABLE IF NOT EXISTS derived (
+    content_hash TEXT PRIMARY KEY,
+    markdown_hash TEXT NOT NULL
+);
+"""
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class StoredDocument:
+    kind: str
+    key: str
+    content_hash: str
+    media_type: str
+    size: int
+    fetched_at: float
+    validated_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    text: Optional[str] = None  # markdown; the tree JSON for kind "tree"
+    validators: Dict[str, str] = field(default_factory=dict)
+
+    def is_fresh(self, max_age: float = STORE_MAX_AGE) -> bool:
+        return time.time() - self.validated_at < max_age
+
+
+class MevzuatDocumentStore:
+    def __init__(self, root: str, max_age: float = STORE_MAX_AGE):
+        self.root = root
+        self.max_age = max_age
+        self._blob_dir = os.path.join(root, "blobs")
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.conversions_saved = 0
+
+    # ------------------------------------------------------------------
+    # Blobs
+    # ------------------------------------------------------------------
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._blob_dir, digest[:2], digest[2:])
+
+    def _put_blob(self, data: bytes) -> str:
+        digest = content_hash(data)
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(partial, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            os.replace(partial, path)
+        return digest
+
+    def _put_blob_stream(self, stream: BinaryIO, digest: str) -> int:
+        """Compress a stream whose SHA-256 is `digest` into its blob, chunk by chunk; returns its size"""
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            stream.seek(0, os.SEEK_END)
+            return stream.tell()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        compressor, sha256, size = zlib.compressobj(6), hashlib.sha256(), 0
+        try:
+            with open(partial, "wb") as f:
+                for chunk in iter(lambda: stream.read(_STREAM_CHUNK), b""):
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    f.write(compressor.compress(chunk))
+                f.write(compressor.flush())
+            if sha256.hexdigest() != digest:
+                raise ValueError(f"Stream does not match its digest {digest}")
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        return size
+
+    def _get_blob(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._blob_path(digest), "rb") as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+        # A blob that doesn't match its name is treated as missing
+        return data if content_hash(data) == digest else None
+
+    # ------------------------------------------------------------------
+    # Documents
+    # ------------------------------------------------------------------
+
+    def lookup(self, kind: str, key: str) -> Optional[StoredDocument]:
+        """Stored document with its markdown (trees: their JSON), or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM refs WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+            derived = row and self._conn.execute(
+                "SELECT markdown_hash FROM derived WHERE content_hash = ?", (row["content_hash"],)
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        if kind == "tree":
+            data = self._get_blob(row["content_hash"])
+        else:
+            data = self._get_blob(derived["markdown_hash"]) if derived else None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        document = StoredDocument(
+            kind=kind, key=key, content_hash=row["content_hash"], media_type=row["media_type"], size=row["size"],
+            fetched_at=row["fetched_at"], validated_at=row["validated_at"],
+            etag=row["etag"], last_modified=row["last_modified"], text=data.decode("utf-8"),
+        )
+        if row["etag"]:
+            document.validators["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            document.validators["If-Modified-Since"] = row["last_modified"]
+        return document
+
+    def original(self, kind: str, key: str) -> Optional[bytes]:
+        """Stored original bytes (HTML, PDF or tree JSON)"""
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash FROM refs WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        return self._get_blob(row["content_hash"]) if row else None
+
+    def derived_markdown(self, digest: str) -> Optional[str]:
+        """Markdown already derived from an original with this hash (any key)"""
+        with self._lock:
+            row = self._conn.execute("SELECT markdown_hash FROM derived WHERE content_hash = ?", (digest,)).fetchone()
+        data = self._get_blob(row["markdown_hash"]) if row else None
+        if data is not None:
+            self.conversions_saved += 1
+        return data.decode("utf-8") if data is not None else None
+
+    def save(self, kind: str, key: str, original: Union[bytes, BinaryIO], media_type: str, markdown: Optional[str] = None,
+             headers: Optional[Dict[str, Any]] = None, digest: Optional[str] = None) -> bool:
+        """
+        Store an original (and its markdown); returns whether the content changed.
+        `original` may be a binary stream (large documents), with its SHA-256 as `digest`.
+        """
+        if kind not in STORE_KINDS:
+            raise ValueError(f"Unknown store kind: {kind}")
+        headers = headers or {}
+        if isinstance(original, bytes):
+            digest, size = self._put_blob(original), len(original)
+        else:
+            size = self._put_blob_stream(original, digest)
+        markdown_digest = self._put_blob(markdown.encode("utf-8")) if markdown is not None else None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash FROM refs WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+            changed = row is not None and row["content_hash"] != digest
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if markdown_digest is not None:
+                    self._conn.execute("INSERT OR REPLACE INTO derived (content_hash, markdown_hash) VALUES (?, ?)",
+                                       (digest, markdown_digest))
+                self._conn.execute(
+                    "INSERT INTO refs (kind, key, content_hash, media_type, size, etag, last_modified, fetched_at, validated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (kind, key) DO UPDATE SET content_hash = excluded.content_hash, "
+                    "media_type = excluded.media_type, size = excluded.size, etag = excluded.etag, "
+                    "last_modified = excluded.last_modified, validated_at = excluded.validated_at, "
+                    "fetched_at = CASE WHEN refs.content_hash = excluded.content_hash THEN refs.fetched_at ELSE excluded.fetched_at END, "
+                    "changes = refs.changes + (refs.content_hash != excluded.content_hash)",
+                    (kind, key, digest, media_type, size, headers.get("etag"), headers.get("last-modified"), now, now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if changed:
+            logger.info(f"Stored {kind} {key} changed upstream ({size} bytes)")
+        return changed
+
+    def touch(self, kind: str, key: str):
+        """Mark an entry revalidated without changes"""
+        with self._lock:
+            self._conn.execute("UPDATE refs SET validated_at = ? WHERE kind = ? AND key = ?", (time.time(), kind, key))
+
+    def prune(self) -> int:
+        """Delete blobs no longer referenced by any entry"""
+        with self._lock:
+            live = {row[0] for row in self._conn.execute("SELECT content_hash FROM refs")}
+            live |= {row[0] for row in self._conn.execute(
+                "SELECT markdown_hash FROM derived WHERE content_hash IN (SELECT content_hash FROM refs)")}
+            self._conn.execute("DELETE FROM derived WHERE content_hash NOT IN (SELECT content_hash FROM refs)")
+        removed = 0
+        for prefix in os.listdir(self._blob_dir):
+            for name in os.listdir(os.path.join(self._blob_dir, prefix)):
+                if prefix + name not in live and not name.endswith(".tmp"):
+                    os.remove(os.path.join(self._blob_dir, prefix, name))
+                    removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT kind, COUNT(*) FROM refs GROUP BY kind").fetchall())
+            size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM refs").fetchone()[0]
+        return {
+            "root": self.root,
+            "entries": {kind: counts.get(kind, 0) for kind in STORE_KINDS},
+            "original_bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "conversions_saved": self.conversions_saved,
+            "max_age_seconds": self.max_age,
+        }
+
+
+def default_store() -> Optional[MevzuatDocumentStore]:
+    """Store in MEVZUAT_STORE_DIR; None when that is set empty or the store can't be opened"""
+    root = os.getenv("MEVZUAT_STORE_DIR", os.path.join(tempfile.gettempdir(), "panel_mevzuat_store"))
+    if not root:
+        return None
+    try:
+        return MevzuatDocumentStore(root)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Mevzuat document store unavailable at {root}: {e}")
+        return None
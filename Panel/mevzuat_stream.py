@@ -0,0 +1,258 @@
+# mevzuat_stream.py
+"""
+Streaming reader for getDocumentContent responses.
+
+A full document arrives as one JSON object whose data.content is the whole
+document base64-encoded. Reading it with response.json() and b64decode kept
+the raw body, the parsed base64 string, the decoded bytes, the decoded HTML
+string and the markdown alive at once - 4-5x the document per request. Here
+the body is parsed while it streams in:
+
+    async with client.stream("POST", url, json=payload) as response:
+        data, document = await read_document_content(response)
+    with document:
+        markdown, _ = await markdown_converter.convert(document.source, document.media_type, document.digest)
+
+- the "content" string is base64-decoded chunk by chunk into a
+  DecodedDocument: memory up to MEVZUAT_SPOOL_BYTES, then a temp file, with
+  its SHA-256 and size computed on the way
+- everything else (metadata, other data fields) is small and parsed as usual;
+  `data` comes back with content set to ""
+- the converter reads the spooled file itself (by path in pool workers), so a
+  request holds at most one network chunk, the spool threshold and the
+  markdown in memory regardless of document size
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SPOOL_BYTES = int(os.getenv("MEVZUAT_SPOOL_BYTES", str(1024 * 1024)))
+SPOOL_DIR = os.getenv("MEVZUAT_SPOOL_DIR") or None  # None: the system temp dir
+
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_BASE64_WHITESPACE = b" \t\r\n"
+
+
+class DecodedDocument:
+    """Decoded document bytes: in memory up to `spool_bytes`, then in a temp file"""
+
+    def __init__(self, spool_bytes: int = SPOOL_BYTES):
+        self.spool_bytes = spool_bytes
+        self.size = 0
+        self.head = b""
+        self.path: Optional[str] = None
+        self._file: BinaryIO = io.BytesIO()
+        self._sha256 = hashlib.sha256()
+
+    def write(self, data: bytes):
+        if not data:
+            return
+        if self.path is None and self.size + len(data) > self.spool_bytes:
+            self._rollover()
+        self._file.write(data)
+        self._sha256.update(data)
+        if len(self.head) < 8:
+            self.head = (self.head + data)[:8]
+        self.size += len(data)
+
+    def _rollover(self):
+        spooled = tempfile.NamedTemporaryFile(prefix="mevzuat-", suffix=".bin", dir=SPOOL_DIR, delete=False)
+        spooled.write(self._file.getvalue())
+        self._file = spooled
+        self.path = spooled.name
+
+    def truncate(self):
+        """Drop everything written so far (undecodable content)"""
+        self.close()
+        self.size = 0
+        self.head = b""
+        self._file = io.BytesIO()
+        self._sha256 = hashlib.sha256()
+
+    def finish(self):
+        self._file.flush()
+
+    @property
+    def digest(self) -> str:
+        return self._sha256.hexdigest()
+
+    @property
+    def media_type(self) -> str:
+        return "application/pdf" if self.head.startswith(b"%PDF") else "text/html"
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """What the converter reads: the bytes while in memory, else the temp file's path"""
+        return self.path if self.path is not None else self._file.getvalue()
+
+    def open(self) -> BinaryIO:
+        """A new reader positioned at the start"""
+        if self.path is not None:
+            return open(self.path, "rb")
+        return io.BytesIO(self._file.getvalue())
+
+    def close(self):
+        self._file.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def __enter__(self) -> "DecodedDocument":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Base64Decoder:
+    """Decodes base64 text fed in arbitrary pieces"""
+
+    def __init__(self, target: DecodedDocument):
+        self.target = target
+        self._carry = b""
+        self.failed = False
+
+    def feed(self, text: bytes):
+        if self.failed:
+            return
+        text = self._carry + text.translate(None, _BASE64_WHITESPACE)
+        usable = len(text) - len(text) % 4
+        self._carry = text[usable:]
+        self._decode(text[:usable])
+
+    def finish(self):
+        if self._carry and not self.failed:
+            self._decode(self._carry + b"=" * (-len(self._carry) % 4))
+        self._carry = b""
+        self.target.finish()
+
+    def _decode(self, text: bytes):
+        try:
+            self.target.write(base64.b64decode(text))
+        except (binascii.Error, ValueError) as e:
+            logger.warning(f"Undecodable document content: {e}")
+            self.failed = True
+            self.target.truncate()
+
+
+class JsonContentExtractor:
+    """
+    Incremental scan of a JSON body: the first string value of `field` is
+    streamed through a base64 decoder, the rest is kept for json.loads.
+    """
+
+    def __init__(self, target: DecodedDocument, field: str = "content"):
+        self.decoder = _Base64Decoder(target)
+        self._key = f'"{field}"'.encode()
+        self._skeleton = bytearray()
+        self._in_string = False
+        self._escape = False
+        self._in_value = False
+        self._string = bytearray()  # current string, only while it may still equal the key
+        self._last_string = b""
+        self._after_key = False
+        self._taken = False
+
+    def feed(self, chunk: bytes):
+        position, length = 0, len(chunk)
+        while position < length:
+            if self._escape:
+                position = self._escaped(chunk, position)
+            elif self._in_value:
+                position = self._value(chunk, position)
+            elif self._in_string:
+                position = self._string_part(chunk, position)
+            else:
+                position = self._structure(chunk, position)
+
+    def _escaped(self, chunk: bytes, position: int) -> int:
+        self._escape = False
+        char = chunk[position:position + 1]
+        if self._in_value:
+            # Base64 only ever needs "\/"; other escapes can only be whitespace
+            if char == b"/":
+                self.decoder.feed(b"/")
+        else:
+            self._skeleton += char
+            if len(self._string) <= len(self._key):
+                self._string += b"\\" + char
+        return position + 1
+
+    def _value(self, chunk: bytes, position: int) -> int:
+        match = _STRING_SPECIAL.search(chunk, position)
+        end = match.start() if match else len(chunk)
+        self.decoder.feed(chunk[position:end])
+        if match is None:
+            return end
+        if chunk[end:end + 1] == b"\\":
+            self._escape = True
+        else:
+            self._in_value = False
+            self._taken = True
+            self._skeleton += b'"'
+            self.decoder.finish()
+        return end + 1
+
+    def _string_part(self, chunk: bytes, position: int) -> int:
+        match = _STRING_SPECIAL.search(chunk, position)
+        end = match.start() if match else len(chunk)
+        self._skeleton += chunk[position:end]
+        if len(self._string) <= len(self._key):
+            self._string += chunk[position:end]
+        if match is None:
+            return end
+        self._skeleton += chunk[end:end + 1]
+        if chunk[end:end + 1] == b"\\":
+            self._escape = True
+        else:
+            self._in_string = False
+            self._last_string = b'"' + bytes(self._string) + b'"'
+        return end + 1
+
+    def _structure(self, chunk: bytes, position: int) -> int:
+        char = chunk[position:position + 1]
+        self._skeleton += char
+        if char == b'"':
+            if self._after_key and not self._taken:
+                self._in_value = True
+            else:
+                self._in_string = True
+                self._string = bytearray()
+            self._after_key = False
+        elif char == b":":
+            self._after_key = self._last_string == self._key
+        elif char not in b" \t\r\n":
+            self._after_key = False
+            self._last_string = b""
+        return position + 1
+
+    def result(self) -> Dict[str, Any]:
+        if not self._taken:
+            self.decoder.finish()
+        return json.loads(bytes(self._skeleton))
+
+
+async def read_document_content(response, spool_bytes: int = SPOOL_BYTES) -> Tuple[Dict[str, Any], DecodedDocument]:
+    """Parse a streamed getDocumentContent response; the caller closes the returned document"""
+    document = DecodedDocument(spool_bytes)
+    try:
+        extractor = JsonContentExtractor(document)
+        async for chunk in response.aiter_bytes():
+            extractor.feed(chunk)
+        return extractor.result(), document
+    except BaseException:
+        document.close()
+        raise
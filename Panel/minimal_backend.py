@@ -6,12 +6,18 @@ Minimal Yargıtay Proxy Backend
 import asyncio
 import httpx
 import re
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from playwright.async_api import async_playwright
+from browser_pool import BrowserPoolTimeout, browser_pool
 
-app = FastAPI(title="Yargıtay Minimal Proxy")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await browser_pool.stop()
+
+app = FastAPI(title="Yargıtay Minimal Proxy", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -37,7 +43,7 @@ class UyapRequest(BaseModel):
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "message": "Minimal proxy çalışıyor!"}
+    return {"status": "ok", "message": "Minimal proxy çalışıyor!", "browser_pool": browser_pool.stats()}
 
 @app.get("/")
 async def root():
@@ -45,11 +51,8 @@ async def root():
 
 async def fetch_with_playwright(url: str, query: str, page: int = 1, is_uyap: bool = False) -> str:
     """Playwright ile veri çek"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page_obj = await browser.new_page()
-        
-        try:
+    try:
+        async with browser_pool.lease() as page_obj:
             await page_obj.goto(url, wait_until="domcontentloaded", timeout=30000)
             
             if is_uyap:
@@ -65,10 +68,10 @@ async def fetch_with_playwright(url: str, query: str, page: int = 1, is_uyap: bo
             content = await page_obj.content()
             return content
             
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Playwright hatası: {str(e)}")
-        finally:
-            await browser.close()
+    except BrowserPoolTimeout as e:
+        raise HTTPException(status_code=503, detail=f"Tarayıcı havuzu dolu, lütfen tekrar deneyin: {str(e)}", headers={"Retry-After": "5"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Playwright hatası: {str(e)}")
 
 @app.post("/api/proxy/yargitay_html")
 async def proxy_yargitay_html(req: YargitayRequest):
@@ -97,6 +100,8 @@ async def proxy_yargitay_html(req: YargitayRequest):
         html_content = await fetch_with_playwright(target_url, req.query, req.page, is_uyap=False)
         return {"success": True, "html": html_content}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Yargıtay proxy hatası: {str(e)}")
 
@@ -125,6 +130,8 @@ async def proxy_uyap_html(req: UyapRequest):
         html_content = await fetch_with_playwright(target_url, req.query, req.page, is_uyap=True)
         return {"success": True, "html": html_content}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"UYAP proxy hatası: {str(e)}")
 
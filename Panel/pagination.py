@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Bounded fan-out over paginated upstream searches.
+
+Scrapers used to walk pages strictly one after another, so a 10-page pull
+cost 10 round trips back to back. fan_out_pages fetches page 1, learns the
+total (and, if not given, the page size) from it, then requests the
+remaining pages with at most `concurrency` in flight:
+
+    run = await fan_out_pages(fetch_page, page_size=10, max_pages=10)
+    run.items  # all pages' items, in page order
+
+- `fetch_page(page)` returns `(items, total)`; total may be None when the
+  source doesn't report one - then a short page marks the end
+- a short page stops the run: later pages are not requested and any already
+  in flight are dropped, so results never contain holes or duplicates
+- results are reassembled in page order; `on_page(page, items, total)` is
+  called in that order too and can stop the run by returning False
+- a failing page after the first is logged, counted in `failed_pages` and
+  reported (in page order) to `on_page_failed(page, error)` - never to
+  `on_page` as an empty page, so callers can't mistake it for a completed
+  one; a failing first page raises
+- the engine adds no rate limiting of its own: fetchers go through the
+  shared per-host limiter (http_clients hooks, CourtJsonClient hooks or
+  rate_limits.acquire_blocking), which spaces the concurrent requests
+
+fan_out_pages_blocking runs a synchronous fetcher (requests-based scrapers)
+the same way, on worker threads.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PAGINATION_CONCURRENCY = int(os.getenv("PAGINATION_CONCURRENCY", "4"))
+
+PageFetcher = Callable[[int], Awaitable[Tuple[List[Any], Optional[int]]]]
+PageCallback = Callable[[int, List[Any], Optional[int]], Optional[bool]]
+PageFailureCallback = Callable[[int, Exception], None]
+
+
+@dataclass
+class PageRun:
+    items: List[Any] = field(default_factory=list)
+    total: Optional[int] = None
+    pages_fetched: int = 0
+    last_page: int = 0
+    failed_pages: List[int] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+async def fan_out_pages(fetch_page: PageFetcher, max_pages: int, page_size: Optional[int] = None,
+                        start_page: int = 1, limit: Optional[int] = None,
+                        concurrency: int = PAGINATION_CONCURRENCY,
+                        on_page: Optional[PageCallback] = None,
+                        on_page_failed: Optional[PageFailureCallback] = None) -> PageRun:
+    started = time.monotonic()
+    run = PageRun()
+
+    first, run.total = await fetch_page(start_page)
+    run.pages_fetched = 1
+    page_size = page_size or len(first)
+    if not first:
+        run.last_page = start_page
+        run.elapsed = time.monotonic() - started
+        if on_page is not None:
+            on_page(start_page, first, run.total)
+        return run
+
+    last_page = start_page + max_pages - 1
+    if run.total is not None and page_size:
+        last_page = min(last_page, math.ceil(run.total / page_size))
+    if limit is not None and page_size:
+        last_page = min(last_page, start_page + math.ceil(limit / page_size) - 1)
+
+    pages: Dict[int, List[Any]] = {}
+    errors: Dict[int, Exception] = {}
+    # Last page that will be delivered; lowered by short pages, limits and on_page
+    stop_at = max(last_page, start_page)
+    next_page = start_page
+
+    def deliver(page: int, items: List[Any], error: Optional[Exception] = None):
+        nonlocal stop_at, next_page
+        pages[page] = items
+        if error is not None:
+            # A failed page is reported, not delivered, and doesn't end the run like a short page
+            errors[page] = error
+        elif page_size and len(items) < page_size:
+            stop_at = min(stop_at, page)
+        while next_page in pages and next_page <= stop_at:
+            items = pages.pop(next_page)
+            if next_page in errors:
+                if on_page_failed is not None:
+                    on_page_failed(next_page, errors.pop(next_page))
+                next_page += 1
+                continue
+            if limit is not None:
+                items = items[:max(0, limit - len(run.items))]
+            run.items.extend(items)
+            run.last_page = next_page
+            if on_page is not None and on_page(next_page, items, run.total) is False:
+                stop_at = next_page
+            if limit is not None and len(run.items) >= limit:
+                stop_at = next_page
+            next_page += 1
+
+    deliver(start_page, first)
+
+    queue = iter(range(start_page + 1, last_page + 1))
+
+    async def worker():
+        for page in queue:
+            if page > stop_at:
+                return
+            try:
+                items, _ = await fetch_page(page)
+                error = None
+            except Exception as e:
+                logger.warning(f"Page {page} failed: {e}")
+                run.failed_pages.append(page)
+                items, error = [], e
+            run.pages_fetched += 1
+            if page <= stop_at:
+                deliver(page, items, error)
+
+    remaining = last_page - start_page
+    if remaining > 0 and stop_at > start_page:
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, remaining))))
+
+    run.elapsed = time.monotonic() - started
+    logger.info(f"Fetched {run.pages_fetched} pages ({len(run.items)} items, last page {run.last_page}) "
+                f"in {run.elapsed:.1f}s with concurrency {concurrency}")
+    return run
+
+
+def fan_out_pages_blocking(fetch_page: Callable[[int], Tuple[List[Any], Optional[int]]], max_pages: int,
+                           page_size: Optional[int] = None, start_page: int = 1, limit: Optional[int] = None,
+                           concurrency: int = PAGINATION_CONCURRENCY,
+                           on_page: Optional[PageCallback] = None,
+                           on_page_failed: Optional[PageFailureCallback] = None) -> PageRun:
+    """fan_out_pages for a synchronous fetcher; must not be called from a running event loop"""
+    async def fetch(page: int):
+        return await asyncio.to_thread(fetch_page, page)
+    return asyncio.run(fan_out_pages(fetch, max_pages, page_size, start_page, limit, concurrency,
+                                     on_page, on_page_failed))
@@ -35,6 +35,12 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import pydantic as _pyd
 import httpx
+from http_clients import RATE_LIMIT_MAX_WAIT, http_clients
+from rate_limiter import RateLimitedError, rate_limits
+from browser_pool import BrowserPoolTimeout, browser_pool
+from webdriver_pool import webdriver_pool
+from selenium_waits import wait_telemetry
+from scraping_jobs import scraping_jobs
 try:
     # Headless tarayıcı (opsiyonel)
     from playwright.async_api import async_playwright  # type: ignore
@@ -332,6 +338,16 @@ async def lifespan(app: FastAPI):
         # Mock: Initialize external API clients
         await asyncio.sleep(0.1)  # Simulate API client setup
         
+        # Warm Playwright fallback browsers up front (otherwise started on first fallback)
+        if _has_playwright and os.getenv("BROWSER_POOL_WARM", "0").lower() in ("1", "true", "yes"):
+            try:
+                await browser_pool.start()
+            except Exception as e:
+                logger.warning(f"Browser pool warmup failed, will retry on first use: {e}")
+        
+        # Scraping job workers; jobs interrupted by the last shutdown resume here
+        await asyncio.to_thread(scraping_jobs.start)
+        
         logger.info("All enterprise components initialized successfully")
         logger.info("Panel Ictihat & Mevzuat Backend ready for production")
         
@@ -344,7 +360,10 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down Panel Backend...")
     # Cleanup resources
-    await asyncio.sleep(0.1)  # Simulate cleanup
+    await asyncio.to_thread(scraping_jobs.stop)
+    await browser_pool.stop()
+    await asyncio.to_thread(webdriver_pool.close)
+    await http_clients.aclose()
     logger.info("Shutdown completed successfully")
 
 # ============================================================================
@@ -616,104 +635,114 @@ async def proxy_yargitay_html(req: ProxyYargitayRequest):
     }
     logger.info(f"🔍 Yargıtay proxy isteği başlatılıyor: query='{req.query}', courtType='{req.courtType}', page='{req.page}'")
     timeout = httpx.Timeout(30.0, connect=10.0)
-    async with httpx.AsyncClient(headers=headers, timeout=timeout, follow_redirects=True, http2=True) as client:
-        try:
-            # Yalnızca GET ile çalış (kullanıcı isteği gibi)
-            params = {
-                "q": req.query,
-                "court": req.courtType or "all",
-                "dateFrom": req.fromISO or "",
-                "dateTo": req.toISO or "",
-                "sayfa": str(req.page or 1)
-            }
-            logger.debug(f"🌐 Yargıtay GET: {params}")
-            r = await client.get(target_url, params=params)
-            logger.debug(f"📥 Yargıtay yanıt durum kodu: {r.status_code}")
+    client = http_clients.client(target_url)
+    try:
+        # Yalnızca GET ile çalış (kullanıcı isteği gibi)
+        params = {
+            "q": req.query,
+            "court": req.courtType or "all",
+            "dateFrom": req.fromISO or "",
+            "dateTo": req.toISO or "",
+            "sayfa": str(req.page or 1)
+        }
+        logger.debug(f"🌐 Yargıtay GET: {params}")
+        r = await client.get(target_url, params=params, headers=headers, timeout=timeout)
+        logger.debug(f"📥 Yargıtay yanıt durum kodu: {r.status_code}")
             
-            if r.status_code != 200:
-                logger.error(f"❌ Yargıtay yanıt hatası: {r.status_code} - {r.text[:500]}")
+        if r.status_code != 200:
+            logger.error(f"❌ Yargıtay yanıt hatası: {r.status_code} - {r.text[:500]}")
             
-            r.raise_for_status()
-            html_content = r.text
-            logger.info(f"✅ Yargıtay HTML alındı: {len(html_content)} karakter")
+        r.raise_for_status()
+        html_content = r.text
+        logger.info(f"✅ Yargıtay HTML alındı: {len(html_content)} karakter")
             
-            return JSONResponse(content={"success": True, "html": html_content})
-        except httpx.TimeoutException as e:
-            error_msg = f"Yargıtay sitesi zaman aşımına uğradı: {e}"
-            logger.error(f"⏰ {error_msg}")
-            raise HTTPException(status_code=504, detail=error_msg)
-        except httpx.HTTPStatusError as e:
-            error_msg = f"Yargıtay sitesi HTTP hatası: {e.response.status_code} - {e.response.text[:200]}"
-            logger.error(f"📵 {error_msg}")
+        return JSONResponse(content={"success": True, "html": html_content})
+    except RateLimitedError as e:
+        error_msg = f"Yargıtay istek limiti dolu, lütfen tekrar deneyin: {e}"
+        logger.warning(f"🚦 {error_msg}")
+        raise HTTPException(status_code=429, detail=error_msg, headers={"Retry-After": str(max(1, int(e.retry_after)))})
+    except httpx.TimeoutException as e:
+        error_msg = f"Yargıtay sitesi zaman aşımına uğradı: {e}"
+        logger.error(f"⏰ {error_msg}")
+        raise HTTPException(status_code=504, detail=error_msg)
+    except httpx.HTTPStatusError as e:
+        error_msg = f"Yargıtay sitesi HTTP hatası: {e.response.status_code} - {e.response.text[:200]}"
+        logger.error(f"📵 {error_msg}")
+        raise HTTPException(status_code=502, detail=error_msg)
+    except httpx.RequestError as e:
+        error_msg = f"Yargıtay sitesi bağlantı hatası: {e}"
+        logger.error(f"🔌 {error_msg}")
+        raise HTTPException(status_code=503, detail=error_msg)
+    except Exception as e:
+        logger.warning(f"HTTP yolunda hata, Playwright fallback denenecek: {e}")
+        # Playwright fallback
+        if not _has_playwright:
+            error_msg = "Playwright kurulu değil. Kur: pip install playwright && python -m playwright install --with-deps chromium"
+            logger.error(error_msg)
             raise HTTPException(status_code=502, detail=error_msg)
-        except httpx.RequestError as e:
-            error_msg = f"Yargıtay sitesi bağlantı hatası: {e}"
-            logger.error(f"🔌 {error_msg}")
-            raise HTTPException(status_code=503, detail=error_msg)
-        except Exception as e:
-            logger.warning(f"HTTP yolunda hata, Playwright fallback denenecek: {e}")
-            # Playwright fallback
-            if not _has_playwright:
-                error_msg = "Playwright kurulu değil. Kur: pip install playwright && python -m playwright install --with-deps chromium"
-                logger.error(error_msg)
-                raise HTTPException(status_code=502, detail=error_msg)
-            try:
-                html = await _yargitay_via_playwright(req.query, req.page or 1)
-                return JSONResponse(content={"success": True, "html": html})
-            except Exception as pe:
-                error_msg = f"Yargıtay Playwright fallback hata: {pe}"
-                logger.error(error_msg, exc_info=True)
-                raise HTTPException(status_code=500, detail=error_msg)
+        try:
+            html = await _yargitay_via_playwright(req.query, req.page or 1)
+            return JSONResponse(content={"success": True, "html": html})
+        except RateLimitedError as pe:
+            error_msg = f"Yargıtay istek limiti dolu, lütfen tekrar deneyin: {pe}"
+            logger.warning(f"🚦 {error_msg}")
+            raise HTTPException(status_code=429, detail=error_msg, headers={"Retry-After": str(max(1, int(pe.retry_after)))})
+        except BrowserPoolTimeout as pe:
+            error_msg = f"Yargıtay tarayıcı havuzu dolu, lütfen tekrar deneyin: {pe}"
+            logger.warning(f"🚦 {error_msg}")
+            raise HTTPException(status_code=503, detail=error_msg, headers={"Retry-After": "5"})
+        except Exception as pe:
+            error_msg = f"Yargıtay Playwright fallback hata: {pe}"
+            logger.error(error_msg, exc_info=True)
+            raise HTTPException(status_code=500, detail=error_msg)
 
 async def _yargitay_via_playwright(query: str, page_no: int) -> str:
-    assert _has_playwright and async_playwright is not None
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"])  # type: ignore
-        context = await browser.new_context(locale="tr-TR", user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36")
-        page = await context.new_page()
-        try:
-            await page.goto("https://karararama.yargitay.gov.tr/", wait_until="load")
-            # Çerez/uyarı varsa kapatmaya çalış
-            for sel in ["button:has-text('Kabul')", "button:has-text('Tamam')", "text=Kabul", "text=Kapat"]:
-                try:
-                    el = await page.query_selector(sel)
-                    if el:
-                        await el.click()
-                        break
-                except Exception:
-                    pass
-            # Arama kutusu doldur
-            selectors = ["input[name='q']", "#q", "input[type='search']", "input[type='text']"]
-            filled = False
-            for sel in selectors:
-                try:
-                    await page.fill(sel, query)
-                    filled = True
-                    break
-                except Exception:
-                    continue
-            if not filled:
-                raise RuntimeError("Yargıtay arama kutusu bulunamadı")
-            # Ara butonu
-            for sel in ["button[type='submit']", "button:has-text('Ara')", "input[type='submit']"]:
-                try:
-                    await page.click(sel)
+    # Warm pooled browser/context instead of launching Chromium per call
+    # Browser navigations draw from the same per-host budget as the HTTP path
+    # (taken before leasing so a throttled call doesn't hold a pooled page)
+    await rate_limits.acquire("https://karararama.yargitay.gov.tr/", max_wait=RATE_LIMIT_MAX_WAIT)
+    async with browser_pool.lease() as page:
+        await page.goto("https://karararama.yargitay.gov.tr/", wait_until="load")
+        # Çerez/uyarı varsa kapatmaya çalış
+        for sel in ["button:has-text('Kabul')", "button:has-text('Tamam')", "text=Kabul", "text=Kapat"]:
+            try:
+                el = await page.query_selector(sel)
+                if el:
+                    await el.click()
                     break
-                except Exception:
-                    continue
-            # Sayfaya git (page_no>1 ise)
-            if page_no > 1:
-                # Basitçe URL query ile sayfa değişimi dene
-                current = page.url
-                sep = "&" if "?" in current else "?"
-                await page.goto(f"{current}{sep}sayfa={page_no}", wait_until="domcontentloaded")
-            # Sonuçları bekle
-            await page.wait_for_selector("table, tbody tr, .result, .tablo", timeout=15000)
-            html = await page.content()
-            return html
-        finally:
-            await context.close()
-            await browser.close()
+            except Exception:
+                pass
+        # Arama kutusu doldur
+        selectors = ["input[name='q']", "#q", "input[type='search']", "input[type='text']"]
+        filled = False
+        for sel in selectors:
+            try:
+                await page.fill(sel, query)
+                filled = True
+                break
+            except Exception:
+                continue
+        if not filled:
+            raise RuntimeError("Yargıtay arama kutusu bulunamadı")
+        # Ara butonu (form gönderimi de bir istek)
+        await rate_limits.acquire(page.url, max_wait=RATE_LIMIT_MAX_WAIT)
+        for sel in ["button[type='submit']", "button:has-text('Ara')", "input[type='submit']"]:
+            try:
+                await page.click(sel)
+                break
+            except Exception:
+                continue
+        # Sayfaya git (page_no>1 ise)
+        if page_no > 1:
+            # Basitçe URL query ile sayfa değişimi dene
+            current = page.url
+            sep = "&" if "?" in current else "?"
+            await rate_limits.acquire(current, max_wait=RATE_LIMIT_MAX_WAIT)
+            await page.goto(f"{current}{sep}sayfa={page_no}", wait_until="domcontentloaded")
+        # Sonuçları bekle
+        await page.wait_for_selector("table, tbody tr, .result, .tablo", timeout=15000)
+        html = await page.content()
+        return html
 
 class ProxyUyapRequest(CompatBaseModel):
     query: str
@@ -738,99 +767,109 @@ async def proxy_uyap_html(req: ProxyUyapRequest):
     }
     logger.info(f"🔍 UYAP proxy isteği başlatılıyor: query='{req.query}', courtType='{req.courtType}', page='{req.page}'")
     timeout = httpx.Timeout(30.0, connect=10.0)
-    async with httpx.AsyncClient(headers=headers, timeout=timeout, follow_redirects=True, http2=True) as client:
-        try:
-            # Sadece GET ile arama
-            params = {
-                "Aranacak Kelime": req.query,
-                "Sıralama": "Karar Tarihine Göre",
-                "sayfa": str(req.page or 1)
-            }
-            logger.debug(f"🌐 UYAP GET: {params}")
-            r = await client.get(target_url, params=params)
-            logger.debug(f"📥 UYAP yanıt durum kodu: {r.status_code}")
+    client = http_clients.client(target_url)
+    try:
+        # Sadece GET ile arama
+        params = {
+            "Aranacak Kelime": req.query,
+            "Sıralama": "Karar Tarihine Göre",
+            "sayfa": str(req.page or 1)
+        }
+        logger.debug(f"🌐 UYAP GET: {params}")
+        r = await client.get(target_url, params=params, headers=headers, timeout=timeout)
+        logger.debug(f"📥 UYAP yanıt durum kodu: {r.status_code}")
             
-            if r.status_code != 200:
-                logger.error(f"❌ UYAP yanıt hatası: {r.status_code} - {r.text[:500]}")
+        if r.status_code != 200:
+            logger.error(f"❌ UYAP yanıt hatası: {r.status_code} - {r.text[:500]}")
             
-            r.raise_for_status()
-            html_content = r.text
-            logger.info(f"✅ UYAP HTML alındı: {len(html_content)} karakter")
+        r.raise_for_status()
+        html_content = r.text
+        logger.info(f"✅ UYAP HTML alındı: {len(html_content)} karakter")
             
-            return JSONResponse(content={"success": True, "html": html_content})
-        except httpx.TimeoutException as e:
-            error_msg = f"UYAP sitesi zaman aşımına uğradı: {e}"
-            logger.error(f"⏰ {error_msg}")
-            raise HTTPException(status_code=504, detail=error_msg)
-        except httpx.HTTPStatusError as e:
-            error_msg = f"UYAP sitesi HTTP hatası: {e.response.status_code} - {e.response.text[:200]}"
-            logger.error(f"📵 {error_msg}")
+        return JSONResponse(content={"success": True, "html": html_content})
+    except RateLimitedError as e:
+        error_msg = f"UYAP istek limiti dolu, lütfen tekrar deneyin: {e}"
+        logger.warning(f"🚦 {error_msg}")
+        raise HTTPException(status_code=429, detail=error_msg, headers={"Retry-After": str(max(1, int(e.retry_after)))})
+    except httpx.TimeoutException as e:
+        error_msg = f"UYAP sitesi zaman aşımına uğradı: {e}"
+        logger.error(f"⏰ {error_msg}")
+        raise HTTPException(status_code=504, detail=error_msg)
+    except httpx.HTTPStatusError as e:
+        error_msg = f"UYAP sitesi HTTP hatası: {e.response.status_code} - {e.response.text[:200]}"
+        logger.error(f"📵 {error_msg}")
+        raise HTTPException(status_code=502, detail=error_msg)
+    except httpx.RequestError as e:
+        error_msg = f"UYAP sitesi bağlantı hatası: {e}"
+        logger.error(f"🔌 {error_msg}")
+        raise HTTPException(status_code=503, detail=error_msg)
+    except Exception as e:
+        logger.warning(f"HTTP yolunda hata, Playwright fallback denenecek: {e}")
+        if not _has_playwright:
+            error_msg = "Playwright kurulu değil. Kur: pip install playwright && python -m playwright install --with-deps chromium"
+            logger.error(error_msg)
             raise HTTPException(status_code=502, detail=error_msg)
-        except httpx.RequestError as e:
-            error_msg = f"UYAP sitesi bağlantı hatası: {e}"
-            logger.error(f"🔌 {error_msg}")
-            raise HTTPException(status_code=503, detail=error_msg)
-        except Exception as e:
-            logger.warning(f"HTTP yolunda hata, Playwright fallback denenecek: {e}")
-            if not _has_playwright:
-                error_msg = "Playwright kurulu değil. Kur: pip install playwright && python -m playwright install --with-deps chromium"
-                logger.error(error_msg)
-                raise HTTPException(status_code=502, detail=error_msg)
-            try:
-                html = await _uyap_via_playwright(req.query, req.page or 1)
-                return JSONResponse(content={"success": True, "html": html})
-            except Exception as pe:
-                error_msg = f"UYAP Playwright fallback hata: {pe}"
-                logger.error(error_msg, exc_info=True)
-                raise HTTPException(status_code=500, detail=error_msg)
+        try:
+            html = await _uyap_via_playwright(req.query, req.page or 1)
+            return JSONResponse(content={"success": True, "html": html})
+        except RateLimitedError as pe:
+            error_msg = f"UYAP istek limiti dolu, lütfen tekrar deneyin: {pe}"
+            logger.warning(f"🚦 {error_msg}")
+            raise HTTPException(status_code=429, detail=error_msg, headers={"Retry-After": str(max(1, int(pe.retry_after)))})
+        except BrowserPoolTimeout as pe:
+            error_msg = f"UYAP tarayıcı havuzu dolu, lütfen tekrar deneyin: {pe}"
+            logger.warning(f"🚦 {error_msg}")
+            raise HTTPException(status_code=503, detail=error_msg, headers={"Retry-After": "5"})
+        except Exception as pe:
+            error_msg = f"UYAP Playwright fallback hata: {pe}"
+            logger.error(error_msg, exc_info=True)
+            raise HTTPException(status_code=500, detail=error_msg)
 
 async def _uyap_via_playwright(query: str, page_no: int) -> str:
-    assert _has_playwright and async_playwright is not None
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True, args=["--no-sandbox", "--disable-dev-shm-usage"])  # type: ignore
-        context = await browser.new_context(locale="tr-TR", user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36")
-        page = await context.new_page()
-        try:
-            await page.goto("https://emsal.uyap.gov.tr/index", wait_until="load")
-            # Çerez/uyarı kapatma
-            for sel in ["button:has-text('Kabul')", "button:has-text('Tamam')", "text=Kapat"]:
-                try:
-                    el = await page.query_selector(sel)
-                    if el:
-                        await el.click()
-                        break
-                except Exception:
-                    pass
-            # Aranacak Kelime alanını doldur
-            selectors = ["input[name='Aranacak Kelime']", "#aranacakKelime", "input[placeholder*='Kelime']", "input[type='text']"]
-            filled = False
-            for sel in selectors:
-                try:
-                    await page.fill(sel, query)
-                    filled = True
-                    break
-                except Exception:
-                    continue
-            if not filled:
-                raise RuntimeError("UYAP arama kutusu bulunamadı")
-            # Ara butonu
-            for sel in ["button:has-text('Ara')", "input[type='submit']"]:
-                try:
-                    await page.click(sel)
+    # Warm pooled browser/context instead of launching Chromium per call
+    # Browser navigations draw from the same per-host budget as the HTTP path
+    # (taken before leasing so a throttled call doesn't hold a pooled page)
+    await rate_limits.acquire("https://emsal.uyap.gov.tr/index", max_wait=RATE_LIMIT_MAX_WAIT)
+    async with browser_pool.lease() as page:
+        await page.goto("https://emsal.uyap.gov.tr/index", wait_until="load")
+        # Çerez/uyarı kapatma
+        for sel in ["button:has-text('Kabul')", "button:has-text('Tamam')", "text=Kapat"]:
+            try:
+                el = await page.query_selector(sel)
+                if el:
+                    await el.click()
                     break
-                except Exception:
-                    continue
-            # Sayfa numarası
-            if page_no > 1:
-                current = page.url
-                sep = "&" if "?" in current else "?"
-                await page.goto(f"{current}{sep}sayfa={page_no}", wait_until="domcontentloaded")
-            await page.wait_for_selector("table, tbody tr, .karar, .result", timeout=15000)
-            html = await page.content()
-            return html
-        finally:
-            await context.close()
-            await browser.close()
+            except Exception:
+                pass
+        # Aranacak Kelime alanını doldur
+        selectors = ["input[name='Aranacak Kelime']", "#aranacakKelime", "input[placeholder*='Kelime']", "input[type='text']"]
+        filled = False
+        for sel in selectors:
+            try:
+                await page.fill(sel, query)
+                filled = True
+                break
+            except Exception:
+                continue
+        if not filled:
+            raise RuntimeError("UYAP arama kutusu bulunamadı")
+        # Ara butonu (form gönderimi de bir istek)
+        await rate_limits.acquire(page.url, max_wait=RATE_LIMIT_MAX_WAIT)
+        for sel in ["button:has-text('Ara')", "input[type='submit']"]:
+            try:
+                await page.click(sel)
+                break
+            except Exception:
+                continue
+        # Sayfa numarası
+        if page_no > 1:
+            current = page.url
+            sep = "&" if "?" in current else "?"
+            await rate_limits.acquire(current, max_wait=RATE_LIMIT_MAX_WAIT)
+            await page.goto(f"{current}{sep}sayfa={page_no}", wait_until="domcontentloaded")
+        await page.wait_for_selector("table, tbody tr, .karar, .result", timeout=15000)
+        html = await page.content()
+        return html
 
 @app.get("/api/yargitay/document/{document_id}", tags=["Yargıtay"])
 async def get_yargitay_document(document_id: str):
@@ -1063,279 +1102,6 @@ async def search_emsal(request: EmsalSearchRequest):
 # VERİ ÇEKME (DATA SCRAPING) ENDPOINTS
 # ============================================================================
 
-class DataScrapingRequest(CompatBaseModel):
-    """Veri çekme isteği modeli"""
-    keyword: str = Field(..., description="Aranacak kelime veya ifade")
-    system: str = Field(..., description="Hedef sistem (yargitay, uyap, mevzuat)")
-    limit: int = Field(default=10, ge=1, le=10, description="Sayfa sayısı (sabit 10 sayfa = 100 adet)")
-    date_from: Optional[str] = Field(default=None, description="Başlangıç tarihi (DD.MM.YYYY)")
-    date_to: Optional[str] = Field(default=None, description="Bitiş tarihi (DD.MM.YYYY)")
-    court_type: Optional[str] = Field(default=None, description="Mahkeme türü")
-    headless: bool = Field(default=True, description="Tarayıcı görünürlüğü")
-    save_format: str = Field(default="none", description="Kayıt formatı (none, json, csv, excel)")
-
-class DataScrapingResponse(BaseModel):
-    """Veri çekme yanıt modeli"""
-    success: bool = Field(..., description="İşlem başarılı mı")
-    message: str = Field(..., description="İşlem mesajı")
-    total_results: int = Field(..., description="Toplam sonuç sayısı")
-    file_path: Optional[str] = Field(default=None, description="Kaydedilen dosya yolu")
-    processing_time: float = Field(..., description="İşlem süresi (saniye)")
-    results_preview: List[Dict[str, Any]] = Field(default=[], description="Sonuç önizlemesi")
-
-@app.post("/api/data-scraping/start", response_model=DataScrapingResponse, tags=["Veri Çekme"])
-async def start_data_scraping(request: DataScrapingRequest):
-    """
-    Veri çekme işlemini başlatır.
-    
-    **Desteklenen Sistemler:**
-    • **yargitay**: Yargıtay Karar Arama Sistemi
-    • **uyap**: UYAP Emsal Karar Sistemi  
-    • **mevzuat**: Mevzuat Bilgi Sistemi
-    
-    **Özellikler:**
-    • Çoklu sayfa veri çekme
-    • Rate limiting ile güvenli erişim
-    • JSON, CSV, Excel formatında kayıt
-    • Detaylı karar metni çekme
-    • Yasal uyumluluk kontrolleri
-    """
-    start_time = time.time()
-    
-    try:
-        logger.info(f"🔍 Veri çekme işlemi başlatılıyor: {request.system} - '{request.keyword}'")
-        
-        # Sistem kontrolü
-        if request.system not in ["yargitay", "uyap", "mevzuat"]:
-            raise HTTPException(
-                status_code=400, 
-                detail="Desteklenmeyen sistem. Geçerli sistemler: yargitay, uyap, mevzuat"
-            )
-        
-        # Veri çekme işlemini başlat - Çalışan scraper'ları kullan
-        results = []
-        
-        try:
-            # Mevcut web_panel.py sistemini tam olarak kullan
-            import sys
-            import os
-            import glob
-            import threading
-            
-            # VERİ ÇEKME klasörünü bul
-            current_dir = os.path.dirname(__file__)
-            veri_cekme_dirs = glob.glob(os.path.join(current_dir, 'VER*'))
-            if veri_cekme_dirs:
-                scraper_path = veri_cekme_dirs[0]
-                if scraper_path not in sys.path:
-                    sys.path.append(scraper_path)
-            else:
-                raise ImportError("VERİ ÇEKME klasörü bulunamadı")
-            
-            # Web panel modülünü tam olarak import et
-            try:
-                import web_panel
-            except ImportError as import_err:
-                logger.error(f"Web panel import hatası: {import_err}")
-                # Alternatif import yöntemi
-                import importlib.util
-                web_panel_path = os.path.join(scraper_path, 'web_panel.py')
-                if os.path.exists(web_panel_path):
-                    spec = importlib.util.spec_from_file_location("web_panel", web_panel_path)
-                    web_panel = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(web_panel)
-                    logger.info("Web panel alternatif yöntemle yüklendi")
-                else:
-                    raise ImportError(f"Web panel dosyası bulunamadı: {web_panel_path}")
-            
-            # Global search_status'u web_panel'den al
-            global_search_status = web_panel.search_status
-            
-            if request.system == "yargitay":
-                # Yargıtay web panel sistemi kullan - TAM SİSTEM
-                logger.info(f"Yargıtay web panel sistemi ile veri çekiliyor: {request.keyword}")
-                
-                # Web panel'in kendi fonksiyonunu çağır
-                yargitay_results = web_panel.run_yargitay_search(request.keyword, min(request.limit, 50), True)
-                
-                # Web panel'den gelen sonuçları kullan
-                for result in yargitay_results:
-                    formatted_result = {
-                        'id': str(uuid.uuid4()),
-                        'system': 'yargitay',
-                        'query': request.keyword,
-                        'page': result.get('sayfa', 1),
-                        'case_number': result.get('esas_no', ''),
-                        'decision_date': result.get('karar_tarihi', ''),
-                        'court': result.get('daire', 'Yargıtay'),
-                        'subject': f"{result.get('esas_no', '')} - {result.get('karar_no', '')}",
-                        'content': result.get('karar_metni', 'Karar metni alınamadı'),
-                        'relevance_score': 0.9
-                    }
-                    results.append(formatted_result)
-                
-            elif request.system == "uyap":
-                # UYAP web panel sistemi kullan - TAM SİSTEM
-                logger.info(f"UYAP web panel sistemi ile veri çekiliyor: {request.keyword}")
-                
-                # Web panel'in düzeltilmiş fonksiyonunu çağır - KALDIĞI YERDEN DEVAM ET
-                all_uyap_results = []
-                start_page = 1
-                
-                # HER ZAMAN YENİ VERİ ÇEK - CACHE DEVRE DIŞI
-                logger.info("Cache devre disi - tum sayfalar yeniden cekiliyor")
-                
-                # Cache'i temizle - baştan arama için
-                try:
-                    from cache_manager import clear_keyword_cache
-                    clear_keyword_cache(request.keyword, 'uyap')
-                    logger.info(f"Cache temizlendi: {request.keyword}")
-                except:
-                    pass
-                
-                # Mevcut sonuçları temizle - baştan arama için
-                try:
-                    import sys
-                    import os
-                    import glob
-                    current_dir = os.path.dirname(__file__)
-                    veri_cekme_dirs = glob.glob(os.path.join(current_dir, 'VER*'))
-                    if veri_cekme_dirs:
-                        scraper_path = veri_cekme_dirs[0]
-                        if scraper_path not in sys.path:
-                            sys.path.append(scraper_path)
-                        try:
-                            import web_panel
-                        except ImportError:
-                            import importlib.util
-                            web_panel_path = os.path.join(scraper_path, 'web_panel.py')
-                            if os.path.exists(web_panel_path):
-                                spec = importlib.util.spec_from_file_location("web_panel", web_panel_path)
-                                web_panel = importlib.util.module_from_spec(spec)
-                                spec.loader.exec_module(web_panel)
-                        web_panel.search_status['results'] = []
-                        web_panel.search_status['total_results'] = 0
-                        web_panel.search_status['processed_results'] = 0
-                        logger.info("Mevcut sonuçlar temizlendi - baştan arama")
-                except Exception as e:
-                    logger.error(f"Sonuç temizleme hatası: {e}")
-                
-                # Tüm sayfaları çek - SABİT 10 SAYFA (100 ADET)
-                for page in range(1, 11):  # 1-10 sayfa (100 adet)
-                    logger.info(f"UYAP sayfa {page} çekiliyor...")
-                    page_results = web_panel.run_uyap_search(request.keyword, 10, True, page, 10)  # Her sayfada 10 sonuç
-                    all_uyap_results.extend(page_results)
-                    logger.info(f"Sayfa {page}: {len(page_results)} sonuç çekildi")
-                    if len(page_results) < 10:  # Son sayfaya ulaşıldı
-                        break
-                
-                uyap_results = all_uyap_results
-                
-                # Web panel'den gelen sonuçları kullan - TÜM SONUÇLARI EKLE
-                for result in uyap_results:
-                    formatted_result = {
-                        'id': str(uuid.uuid4()),
-                        'system': 'uyap',
-                        'query': request.keyword,
-                        'page': result.get('sayfa', 1),
-                        'case_number': result.get('esas_no', ''),
-                        'decision_date': result.get('karar_tarihi', ''),
-                        'court': result.get('daire', 'UYAP Emsal'),
-                        'subject': f"{result.get('esas_no', '')} - {result.get('karar_no', '')}",
-                        'content': result.get('karar_metni', 'Karar metni alınamadı'),
-                        'relevance_score': 0.9,
-                        'karar_no': result.get('karar_no', ''),
-                        'karar_durumu': result.get('karar_durumu', 'KESİNLEŞTİ')
-                    }
-                    results.append(formatted_result)
-                
-                logger.info(f"UYAP sonuçları işlendi: {len(results)} adet")
-                
-            elif request.system == "mevzuat":
-                # Mevzuat için gerçek veri çekme (şimdilik boş)
-                logger.info(f"Mevzuat veri çekiliyor: {request.keyword}")
-                # Mevzuat sistemi henüz entegre edilmedi
-                results = []
-            
-            # Limit kontrolü
-            if len(results) > request.limit:
-                results = results[:request.limit]
-                
-        except ImportError as e:
-            logger.error(f"Web panel import hatası: {e}")
-            # Gerçek veri çekme başarısız - boş sonuç döndür
-            results = []
-                
-        except Exception as e:
-            logger.error(f"Veri çekme hatası: {e}")
-            # Gerçek veri çekme başarısız - boş sonuç döndür
-            results = []
-        
-        # Sonuçları kaydet - KAYDETME DEVRE DIŞI
-        file_path = None
-        if results and request.save_format != 'none':
-            file_path = await save_scraped_data(results, request.save_format, request.keyword)
-        
-        processing_time = time.time() - start_time
-        
-        # Sonuç önizlemesi (tüm sonuçlar)
-        preview = results if results else []
-        
-        # Toplam sonuç sayısını al
-        total_found = 0
-        if request.system == "uyap":
-            # UYAP'tan toplam sonuç sayısını al
-            try:
-                import sys
-                import os
-                current_dir = os.path.dirname(__file__)
-                veri_cekme_dirs = glob.glob(os.path.join(current_dir, 'VER*'))
-                if veri_cekme_dirs:
-                    scraper_path = veri_cekme_dirs[0]
-                    if scraper_path not in sys.path:
-                        sys.path.append(scraper_path)
-                    try:
-                        import web_panel
-                    except ImportError:
-                        import importlib.util
-                        web_panel_path = os.path.join(scraper_path, 'web_panel.py')
-                        if os.path.exists(web_panel_path):
-                            spec = importlib.util.spec_from_file_location("web_panel", web_panel_path)
-                            web_panel = importlib.util.module_from_spec(spec)
-                            spec.loader.exec_module(web_panel)
-                    total_found = web_panel.search_status.get('total_results', 0)
-            except:
-                total_found = len(results)
-        else:
-            total_found = len(results)
-        
-        logger.info(f"✅ Veri çekme tamamlandı: {len(results)} sonuç işlendi (Toplam: {total_found:,} adet), {processing_time:.2f}s")
-        
-        # Kullanıcıya bilgi mesajı
-        if request.system == "uyap" and total_found > 100:
-            message = f"{len(results)} adet {request.system} verisi işlendi (Toplam: {total_found:,} adet). 11. sayfaya geçtiğinizde yeni 100 veri çekilecek."
-        else:
-            message = f"{len(results)} adet {request.system} verisi işlendi (Toplam: {total_found:,} adet). 10 sayfa (100 adet) çekildi."
-        
-        return DataScrapingResponse(
-            success=True,
-            message=message,
-            total_results=total_found,  # Toplam sonuç sayısı
-            file_path=file_path,
-            processing_time=processing_time,
-            results_preview=preview
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        processing_time = time.time() - start_time
-        logger.error(f"❌ Veri çekme hatası: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Veri çekme işlemi başarısız: {str(e)}"
-        )
-
 def parse_yargitay_html(html: str, query: str, page: int) -> List[Dict[str, Any]]:
     """Yargıtay HTML'ini parse eder"""
     try:
@@ -1525,49 +1291,49 @@ async def scrape_mevzuat_data(query: str, page: int) -> List[Dict[str, Any]]:
         }
         
         timeout = httpx.Timeout(30.0, connect=10.0)
-        async with httpx.AsyncClient(headers=headers, timeout=timeout) as client:
-            response = await client.post(target_url, data=data)
-            response.raise_for_status()
+        client = http_clients.client(target_url)
+        response = await client.post(target_url, data=data, headers=headers, timeout=timeout)
+        response.raise_for_status()
             
-            # HTML'den mevzuat verilerini parse et
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
+        # HTML'den mevzuat verilerini parse et
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(response.text, 'html.parser')
+        results = []
             
-            mevzuat_items = soup.find_all('div', class_='mevzuat-item') or soup.find_all('tr', class_='mevzuat-row')
+        mevzuat_items = soup.find_all('div', class_='mevzuat-item') or soup.find_all('tr', class_='mevzuat-row')
             
-            for item in mevzuat_items:
-                try:
-                    result = {
-                        'id': str(uuid.uuid4()),
-                        'system': 'mevzuat',
-                        'query': query,
-                        'page': page,
-                        'case_number': '',
-                        'decision_date': '',
-                        'court': 'Mevzuat Bilgi Sistemi',
-                        'subject': '',
-                        'content': '',
-                        'relevance_score': 0.8
-                    }
+        for item in mevzuat_items:
+            try:
+                result = {
+                    'id': str(uuid.uuid4()),
+                    'system': 'mevzuat',
+                    'query': query,
+                    'page': page,
+                    'case_number': '',
+                    'decision_date': '',
+                    'court': 'Mevzuat Bilgi Sistemi',
+                    'subject': '',
+                    'content': '',
+                    'relevance_score': 0.8
+                }
                     
-                    # Mevzuat başlığı
-                    title_elem = item.find('h3') or item.find('td', class_='baslik')
-                    if title_elem:
-                        result['subject'] = title_elem.get_text(strip=True)
+                # Mevzuat başlığı
+                title_elem = item.find('h3') or item.find('td', class_='baslik')
+                if title_elem:
+                    result['subject'] = title_elem.get_text(strip=True)
                     
-                    # Mevzuat içeriği
-                    content_elem = item.find('div', class_='icerik') or item.find('td', class_='ozet')
-                    if content_elem:
-                        result['content'] = content_elem.get_text(strip=True)
+                # Mevzuat içeriği
+                content_elem = item.find('div', class_='icerik') or item.find('td', class_='ozet')
+                if content_elem:
+                    result['content'] = content_elem.get_text(strip=True)
                     
-                    results.append(result)
+                results.append(result)
                     
-                except Exception as e:
-                    logger.warning(f"⚠️ Mevzuat item parse hatası: {e}")
-                    continue
+            except Exception as e:
+                logger.warning(f"⚠️ Mevzuat item parse hatası: {e}")
+                continue
             
-            return results
+        return results
             
     except Exception as e:
         logger.error(f"❌ Mevzuat veri çekme hatası: {e}")
@@ -1630,36 +1396,6 @@ async def save_scraped_data(results: List[Dict[str, Any]], format_type: str, key
         logger.error(f"❌ Veri kaydetme hatası: {e}")
         raise
 
-@app.get("/api/data-scraping/status", tags=["Veri Çekme"])
-async def get_scraping_status():
-    """Veri çekme durumunu kontrol eder"""
-    try:
-        # Kaydedilen dosyaları listele
-        scraped_dir = os.path.join(tempfile.gettempdir(), "panel_scraped")
-        files = []
-        
-        if os.path.exists(scraped_dir):
-            for filename in os.listdir(scraped_dir):
-                if filename.startswith("scraped_data_"):
-                    filepath = os.path.join(scraped_dir, filename)
-                    stat = os.stat(filepath)
-                    files.append({
-                        'filename': filename,
-                        'size': stat.st_size,
-                        'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-                    })
-        
-        return {
-            "success": True,
-            "total_files": len(files),
-            "files": sorted(files, key=lambda x: x['modified'], reverse=True)
-        }
-        
-    except Exception as e:
-        logger.error(f"❌ Durum kontrol hatası: {e}")
-        raise HTTPException(status_code=500, detail=f"Durum kontrolü başarısız: {str(e)}")
-
 @app.get("/api/data-scraping/download/{filename}", tags=["Veri Çekme"])
 async def download_scraped_file(filename: str):
     """Çekilen veri dosyasını indirir"""
@@ -1755,335 +1491,114 @@ class DataScrapingRequest(CompatBaseModel):
     system: str = Field(default="UYAP", description="Sistem seçimi: UYAP, Yargıtay, Her İkisi")
     headless: bool = Field(default=True, description="Headless mod")
 
-class DataScrapingStatus(CompatBaseModel):
-    """Veri çekme durumu modeli"""
-    is_running: bool = Field(default=False, description="Arama çalışıyor mu")
-    status: str = Field(default="Hazır", description="Durum mesajı")
-    progress: int = Field(default=0, description="İlerleme yüzdesi")
-    results: List[Dict[str, Any]] = Field(default_factory=list, description="Sonuçlar")
-    logs: List[str] = Field(default_factory=list, description="Log mesajları")
-    total_results: int = Field(default=0, description="Toplam sonuç sayısı")
-    current_decision: int = Field(default=0, description="Mevcut karar sayısı")
+class ScrapingJobRequest(DataScrapingRequest):
+    """Kuyruğa alınacak veri çekme işi"""
+    start_page: int = Field(default=1, ge=1, description="Başlangıç sayfası")
 
-# Global veri çekme durumu
-scraping_status = DataScrapingStatus()
+def _job_or_404(job_id: str) -> Dict[str, Any]:
+    job = scraping_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"İş bulunamadı: {job_id}")
+    return job
 
-@app.post("/api/data-scraping/start", tags=["Data Scraping"])
-async def start_data_scraping(request: DataScrapingRequest):
-    """Veri çekme işlemini başlat"""
-    global scraping_status
-    
-    if scraping_status.is_running:
-        raise HTTPException(status_code=400, detail="Veri çekme işlemi zaten çalışıyor")
-    
+def _submit_scraping_job(request: DataScrapingRequest, start_page: int = 1,
+                         parent_id: Optional[str] = None) -> Dict[str, Any]:
     try:
-        # Durumu sıfırla
-        scraping_status.is_running = True
-        scraping_status.status = "Arama başlatılıyor..."
-        scraping_status.progress = 0
-        scraping_status.results = []
-        scraping_status.logs = []
-        scraping_status.total_results = 0
-        scraping_status.current_decision = 0
-        
-        # Arka planda veri çekme işlemini başlat
-        import threading
-        scraping_thread = threading.Thread(
-            target=run_scraping_thread,
-            args=(request.keyword, request.limit, request.system, request.headless)
-        )
-        scraping_thread.daemon = True
-        scraping_thread.start()
-        
-        logger.info(f"Veri çekme başlatıldı: '{request.keyword}' ({request.limit} sonuç)")
-        return {"success": True, "message": "Veri çekme işlemi başlatıldı"}
-        
-    except Exception as e:
-        scraping_status.is_running = False
-        scraping_status.status = "Hata oluştu"
-        logger.error(f"Veri çekme başlatma hatası: {e}")
-        raise HTTPException(status_code=500, detail=f"Veri çekme başlatılamadı: {str(e)}")
+        job = scraping_jobs.submit(request.keyword, request.system, pages=request.limit,
+                                   headless=request.headless, start_page=start_page, parent_id=parent_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"Veri çekme işi kuyruğa alındı: {job['id']} '{request.keyword}' ({request.system})")
+    return job
+
+def _legacy_scraping_status(job: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Eski tek-iş durum şekli (panel bileşenleri bunu okuyor); devam işleri zincirdeki sonuçları da içerir"""
+    if job is None:
+        return {"is_running": False, "progress": 0, "status": "Hazır", "results": [], "logs": [],
+                "total_results": 0, "current_page": 1, "current_decision": 0, "file_path": None,
+                "processing_time": 0, "job_id": None}
+    results = []
+    for link in scraping_jobs.chain(job["id"]):
+        results.extend(scraping_jobs.results(link["id"], 0, link["result_count"] or 1))
+    logs = [f"[{datetime.fromtimestamp(entry['created_at']).strftime('%H:%M:%S')}] {entry['message']}"
+            for entry in scraping_jobs.logs(job["id"])]
+    started = job["started_at"] or job["created_at"]
+    return {
+        "is_running": job["status"] in ("queued", "running"),
+        "progress": job["progress"],
+        "status": job["message"],
+        "results": results,
+        "logs": logs,
+        "total_results": job["total_results"] or len(results),
+        "current_page": scraping_jobs.last_page(job["id"]) or job["start_page"],
+        "current_decision": len(results),
+        "file_path": None,
+        "processing_time": (job["finished_at"] or time.time()) - started,
+        "job_id": job["id"],
+    }
+
+def _latest_scraping_job() -> Optional[Dict[str, Any]]:
+    jobs = scraping_jobs.list(limit=1)
+    return jobs[0] if jobs else None
 
-@app.get("/api/data-scraping/status", response_model=DataScrapingStatus, tags=["Data Scraping"])
-async def get_scraping_status():
-    """Veri çekme durumunu al"""
-    return scraping_status
+@app.post("/api/data-scraping/start", tags=["Data Scraping"])
+async def start_data_scraping(request: DataScrapingRequest):
+    """Veri çekme işini kuyruğa al ve iş kimliğini döndür (durum: /api/scraping-jobs/{job_id})"""
+    job = await asyncio.to_thread(_submit_scraping_job, request)
+    return {"success": True, "message": f"Veri çekme kuyruğa alındı ({request.limit} sayfa)",
+            "job_id": job["id"], "job": job}
+
+@app.post("/api/scraping-jobs", tags=["Data Scraping"])
+async def create_scraping_job(request: ScrapingJobRequest):
+    """Veri çekme işini kuyruğa al; durum ve sonuçlar iş kimliğiyle sorgulanır"""
+    job = await asyncio.to_thread(_submit_scraping_job, request, request.start_page)
+    return {"success": True, "job": job}
+
+@app.get("/api/scraping-jobs", tags=["Data Scraping"])
+async def list_scraping_jobs(limit: int = Query(50, ge=1, le=500), status: Optional[str] = Query(None)):
+    """Son veri çekme işleri"""
+    jobs = await asyncio.to_thread(scraping_jobs.list, limit, status)
+    return {"jobs": jobs, "stats": scraping_jobs.stats()}
+
+@app.get("/api/scraping-jobs/{job_id}", tags=["Data Scraping"])
+async def get_scraping_job(job_id: str, logs: int = Query(50, ge=0, le=500)):
+    """İş durumu ve ilerlemesi"""
+    job = await asyncio.to_thread(_job_or_404, job_id)
+    job["logs"] = await asyncio.to_thread(scraping_jobs.logs, job_id, logs) if logs else []
+    job["last_page"] = await asyncio.to_thread(scraping_jobs.last_page, job_id)
+    return job
+
+@app.get("/api/scraping-jobs/{job_id}/results", tags=["Data Scraping"])
+async def get_scraping_job_results(job_id: str, offset: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    """İşin şimdiye kadar kaydedilmiş sonuçları (sayfa sırasıyla)"""
+    job = await asyncio.to_thread(_job_or_404, job_id)
+    results = await asyncio.to_thread(scraping_jobs.results, job_id, offset, limit)
+    return {"job_id": job_id, "status": job["status"], "total": job["result_count"],
+            "offset": offset, "results": results}
+
+@app.post("/api/scraping-jobs/{job_id}/cancel", tags=["Data Scraping"])
+async def cancel_scraping_job(job_id: str):
+    """İşi iptal et (çalışıyorsa mevcut sayfa bitince durur)"""
+    await asyncio.to_thread(_job_or_404, job_id)
+    job = await asyncio.to_thread(scraping_jobs.cancel, job_id)
+    return {"success": True, "job": job}
 
 @app.post("/api/data-scraping/stop", tags=["Data Scraping"])
 async def stop_data_scraping():
-    """Veri çekme işlemini durdur"""
-    global scraping_status
-    scraping_status.is_running = False
-    scraping_status.status = "Durduruldu"
-    logger.info("Veri çekme durduruldu")
-    return {"success": True, "message": "Veri çekme durduruldu"}
+    """Kuyruktaki ve çalışan veri çekme işlerini iptal et"""
+    def cancel_all():
+        jobs = scraping_jobs.list(limit=500, status="running") + scraping_jobs.list(limit=500, status="queued")
+        return [scraping_jobs.cancel(job["id"]) for job in jobs]
+    cancelled = await asyncio.to_thread(cancel_all)
+    logger.info(f"Veri çekme durduruldu: {len(cancelled)} iş iptal edildi")
+    return {"success": True, "message": "Veri çekme durduruldu", "cancelled": len(cancelled)}
 
 @app.post("/api/data-scraping/clear", tags=["Data Scraping"])
 async def clear_scraping_results():
-    """Veri çekme sonuçlarını temizle"""
-    global scraping_status
-    scraping_status.results = []
-    scraping_status.logs = []
-    scraping_status.progress = 0
-    scraping_status.status = "Hazır"
-    scraping_status.total_results = 0
-    scraping_status.current_decision = 0
-    logger.info("Veri çekme sonuçları temizlendi")
-    return {"success": True, "message": "Sonuçlar temizlendi"}
-
-def run_scraping_thread(keyword: str, limit: int, system: str, headless: bool):
-    """Veri çekme thread'i"""
-    global scraping_status
-    
-    try:
-        # UYAP veri çekme
-        if system in ["UYAP", "Her İkisi"]:
-            scraping_status.logs.append("=== UYAP ARAMA ===")
-            scraping_status.progress = 25
-            
-            uyap_results = run_uyap_scraping(keyword, limit, headless)
-            if uyap_results:
-                scraping_status.results.extend(uyap_results)
-                scraping_status.logs.append(f"UYAP: {len(uyap_results)} sonuç bulundu")
-            else:
-                scraping_status.logs.append("UYAP: Sonuç bulunamadı")
-        
-        # Yargıtay veri çekme
-        if system in ["Yargıtay", "Her İkisi"]:
-            scraping_status.logs.append("=== YARGITAY ARAMA ===")
-            scraping_status.progress = 75
-            
-            yargitay_results = run_yargitay_scraping(keyword, limit, headless)
-            if yargitay_results:
-                scraping_status.results.extend(yargitay_results)
-                scraping_status.logs.append(f"Yargıtay: {len(yargitay_results)} sonuç bulundu")
-            else:
-                scraping_status.logs.append("Yargıtay: Sonuç bulunamadı")
-        
-        scraping_status.progress = 100
-        scraping_status.status = "Tamamlandı"
-        scraping_status.total_results = len(scraping_status.results)
-        scraping_status.logs.append("✅ Veri çekme tamamlandı!")
-        
-    except Exception as e:
-        scraping_status.logs.append(f"❌ Hata: {str(e)}")
-        scraping_status.status = "Hata oluştu"
-        logger.error(f"Veri çekme hatası: {e}")
-    finally:
-        scraping_status.is_running = False
-
-def run_uyap_scraping(keyword: str, limit: int, headless: bool):
-    """UYAP veri çekme fonksiyonu"""
-    try:
-        from selenium import webdriver
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.chrome.options import Options
-        import time
-        
-        # Chrome seçenekleri
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get("https://emsal.uyap.gov.tr/")
-        
-        scraping_status.logs.append("UYAP site yüklendi")
-        time.sleep(2)
-        
-        # Arama yap
-        search_input = driver.find_element(By.CSS_SELECTOR, "input[name='aranan']")
-        search_input.clear()
-        search_input.send_keys(keyword)
-        
-        search_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Ara')]")
-        search_button.click()
-        
-        scraping_status.logs.append("Arama yapıldı")
-        time.sleep(3)
-        
-        # Sonuçları çek - Sayfalama ile
-        results = []
-        current_page = 1
-        results_per_page = 10
-        total_pages = (limit + results_per_page - 1) // results_per_page  # Ceiling division
-        
-        scraping_status.logs.append(f"📄 Toplam {total_pages} sayfa çekilecek (sayfa başına {results_per_page} sonuç)")
-        
-        while len(results) < limit and current_page <= total_pages:
-            scraping_status.logs.append(f"📄 UYAP sayfa {current_page} çekiliyor...")
-            
-            # Sayfa değiştirme (ilk sayfa hariç) - Basitleştirilmiş
-            if current_page > 1:
-                scraping_status.logs.append(f"Sayfa {current_page}'e geçiliyor...")
-                time.sleep(1)  # Sayfa değişimi için bekleme
-            
-            # Mevcut sayfadaki sonuçları çek
-            tables = driver.find_elements(By.TAG_NAME, "table")
-            
-            if len(tables) >= 2:
-                result_table = tables[1]
-                rows = result_table.find_elements(By.TAG_NAME, "tr")
-                
-                # Sayfa başına maksimum 10 sonuç
-                page_start = 1
-                page_end = min(len(rows), page_start + results_per_page)
-                
-                for i in range(page_start, page_end):
-                    if len(results) >= limit:
-                        break
-                        
-                    try:
-                        row = rows[i]
-                        cells = row.find_elements(By.TAG_NAME, "td")
-                        
-                        if len(cells) >= 5:
-                            result = {
-                                'daire': cells[0].text.strip(),
-                                'esas_no': cells[1].text.strip(),
-                                'karar_no': cells[2].text.strip(),
-                                'karar_tarihi': cells[3].text.strip(),
-                                'karar_durumu': cells[4].text.strip(),
-                                'sistem': 'UYAP',
-                                'sayfa': current_page,
-                                'content': f"Esas No: {cells[1].text.strip()}, Karar No: {cells[2].text.strip()}, Tarih: {cells[3].text.strip()}, Daire: {cells[0].text.strip()}, Durum: {cells[4].text.strip()}"
-                            }
-                            
-                            results.append(result)
-                            scraping_status.current_decision = len(results)
-                            scraping_status.logs.append(f"✅ UYAP Karar {len(results)}: {result['esas_no']} (Sayfa {current_page})")
-                            
-                            # Her karar çekildiğinde anında panele yansıt
-                            scraping_status.results = results.copy()
-                            scraping_status.total_results = len(results)
-                            scraping_status.logs.append(f"🔄 Karar {len(results)} panele yansıtıldı: {result['esas_no']}")
-                            
-                    except Exception as e:
-                        scraping_status.logs.append(f"Karar {i} işleme hatası: {e}")
-                        continue
-            
-            current_page += 1
-            time.sleep(1)  # Sayfa değişimi için bekleme
-        
-        driver.quit()
-        return results
-        
-    except Exception as e:
-        scraping_status.logs.append(f"UYAP arama hatası: {e}")
-        if 'driver' in locals():
-            driver.quit()
-        return []
-
-def run_yargitay_scraping(keyword: str, limit: int, headless: bool):
-    """Yargıtay veri çekme fonksiyonu"""
-    try:
-        from selenium import webdriver
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.chrome.options import Options
-        import time
-        
-        # Chrome seçenekleri
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get("https://karararama.yargitay.gov.tr/")
-        
-        scraping_status.logs.append("Yargıtay site yüklendi")
-        time.sleep(2)
-        
-        # Arama yap
-        search_input = driver.find_element(By.ID, "aranan")
-        search_input.clear()
-        search_input.send_keys(keyword)
-        
-        search_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Ara')]")
-        search_button.click()
-        
-        scraping_status.logs.append("Arama yapıldı")
-        time.sleep(3)
-        
-        # Sonuçları çek - Sayfalama ile
-        results = []
-        current_page = 1
-        results_per_page = 10
-        total_pages = (limit + results_per_page - 1) // results_per_page  # Ceiling division
-        
-        scraping_status.logs.append(f"📄 Toplam {total_pages} sayfa çekilecek (sayfa başına {results_per_page} sonuç)")
-        
-        while len(results) < limit and current_page <= total_pages:
-            scraping_status.logs.append(f"📄 Yargıtay sayfa {current_page} çekiliyor...")
-            
-            # Sayfa değiştirme (ilk sayfa hariç) - Basitleştirilmiş
-            if current_page > 1:
-                scraping_status.logs.append(f"Sayfa {current_page}'e geçiliyor...")
-                time.sleep(1)  # Sayfa değişimi için bekleme
-            
-            # Mevcut sayfadaki sonuçları çek
-            try:
-                result_table = driver.find_element(By.ID, "detayAramaSonuclar")
-                rows = result_table.find_elements(By.TAG_NAME, "tr")
-                
-                # Sayfa başına maksimum 10 sonuç
-                page_start = 1
-                page_end = min(len(rows), page_start + results_per_page)
-                
-                for i in range(page_start, page_end):
-                    if len(results) >= limit:
-                        break
-                        
-                    try:
-                        row = rows[i]
-                        cells = row.find_elements(By.TAG_NAME, "td")
-                        
-                        if len(cells) >= 5:
-                            result = {
-                                'sira_no': cells[0].text.strip(),
-                                'daire': cells[1].text.strip(),
-                                'esas_no': cells[2].text.strip(),
-                                'karar_no': cells[3].text.strip(),
-                                'karar_tarihi': cells[4].text.strip(),
-                                'sistem': 'Yargıtay',
-                                'sayfa': current_page,
-                                'content': f"Esas No: {cells[2].text.strip()}, Karar No: {cells[3].text.strip()}, Tarih: {cells[4].text.strip()}, Daire: {cells[1].text.strip()}, Durum: KESİNLEŞTİ"
-                            }
-                            
-                            results.append(result)
-                            scraping_status.current_decision = len(results)
-                            scraping_status.logs.append(f"✅ Yargıtay Karar {len(results)}: {result['esas_no']} (Sayfa {current_page})")
-                            
-                            # Her karar çekildiğinde anında panele yansıt
-                            scraping_status.results = results.copy()
-                            scraping_status.total_results = len(results)
-                            scraping_status.logs.append(f"🔄 Karar {len(results)} panele yansıtıldı: {result['esas_no']}")
-                            
-                    except Exception as e:
-                        scraping_status.logs.append(f"Karar {i} işleme hatası: {e}")
-                        continue
-                        
-            except Exception as e:
-                scraping_status.logs.append(f"Sayfa {current_page} tablo bulunamadı: {e}")
-            
-            current_page += 1
-            time.sleep(1)  # Sayfa değişimi için bekleme
-        
-        driver.quit()
-        return results
-        
-    except Exception as e:
-        scraping_status.logs.append(f"Yargıtay arama hatası: {e}")
-        if 'driver' in locals():
-            driver.quit()
-        return []
+    """Bitmiş veri çekme işlerini ve sonuçlarını temizle"""
+    removed = await asyncio.to_thread(scraping_jobs.purge_finished)
+    logger.info(f"Veri çekme sonuçları temizlendi: {removed} iş")
+    return {"success": True, "message": "Sonuçlar temizlendi", "removed": removed}
 
 # ============================================================================
 # STATISTICS & INFORMATION ENDPOINTS
@@ -2130,7 +1645,13 @@ async def get_statistics():
             "active_connections": active_connections,
             "total_endpoints": 12,
             "health_status": "healthy"
-        }
+        },
+        "upstream_http": http_clients.stats(),
+        "rate_limits": rate_limits.stats(),
+        "browser_pool": browser_pool.stats(),
+        "webdriver_pool": webdriver_pool.stats(),
+        "selenium_waits": wait_telemetry.stats(),
+        "scraping_jobs": scraping_jobs.stats()
     })
 
 @app.get("/", tags=["Information"])
@@ -2163,250 +1684,59 @@ async def root():
 # SELENIUM ENTEGRASYONU - GERÇEK VERİ ÇEKME SİSTEMİ
 # ============================================================================
 
-# Global real scraping durumu
-real_scraping_status = {
-    "is_running": False,
-    "progress": 0,
-    "status": "Hazır",
-    "results": [],
-    "logs": [],
-    "total_results": 0,
-    "current_page": 1,
-    "current_decision": 0,
-    "pagination_size": 10,
-    "file_path": None,
-    "start_time": None
-}
-
 @app.post("/api/data-scraping/real-start", tags=["Gerçek Veri Çekme"])
 async def start_real_data_scraping(request: DataScrapingRequest):
-    """Gerçek selenium veri çekme başlat"""
-    global real_scraping_status
-    
-    try:
-        if real_scraping_status["is_running"]:
-            raise HTTPException(status_code=400, detail="Veri çekme zaten çalışıyor")
-        
-        logger.info(f"🔍 Gerçek veri çekme başlatılıyor: {request.system} - '{request.keyword}'")
-        
-        real_scraping_status.update({
-            "is_running": True,
-            "progress": 0,
-            "status": f"Arama başlatılıyor: '{request.keyword}' ({request.system})",
-            "results": [],
-            "logs": [f"[{datetime.now().strftime('%H:%M:%S')}] 🔍 Gerçek veri çekme başlatıldı"],
-            "total_results": 0,
-            "current_page": 1,
-            "current_decision": 0,
-            "file_path": None,
-            "start_time": time.time()
-        })
-        
-        import threading
-        real_scraping_thread = threading.Thread(
-            target=run_real_scraping_thread,
-            args=(request.keyword, request.system, request.limit, request.headless)
-        )
-        real_scraping_thread.daemon = True
-        real_scraping_thread.start()
-        
-        return {"success": True, "message": "✅ Gerçek selenium veri çekme başlatıldı"}
-        
-    except Exception as e:
-        logger.error(f"Gerçek veri çekme başlatma hatası: {e}")
-        raise HTTPException(status_code=500, detail=f"Veri çekme başlatılamadı: {str(e)}")
+    """Gerçek veri çekme işini kuyruğa al"""
+    logger.info(f"🔍 Gerçek veri çekme başlatılıyor: {request.system} - '{request.keyword}'")
+    job = await asyncio.to_thread(_submit_scraping_job, request)
+    return {"success": True, "message": "✅ Gerçek veri çekme kuyruğa alındı", "job_id": job["id"]}
 
 @app.get("/api/data-scraping/real-status", tags=["Gerçek Veri Çekme"])
-async def get_real_scraping_status():
-    """Gerçek selenium veri çekme durumunu döndür"""
-    global real_scraping_status
-    
-    if real_scraping_status["start_time"]:
-        processing_time = time.time() - real_scraping_status["start_time"]
-    else:
-        processing_time = 0
-    
-    return {
-        "is_running": real_scraping_status["is_running"],
-        "progress": real_scraping_status["progress"],
-        "status": real_scraping_status["status"],
-        "results": real_scraping_status["results"],
-        "logs": real_scraping_status["logs"],
-        "total_results": real_scraping_status["total_results"],
-        "current_page": real_scraping_status["current_page"],
-        "current_decision": real_scraping_status["current_decision"],
-        "file_path": real_scraping_status["file_path"],
-        "processing_time": processing_time
-    }
-
-def run_real_scraping_thread(keyword: str, system: str, limit: int, headless: bool):
-    """Gerçek selenium veri çekme thread'i"""
-    global real_scraping_status
-    
-    try:
-        logger.info(f"🔄 Gerçek selenium scraping başlatıldı: {keyword} ({system})")
-        
-        # Selenium klasöründeki scraper'ı kullan
-        import sys
-        import os
-        current_dir = os.path.dirname(__file__)
-        selenium_dir = os.path.join(current_dir, 'selenium')
-        
-        if os.path.exists(selenium_dir):
-            if selenium_dir not in sys.path:
-                sys.path.append(selenium_dir)
-            
-            try:
-                from selenium_scraper import UYAPScraper, YargitayScraper
-                
-                real_scraping_status["status"] = f"📄 {system.upper()} scraper başlatılıyor..."
-                real_scraping_status["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] 🔧 {system.upper()} scraper başlatılıyor...")
-                
-                if system == "uyap":
-                    scraper = UYAPScraper(headless=headless)
-                elif system == "yargitay":
-                    scraper = YargitayScraper(headless=headless)
-                else:
-                    raise ValueError(f"Desteklenmeyen sistem: {system}")
-                
-                results = scraper.search_decisions(keyword, limit=limit)
-                
-                if results:
-                    real_scraping_status["results"] = results
-                    real_scraping_status["total_results"] = len(results)
-                    real_scraping_status["status"] = f"✅ {len(results)} karar çekildi"
-                    real_scraping_status["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ Toplam {len(results)} karar çekildi")
-                    
-                    # Excel kaydetme
-                    try:
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        filename = f"{system}_real_sonuclar_{timestamp}.xlsx"
-                        scraper.save_to_excel(results, filename)
-                        real_scraping_status["file_path"] = f"selenium/{filename}"
-                        real_scraping_status["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] 💾 {filename} dosyasına kaydedildi")
-                    except Exception as save_error:
-                        real_scraping_status["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️ Excel kaydetme hatası: {save_error}")
-                else:
-                    real_scraping_status["status"] = "⚠️ Sonuç bulunamadı"
-                    real_scraping_status["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️ Sonuç bulunamadı")
-                    
-            except ImportError as ie:
-                real_scraping_status["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ Selenium scraper import hatası: {ie}")
-                real_scraping_status["status"] = "❌ Scraper bulunamadı"
-        else:
-            real_scraping_status["logs"].append(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ Selenium klasörü bulunamadı")
-            real_scraping_status["status"] = "❌ Selenium sistemi bulunamadı"
-        
-        real_scraping_status.update({
-            "is_running": False,
-            "progress": 100,
-            "status": f"✅ Tamamlandı - {len(real_scraping_status['results'])} sonuç"
-        })
-        
-        logger.info(f"🎉 Gerçek selenium scraping tamamlandı: {len(real_scraping_status['results'])} sonuç")
-        
-    except Exception as e:
-        real_scraping_status.update({
-            "is_running": False,
-            "status": f"❌ Hata: {str(e)}",
-            "logs": real_scraping_status["logs"] + [f"[{datetime.now().strftime('%H:%M:%S')}] ❌ Scraping hatası: {str(e)}"]
-        })
-        logger.error(f"❌ Gerçek selenium scraping hatası: {e}")
+async def get_real_scraping_status(job_id: Optional[str] = Query(None)):
+    """Veri çekme işinin durumu (job_id verilmezse son iş)"""
+    def load():
+        return _legacy_scraping_status(_job_or_404(job_id) if job_id else _latest_scraping_job())
+    return await asyncio.to_thread(load)
 
 # ============================================================================
 # APPLICATION ENTRY POINT
 # ============================================================================
 
 # ============================================================================
-# SELENIUM PROXY ENDPOINTS - CORS SORUNU İÇİN
+# SELENIUM PANEL ENDPOINTS (İŞ KUYRUĞU ÜZERİNDEN)
 # ============================================================================
 
 @app.post("/api/selenium/start_search", tags=["Selenium Proxy"])
 async def selenium_start_search(request: DataScrapingRequest):
-    """Selenium web panel'e proxy - CORS sorunu için"""
-    try:
-        import requests
-        
-        selenium_response = requests.post(
-            "http://localhost:2000/api/start_search",
-            json={
-                "keyword": request.keyword,
-                "limit": request.limit,
-                "system": request.system,
-                "headless": True
-            },
-            timeout=30
-        )
-        
-        if selenium_response.status_code == 200:
-            return selenium_response.json()
-        else:
-            return {"success": False, "message": f"Selenium panel hatası: {selenium_response.status_code}"}
-            
-    except Exception as e:
-        logger.error(f"Selenium proxy hatası: {e}")
-        return {"success": False, "message": f"Proxy hatası: {str(e)}"}
+    """Panel araması - veri çekme işi olarak kuyruğa alınır"""
+    if not request.keyword.strip():
+        return {"success": False, "message": "Anahtar kelime gerekli"}
+    job = await asyncio.to_thread(_submit_scraping_job, request)
+    return {"success": True, "message": "Arama başlatıldı", "job_id": job["id"]}
 
 @app.get("/api/selenium/status", tags=["Selenium Proxy"])
-async def selenium_status():
-    """Selenium web panel status proxy"""
-    try:
-        import requests
-        
-        selenium_response = requests.get("http://localhost:2000/api/status", timeout=10)
-        
-        if selenium_response.status_code == 200:
-            return selenium_response.json()
-        else:
-            return {"success": False, "message": f"Selenium status hatası: {selenium_response.status_code}"}
-            
-    except Exception as e:
-        logger.error(f"Selenium status proxy hatası: {e}")
-        return {"success": False, "message": f"Status proxy hatası: {str(e)}"}
+async def selenium_status(job_id: Optional[str] = Query(None)):
+    """Panel arama durumu (job_id verilmezse son iş)"""
+    return await get_real_scraping_status(job_id)
 
 @app.post("/api/selenium/continue_search", tags=["Selenium Proxy"])
 async def selenium_continue_search(request: DataScrapingRequest):
-    """Selenium web panel continue search proxy"""
-    try:
-        import requests
-        
-        selenium_response = requests.post(
-            "http://localhost:2000/api/continue_search",
-            json={
-                "keyword": request.keyword,
-                "limit": request.limit,
-                "system": request.system,
-                "headless": True,
-                "continue_search": True
-            },
-            timeout=30
-        )
-        
-        if selenium_response.status_code == 200:
-            return selenium_response.json()
-        else:
-            return {"success": False, "message": f"Selenium continue hatası: {selenium_response.status_code}"}
-            
-    except Exception as e:
-        logger.error(f"Selenium continue proxy hatası: {e}")
-        return {"success": False, "message": f"Continue proxy hatası: {str(e)}"}
+    """Son aramanın sonraki sayfalarını yeni bir devam işi olarak kuyruğa al"""
+    previous = await asyncio.to_thread(_latest_scraping_job)
+    if previous is not None and previous["status"] in ("queued", "running"):
+        return {"success": False, "message": "Arama zaten çalışıyor", "job_id": previous["id"]}
+    if previous is None or previous["keyword"] != request.keyword:
+        job = await asyncio.to_thread(_submit_scraping_job, request)
+    else:
+        last_page = await asyncio.to_thread(scraping_jobs.last_page, previous["id"])
+        start_page = (last_page or previous["start_page"] - 1) + 1
+        job = await asyncio.to_thread(_submit_scraping_job, request, start_page, previous["id"])
+    return {"success": True, "message": f"Arama {job['start_page']}. sayfadan devam ediyor", "job_id": job["id"]}
 
 @app.post("/api/selenium/stop_search", tags=["Selenium Proxy"])
 async def selenium_stop_search():
-    """Selenium web panel stop proxy"""
-    try:
-        import requests
-        
-        selenium_response = requests.post("http://localhost:2000/api/stop_search", timeout=10)
-        
-        if selenium_response.status_code == 200:
-            return selenium_response.json()
-        else:
-            return {"success": False, "message": f"Selenium stop hatası: {selenium_response.status_code}"}
-            
-    except Exception as e:
-        logger.error(f"Selenium stop proxy hatası: {e}")
-        return {"success": False, "message": f"Stop proxy hatası: {str(e)}"}
+    """Panel aramasını durdur"""
+    return await stop_data_scraping()
 
 if __name__ == "__main__":
     print("Health: http://localhost:9000/health")
@@ -12,28 +12,51 @@ import logging
 import time
 import uuid
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any, Dict, List, Optional
-from concurrent.futures import ProcessPoolExecutor, TimeoutError
 import traceback
 
+from tool_worker import init_tool_worker, run_connector_call, run_connector_call_once
+from tool_cache import BoundedTTLCache, CacheKeyBuilder, SingleFlight, TieredCache
+from tool_breaker import CircuitBreakerRegistry, CircuitOpenError
+from tool_executor import AdaptiveToolExecutor, RecyclingProcessPool, ToolAdmissionError
+from http_clients import http_clients
+from rate_limiter import rate_limits
+
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, Query, Depends, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 import pydantic as _pyd
 
-# Try to import Redis for production caching
+# Try to import Redis for production caching (async client on a shared connection pool)
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_TIMEOUT = float(os.getenv("REDIS_TIMEOUT_MS", "100")) / 1000
 try:
     import redis
+    import redis.asyncio as aioredis
+    # Probe once at import time; request-time cache I/O never uses the sync client
+    _redis_probe = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=0, socket_connect_timeout=1)
+    _redis_probe.ping()
+    _redis_probe.close()
+    redis_pool = aioredis.ConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=0,
+        decode_responses=True,
+        max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+        socket_connect_timeout=1,
+        socket_timeout=1
+    )
+    redis_client = aioredis.Redis(connection_pool=redis_pool)
     _has_redis = True
-    redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True, socket_connect_timeout=1)
-    # Test connection
-    redis_client.ping()
 except Exception:
     _has_redis = False
+    redis_pool = None
     redis_client = None
     print("Redis not available - using in-memory cache")
 
@@ -49,19 +72,10 @@ except ImportError:
     _has_circuit_breaker = False
     print("Circuit breaker not available - install with: pip install circuitbreaker")
 
-# Create a simple async context manager for circuit breaker fallback
-class SimpleFallbackCircuitBreaker:
-    async def __aenter__(self):
-        return self
-    
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        return False  # Don't suppress exceptions
-    
-    def protection(self):
-        return self
-
-# Initialize circuit breaker fallback
-circuit_breaker = SimpleFallbackCircuitBreaker()
+# Endpoint-level circuit breakers (closed/open/half-open) for non-tool upstreams like Mevzuat.
+# Tool calls have their own per-tool breakers inside ToolExecutionIsolator.
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))
+circuit_breaker = CircuitBreakerRegistry(open_seconds=CIRCUIT_OPEN_SECONDS)
 
 # Import mevzuat modules for integration
 try:
@@ -101,83 +115,290 @@ logger = logging.getLogger("panel_backend")
 # OPUS ENTERPRISE PATTERNS - TOOL EXECUTION ISOLATION
 # ============================================================================
 
-class SimpleCache:
-    """Fallback in-memory cache when Redis not available"""
-    def __init__(self):
-        self._cache = {}
-        self._expiry = {}
-    
-    def get(self, key):
-        if key in self._expiry and time.time() > self._expiry[key]:
-            del self._cache[key]
-            del self._expiry[key]
-            return None
-        return self._cache.get(key)
-    
-    def setex(self, key, ttl, value):
-        self._cache[key] = value
-        self._expiry[key] = time.time() + ttl
+# Fallback in-memory cache when Redis not available (bounded LRU + TTL)
+memory_cache = BoundedTTLCache(
+    max_entries=int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "2000")),
+    max_bytes=int(float(os.getenv("MEMORY_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    sweep_interval=float(os.getenv("MEMORY_CACHE_SWEEP_SECONDS", "60"))
+)
 
-# Initialize cache
-cache_client = redis_client if _has_redis else SimpleCache()
+# Initialize cache: in-memory tier in front of async Redis (when available).
+# Also keeps the last good results per tool for fallback responses.
+cache_client = TieredCache(
+    memory_cache,
+    redis_client,
+    timeout=REDIS_TIMEOUT,
+    recent_capacity=int(os.getenv("RECENT_RESULTS_CAPACITY", "5"))
+)
+
+# Per-tool cache lifetimes in seconds: (soft_ttl, hard_ttl).
+# Fresh until soft_ttl; between soft and hard the entry is served as STALE while it
+# is refreshed in the background. Danıştay decisions change slower than Yargıtay.
+TOOL_CACHE_TTLS = {
+    "search_yargitay": (900, 3600),
+    "search_danistay": (3600, 6 * 3600),
+    "search_emsal": (1800, 2 * 3600),
+    "search_bedesten": (900, 3600),
+}
+DEFAULT_TOOL_CACHE_TTL = (1800, 3600)
+PARTIAL_RESULT_TTL = 60
+
+# Canonical cache keys (Turkish case folding, whitespace, request-model defaults dropped)
+# with per-query-shape hit-rate counters. Tools are registered after the request models.
+cache_keys = CacheKeyBuilder()
+
+# Cache outcome of the current request (HIT/STALE/MISS), reported as X-Cache-Status.
+# Holds a mutable dict so the endpoint task can update what the middleware created.
+_request_cache_status: ContextVar[Optional[Dict[str, str]]] = ContextVar("request_cache_status", default=None)
+
+def _set_cache_status(status: str):
+    holder = _request_cache_status.get()
+    if holder is not None:
+        holder["status"] = status
+
+def _env_flag(name: str, default: str = "1") -> bool:
+    return os.getenv(name, default).lower() not in ("0", "false", "no")
+
+def _parse_tool_limits(spec: str) -> Dict[str, int]:
+    """'search_bedesten=1,search_yargitay=2' -> per-tool concurrency limits"""
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, _, value = item.partition("=")
+            limits[name.strip()] = int(value)
+    return limits
 
 class ToolExecutionIsolator:
     """Opus Pattern: Isolates tool execution in separate processes to prevent crashes"""
 
-    def __init__(self, max_workers: int = 2, timeout: int = 15):
-        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+    def __init__(self, max_workers: int = 2, timeout: int = 15, warm_workers: Optional[bool] = None,
+                 min_workers: Optional[int] = None):
+        # Worker-initializer mode: each worker keeps one event loop + warm connector
+        if warm_workers is None:
+            warm_workers = _env_flag("TOOL_WORKER_WARM")
+        self.warm_workers = warm_workers
+        # Sized to the maximum; processes are only spawned as the admitted concurrency grows.
+        # Timed-out jobs get their worker reclaimed; TOOL_WORKER_MAX_TASKS recycles workers periodically
+        self.process_pool = RecyclingProcessPool(
+            max_workers=max_workers,
+            initializer=init_tool_worker if warm_workers else None,
+            max_tasks_per_child=int(os.getenv("TOOL_WORKER_MAX_TASKS", "200"))
+        )
         self.timeout = timeout
-        self.failure_count = {}
+        # Bounded admission queue, per-tool limits and adaptive sizing in front of the pool
+        self.pool = AdaptiveToolExecutor(
+            self.process_pool,
+            min_workers=min(min_workers or max_workers, max_workers),
+            max_workers=max_workers,
+            max_queue=int(os.getenv("TOOL_QUEUE_SIZE", "32")),
+            max_queue_wait=float(os.getenv("TOOL_QUEUE_WAIT_SECONDS", str(timeout))),
+            tool_limits=_parse_tool_limits(os.getenv("TOOL_CONCURRENCY_LIMITS", "")),
+            adaptive=_env_flag("TOOL_POOL_ADAPTIVE")
+        )
+        # I/O-bound tools that run asyncio-natively on the event loop (no process isolation)
+        self.native_tools = {t.strip() for t in os.getenv("TOOL_NATIVE_ASYNC", "").split(",") if t.strip()}
+        self._native_connector = None
         self.circuit_breaker_threshold = 3
-
-    async def execute_tool_safely(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        # Per-tool closed/open/half-open breakers with a rolling error-rate window
+        self.breakers = CircuitBreakerRegistry(
+            consecutive_failure_threshold=self.circuit_breaker_threshold,
+            open_seconds=CIRCUIT_OPEN_SECONDS
+        )
+        # Identical concurrent calls (same cache key) share one pool job
+        self.single_flight = SingleFlight()
+        self._refresh_tasks = set()
+
+    def __getstate__(self):
+        # Only worker-side settings cross the process boundary (executor is not picklable)
+        return {"timeout": self.timeout, "warm_workers": self.warm_workers}
+
+    def _run_connector(self, call):
+        """Run a RealLegalAPIConnector coroutine inside the worker process"""
+        if self.warm_workers:
+            return run_connector_call(call)
+        return run_connector_call_once(call)
+
+    @staticmethod
+    def _connector_kwargs(args: Dict[str, Any], *consumed: str) -> Dict[str, Any]:
+        """Remaining args for **kwargs, minus those already passed explicitly"""
+        return {k: v for k, v in args.items() if k not in consumed}
+
+    async def execute_tool_safely(self, tool_name: str, args: Dict[str, Any], scope: Optional[str] = None) -> Dict[str, Any]:
         """
-        Opus Pattern: Execute tool in isolated process with circuit breaker
+        Opus Pattern: Execute tool in isolated process with circuit breaker.
+        `scope` keeps the cache entries of endpoints that borrow another tool separate.
         """
         try:
-            # Check cache first
-            cache_key = f"tool:{tool_name}:{json.dumps(args, sort_keys=True)}"
-            
-            if _has_redis:
-                cached_result = cache_client.get(cache_key)
-            else:
-                cached_result = cache_client.get(cache_key)
-                
+            # Check cache first (stale-while-revalidate)
+            cache_key, query_shape = cache_keys.build(tool_name, args, scope)
+            cached_result, age = await cache_client.get_entry(cache_key)
+
             if cached_result:
-                logger.info(f"Cache hit for {tool_name}")
-                return json.loads(cached_result) if isinstance(cached_result, str) else cached_result
-
-            # Execute in isolated process
-            loop = asyncio.get_event_loop()
-            future = loop.run_in_executor(
-                self.executor,
-                self._execute_tool_process,
-                tool_name,
-                args
+                # Age from the entry's write time: partial results are stored with a shorter TTL
+                soft_ttl, _ = TOOL_CACHE_TTLS.get(tool_name, DEFAULT_TOOL_CACHE_TTL)
+                if age < soft_ttl:
+                    logger.info(f"Cache hit for {tool_name}")
+                    _set_cache_status("HIT")
+                    cache_keys.record(query_shape, "HIT")
+                else:
+                    logger.info(f"Stale cache hit for {tool_name} - refreshing in background")
+                    _set_cache_status("STALE")
+                    cache_keys.record(query_shape, "STALE")
+                    self._refresh_in_background(tool_name, args, cache_key)
+                return cached_result
+
+            _set_cache_status("MISS")
+            cache_keys.record(query_shape, "MISS")
+
+            # Open circuit: answer from the recent-results index without touching the pool
+            if self.breakers.get(tool_name).is_open():
+                raise CircuitOpenError(tool_name, self.breakers.get(tool_name).retry_after())
+
+            result = await self.single_flight.do(
+                cache_key,
+                lambda: self._run_tool(tool_name, args, cache_key),
+                group=tool_name
             )
+            return result
 
-            # Apply timeout
-            result = await asyncio.wait_for(future, timeout=self.timeout)
-
-            # Cache successful result
-            if _has_redis:
-                cache_client.setex(cache_key, 1800, json.dumps(result))  # 30 min cache
-            else:
-                cache_client.setex(cache_key, 1800, result)
+        except CircuitOpenError as e:
+            logger.warning(f"Tool {tool_name} short-circuited: {e}")
+            return await self._get_fallback_response(tool_name, "circuit_open")
 
-            # Reset failure count on success
-            self.failure_count[tool_name] = 0
-            return result
+        except ToolAdmissionError:
+            # Overloaded: reject fast (429/503) instead of queueing behind the pool
+            raise
 
-        except TimeoutError:
+        except asyncio.TimeoutError:
             logger.error(f"Tool {tool_name} timed out after {self.timeout} seconds")
-            self._increment_failure(tool_name)
-            return self._get_fallback_response(tool_name, "timeout")
+            return await self._get_fallback_response(tool_name, "timeout")
 
         except Exception as e:
             logger.error(f"Tool {tool_name} failed: {str(e)}")
-            self._increment_failure(tool_name)
-            return self._get_fallback_response(tool_name, str(e))
+            return await self._get_fallback_response(tool_name, str(e))
+
+    def _refresh_in_background(self, tool_name: str, args: Dict[str, Any], cache_key: str):
+        """Revalidate a stale entry without blocking the caller (deduplicated by single-flight)"""
+        async def _refresh():
+            try:
+                await self.single_flight.do(
+                    cache_key,
+                    lambda: self._run_tool(tool_name, args, cache_key),
+                    group=tool_name
+                )
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {tool_name}: {e}")
+
+        task = asyncio.ensure_future(_refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _run_tool(self, tool_name: str, args: Dict[str, Any], cache_key: str) -> Dict[str, Any]:
+        """Run one tool call in the process pool and cache it (shared by coalesced callers)"""
+        breaker = self.breakers.get(tool_name)
+        if not breaker.allow():
+            # Open, or half-open with all probe slots taken
+            raise CircuitOpenError(tool_name, breaker.retry_after())
+
+        try:
+            if tool_name in self.native_tools:
+                result = await self.pool.run_native(
+                    tool_name,
+                    lambda: self._execute_tool_native(tool_name, args),
+                    timeout=self.timeout
+                )
+            else:
+                # Execute in isolated process (timeout applies once admitted)
+                result = await self.pool.run_in_pool(
+                    tool_name,
+                    self._execute_tool_process,
+                    tool_name,
+                    args,
+                    timeout=self.timeout
+                )
+        except (asyncio.CancelledError, ToolAdmissionError):
+            breaker.release()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        # Fallback/mock/connector-error payloads mean the upstream failed even though the call returned
+        good = self._is_good_result(result)
+        if good:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+        # Failed/mock payloads are never cached: the next request must go back through
+        # the breaker instead of being served the fallback as a 200 HIT for hours.
+        if not good:
+            return result
+
+        # Cache result until its hard TTL and remember it as a last good result.
+        # Partial federated results are kept briefly so they get revalidated soon.
+        _, hard_ttl = TOOL_CACHE_TTLS.get(tool_name, DEFAULT_TOOL_CACHE_TTL)
+        data = result.get("data")
+        if isinstance(data, dict) and data.get("partial"):
+            hard_ttl = min(hard_ttl, PARTIAL_RESULT_TTL)
+        await cache_client.setex(cache_key, hard_ttl, result, recent_tool=tool_name)
+        return result
+
+    def _connector_call(self, tool_name: str, args: Dict[str, Any]):
+        """RealLegalAPIConnector coroutine factory for a tool, or None if unknown"""
+        if tool_name == "search_yargitay":
+            return lambda connector: connector.search_yargitay_real(
+                keyword=args.get("keyword", ""),
+                page_size=args.get("page_size", 10),
+                **self._connector_kwargs(args, "keyword", "page_size")
+            )
+        if tool_name == "search_danistay":
+            return lambda connector: connector.search_danistay_real(
+                keyword=args.get("keyword", ""),
+                page_size=args.get("page_size", 10),
+                **self._connector_kwargs(args, "keyword", "page_size")
+            )
+        if tool_name == "search_emsal":
+            return lambda connector: connector.search_uyap_emsal_real(
+                keyword=args.get("keyword", ""),
+                page_size=args.get("results_per_page", 10),
+                **self._connector_kwargs(args, "keyword", "results_per_page")
+            )
+        if tool_name == "search_bedesten":
+            return lambda connector: connector.search_bedesten_unified_real(
+                phrase=args.get("phrase", ""),
+                page_size=args.get("pageSize", 20),
+                **self._connector_kwargs(args, "phrase", "pageSize")
+            )
+        return None
+
+    def native_connector(self):
+        """In-process connector shared by native-mode tools and streaming endpoints"""
+        if self._native_connector is None:
+            from real_api_connector import RealLegalAPIConnector
+            self._native_connector = RealLegalAPIConnector()
+        return self._native_connector
+
+    async def _execute_tool_native(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """asyncio-native execution on the main event loop for I/O-bound tools"""
+        call = self._connector_call(tool_name, args)
+        if call is None:
+            return {"success": False, "error": f"Unknown tool: {tool_name}"}
+        try:
+            return {"success": True, "data": await call(self.native_connector())}
+        except Exception as e:
+            logger.error(f"Native {tool_name} error: {str(e)}")
+            if tool_name == "search_yargitay":
+                return await asyncio.to_thread(self._fallback_yargitay_search, args)
+            if tool_name == "search_danistay":
+                return await asyncio.to_thread(self._fallback_danistay_search, args)
+            return {"success": False, "error": str(e)}
+
+    async def shutdown(self):
+        """Stop the process pool and close the native-mode connector session"""
+        self.process_pool.shutdown(wait=True)
+        if self._native_connector is not None:
+            await self._native_connector.close_session()
 
     def _execute_tool_process(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -203,29 +424,9 @@ class ToolExecutionIsolator:
     def _real_yargitay_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Real Yargıtay API connection - NOW USING REAL API CONNECTOR"""
         try:
-            # Import real API connector
-            import sys
-            import os
-            sys.path.append(os.path.dirname(__file__))
-            from real_api_connector import real_api_connector
-            
-            # Use real API connector
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(
-                    real_api_connector.search_yargitay_real(
-                        keyword=args.get("keyword", ""),
-                        page_size=args.get("page_size", 10),
-                        **args
-                    )
-                )
-                return {"success": True, "data": result}
-            finally:
-                loop.close()
-                
+            result = self._run_connector(self._connector_call("search_yargitay", args))
+            return {"success": True, "data": result}
+
         except Exception as e:
             logger.error(f"Real Yargıtay API error: {str(e)}")
             # Fallback to enhanced mock
@@ -234,27 +435,9 @@ class ToolExecutionIsolator:
     def _real_danistay_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Real Danıştay API connection - NOW USING REAL API CONNECTOR"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(__file__))
-            from real_api_connector import real_api_connector
-            
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(
-                    real_api_connector.search_danistay_real(
-                        keyword=args.get("keyword", ""),
-                        page_size=args.get("page_size", 10),
-                        **args
-                    )
-                )
-                return {"success": True, "data": result}
-            finally:
-                loop.close()
-                
+            result = self._run_connector(self._connector_call("search_danistay", args))
+            return {"success": True, "data": result}
+
         except Exception as e:
             logger.error(f"Real Danıştay API error: {str(e)}")
             return self._fallback_danistay_search(args)
@@ -262,27 +445,9 @@ class ToolExecutionIsolator:
     def _real_emsal_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Real UYAP Emsal API connection - NOW USING REAL API CONNECTOR"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(__file__))
-            from real_api_connector import real_api_connector
-            
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(
-                    real_api_connector.search_uyap_emsal_real(
-                        keyword=args.get("keyword", ""),
-                        page_size=args.get("results_per_page", 10),
-                        **args
-                    )
-                )
-                return {"success": True, "data": result}
-            finally:
-                loop.close()
-                
+            result = self._run_connector(self._connector_call("search_emsal", args))
+            return {"success": True, "data": result}
+
         except Exception as e:
             logger.error(f"Real UYAP Emsal API error: {str(e)}")
             return {"success": False, "error": str(e)}
@@ -290,27 +455,9 @@ class ToolExecutionIsolator:
     def _real_bedesten_search(self, args: Dict[str, Any]) -> Dict[str, Any]:
         """Real Bedesten Unified API connection - NOW USING REAL API CONNECTOR"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(__file__))
-            from real_api_connector import real_api_connector
-            
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(
-                    real_api_connector.search_bedesten_unified_real(
-                        phrase=args.get("phrase", ""),
-                        page_size=args.get("pageSize", 20),
-                        **args
-                    )
-                )
-                return {"success": True, "data": result}
-            finally:
-                loop.close()
-                
+            result = self._run_connector(self._connector_call("search_bedesten", args))
+            return {"success": True, "data": result}
+
         except Exception as e:
             logger.error(f"Real Bedesten API error: {str(e)}")
             return {"success": False, "error": str(e)}
@@ -397,25 +544,20 @@ class ToolExecutionIsolator:
             }
         }
 
-    def _increment_failure(self, tool_name: str):
-        """Opus Pattern: Track failures for circuit breaker"""
-        if tool_name not in self.failure_count:
-            self.failure_count[tool_name] = 0
-        self.failure_count[tool_name] += 1
-
-    def _get_fallback_response(self, tool_name: str, error: str) -> Dict[str, Any]:
+    async def _get_fallback_response(self, tool_name: str, error: str) -> Dict[str, Any]:
         """Opus Pattern: Graceful degradation with fallback responses"""
+        cached_results = await cache_client.recent_results(tool_name, accept=self._is_good_result)
         fallback_data = {
             "search_yargitay": {
                 "message": "Yargıtay araması şu anda kullanılamıyor. Önbellek sonuçları gösteriliyor.",
-                "cached_results": self._get_cached_results(tool_name),
+                "cached_results": cached_results,
                 "alternative_tools": ["search_bedesten"],
                 "error_details": error,
                 "fallback_active": True
             },
             "search_danistay": {
                 "message": "Danıştay araması geçici olarak devre dışı. Önbellek kullanılıyor.",
-                "cached_results": self._get_cached_results(tool_name),
+                "cached_results": cached_results,
                 "alternative_tools": ["search_bedesten"],
                 "error_details": error,
                 "fallback_active": True
@@ -432,22 +574,19 @@ class ToolExecutionIsolator:
             })
         }
 
-    def _get_cached_results(self, tool_name: str) -> list:
-        """Opus Pattern: Get last successful results from cache"""
-        try:
-            if _has_redis:
-                pattern = f"tool:{tool_name}:*"
-                cached_keys = redis_client.keys(pattern)
-                results = []
-                for key in cached_keys[:3]:  # Return last 3 cached results
-                    cached = redis_client.get(key)
-                    if cached:
-                        results.append(json.loads(cached))
-                return results
-            else:
-                return []  # Fallback cache doesn't support pattern search
-        except Exception:
-            return []
+    @staticmethod
+    def _is_good_result(result: Dict[str, Any]) -> bool:
+        """
+        Real upstream success. The _real_* wrappers report success=True around whatever
+        the connector returned, so the connector's own failure markers (success=False,
+        fallback) and our mock fallbacks (fallback_active) count as failures too.
+        """
+        if not isinstance(result, dict) or not result.get("success") or result.get("fallback"):
+            return False
+        data = result.get("data")
+        if isinstance(data, dict):
+            return data.get("success") is not False and not data.get("fallback") and not data.get("fallback_active")
+        return True
 
 # ============================================================================
 # PRODUCTION HEALTH MONITORING
@@ -488,11 +627,20 @@ class ProductionHealthMonitor:
             },
             "cache_status": {
                 "redis_available": _has_redis,
-                "cache_type": "Redis" if _has_redis else "In-Memory"
+                "cache_type": "Redis" if _has_redis else "In-Memory",
+                "tiers": cache_client.stats(),
+                "query_shapes": cache_keys.stats()
             },
             "tools_status": {
                 "circuit_breaker_available": _has_circuit_breaker,
+                "circuit_breakers": {
+                    "tools": tool_isolator.breakers.snapshot(),
+                    "endpoints": circuit_breaker.snapshot()
+                },
                 "process_isolation": True,
+                "executor": tool_isolator.pool.stats(),
+                "native_async_tools": sorted(tool_isolator.native_tools),
+                "request_coalescing": tool_isolator.single_flight.stats(),
                 "auto_recovery": True
             }
         }
@@ -543,6 +691,7 @@ class BedestenSearchRequest(CompatBaseModel):
     phrase: str = Field(..., alias="arananIfade", description="Aranacak ifade")
     pageSize: int = Field(default=20, ge=1, le=100, description="Sayfa başına sonuç sayısı")
     source: Optional[str] = Field(default=None, description="Kaynak veritabanı")
+    cursor: Optional[str] = Field(default=None, description="Sonraki sayfa için devam belirteci (next_cursor)")
 
 class IstinafSearchRequest(CompatBaseModel):
     keyword: str = Field(..., alias="arananKelime", description="Aranacak kelime veya ifade")
@@ -577,8 +726,29 @@ class SayistaySearchRequest(CompatBaseModel):
     court_level: Optional[str] = Field(default=None, alias="courtLevel", description="Mahkeme seviyesi")
     legal_area: Optional[str] = Field(default=None, alias="legalArea", description="Hukuk alanı")
 
+# Register request-model defaults so explicitly-sent defaults don't split cache keys
+def _model_defaults(model) -> Dict[str, Any]:
+    fields = getattr(model, "model_fields", None) or model.__fields__
+    return {
+        name: field.default for name, field in fields.items()
+        if not (field.is_required() if hasattr(field, "is_required") else field.required)
+    }
+
+for _tool_name, _request_model in (
+    ("search_yargitay", YargitaySearchRequest),
+    ("search_danistay", DanistaySearchRequest),
+    ("search_emsal", EmSalSearchRequest),
+    ("search_bedesten", BedestenSearchRequest),
+    ("search_aym", AYMSearchRequest),
+    ("search_sayistay", SayistaySearchRequest),
+):
+    cache_keys.register(_tool_name, _model_defaults(_request_model))
+
 # Global components
-tool_isolator = ToolExecutionIsolator()
+tool_isolator = ToolExecutionIsolator(
+    max_workers=int(os.getenv("TOOL_POOL_MAX_WORKERS", "4")),
+    min_workers=int(os.getenv("TOOL_POOL_MIN_WORKERS", "2"))
+)
 health_monitor = ProductionHealthMonitor()
 
 # Initialize mevzuat client if available
@@ -599,13 +769,13 @@ async def lifespan(app: FastAPI):
     logger.info("Architecture: Opus Enterprise Patterns ACTIVE")
     logger.info("Features: Circuit Breaker + Tool Isolation + Auto-Recovery")
     logger.info(f"Cache: {'Redis' if _has_redis else 'In-Memory'}")
-    logger.info(f"Circuit Breaker: {'Available' if _has_circuit_breaker else 'Fallback'}")
+    logger.info(f"Circuit Breaker: per-tool closed/open/half-open (open for {CIRCUIT_OPEN_SECONDS:.0f}s)")
     
     try:
         # Test cache connection
         if _has_redis:
-            redis_client.set("startup_test", "ok", ex=5)
-            logger.info("Redis cache connected")
+            await redis_client.set("startup_test", "ok", ex=5)
+            logger.info(f"Redis cache connected (async pool, {REDIS_TIMEOUT * 1000:.0f}ms budget)")
         logger.info("All enterprise components initialized")
         logger.info("Panel İçtihat & Mevzuat Backend ready for PRODUCTION")
     except Exception as e:
@@ -616,7 +786,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Panel Backend...")
-    tool_isolator.executor.shutdown(wait=True)
+    await tool_isolator.shutdown()
+    await http_clients.aclose()
+    memory_cache.stop()
+    if redis_pool is not None:
+        await redis_pool.disconnect()
     logger.info("Shutdown completed successfully")
 
 # ============================================================================
@@ -728,6 +902,8 @@ async def track_requests(request: Request, call_next):
     start_time = time.time()
     request_id = str(uuid.uuid4())[:8]
     health_monitor.request_count += 1
+    cache_status = {"status": "BYPASS"}
+    _request_cache_status.set(cache_status)
     
     logger.info(f"Request {request_id}: {request.method} {request.url.path}")
     
@@ -738,7 +914,7 @@ async def track_requests(request: Request, call_next):
         response.headers["X-Process-Time"] = f"{process_time:.2f}ms"
         response.headers["X-Request-ID"] = request_id
         response.headers["X-API-Version"] = "2.0.0-production"
-        response.headers["X-Cache-Status"] = "Redis" if _has_redis else "Memory"
+        response.headers["X-Cache-Status"] = cache_status["status"]
         logger.info(f"Request {request_id} completed in {process_time:.2f}ms")
         return response
     except Exception as e:
@@ -755,6 +931,37 @@ async def track_requests(request: Request, call_next):
             }
         )
 
+# Opus Pattern: Admission control rejects fast when the tool queue is full
+@app.exception_handler(ToolAdmissionError)
+async def tool_admission_handler(request: Request, exc: ToolAdmissionError):
+    return JSONResponse(
+        status_code=exc.status_code,
+        headers={"Retry-After": str(max(1, int(exc.retry_after)))},
+        content={
+            "success": False,
+            "message": "Sistem şu anda yoğun - lütfen kısa süre sonra tekrar deneyin",
+            "error_code": "TOOL_QUEUE_FULL" if exc.status_code == 503 else "TOOL_RATE_LIMITED",
+            "tool": exc.tool_name,
+            "reason": exc.reason,
+            "retry_after_seconds": round(exc.retry_after, 1)
+        }
+    )
+
+# Opus Pattern: Open circuits answer immediately instead of waiting on a dead upstream
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(max(1, int(exc.retry_after)))},
+        content={
+            "success": False,
+            "message": "Servis geçici olarak devre dışı - lütfen biraz sonra tekrar deneyin",
+            "error_code": "CIRCUIT_OPEN",
+            "circuit": exc.name,
+            "retry_after_seconds": round(exc.retry_after, 1)
+        }
+    )
+
 # ============================================================================
 # PRODUCTION API ENDPOINTS WITH OPUS PATTERNS
 # ============================================================================
@@ -768,7 +975,7 @@ async def search_yargitay_production(request: YargitaySearchRequest):
     • Circuit breaker protection
     • Process isolation 
     • Auto-recovery on failures
-    • Redis caching (30min TTL)
+    • Redis caching (stale-while-revalidate, X-Cache-Status: HIT/STALE/MISS)
     • Graceful fallback responses
     """
     try:
@@ -789,6 +996,9 @@ async def search_yargitay_production(request: YargitaySearchRequest):
                 }
             )
 
+    except ToolAdmissionError:
+        raise  # 429/503 via tool_admission_handler
+
     except Exception as e:
         logger.error(f"Yargıtay search critical error: {traceback.format_exc()}")
         
@@ -826,6 +1036,9 @@ async def search_danistay_production(request: DanistaySearchRequest):
                 }
             )
 
+    except ToolAdmissionError:
+        raise  # 429/503 via tool_admission_handler
+
     except Exception as e:
         logger.error(f"Danıştay search error: {str(e)}")
         return JSONResponse(
@@ -864,6 +1077,9 @@ async def search_emsal_production(request: EmSalSearchRequest):
                 }
             )
 
+    except ToolAdmissionError:
+        raise  # 429/503 via tool_admission_handler
+
     except Exception as e:
         logger.error(f"UYAP Emsal search error: {str(e)}")
         return JSONResponse(
@@ -885,6 +1101,8 @@ async def search_bedesten_production(request: BedestenSearchRequest):
             request.dict()
         )
 
+        if result.get("success") and result["data"].get("error_code") == "INVALID_CURSOR":
+            raise HTTPException(status_code=400, detail=result["data"]["error"])
         if result.get("success"):
             return JSONResponse(content=result["data"])
         else:
@@ -896,6 +1114,9 @@ async def search_bedesten_production(request: BedestenSearchRequest):
                 }
             )
 
+    except (ToolAdmissionError, HTTPException):
+        raise  # 429/503 via tool_admission_handler, 400 for a bad cursor
+
     except Exception as e:
         logger.error(f"Bedesten search error: {str(e)}")
         return JSONResponse(
@@ -906,6 +1127,63 @@ async def search_bedesten_production(request: BedestenSearchRequest):
             }
         )
 
+@app.post("/api/bedesten/search/stream", tags=["Bedesten Unified"])
+async def stream_bedesten_production(request: BedestenSearchRequest, http_request: Request,
+                                     format: str = Query("ndjson", description="ndjson veya sse")):
+    """
+    🏛️ Streaming Bedesten Unified search
+
+    Emits each source's hits as soon as they arrive (one `source` event per
+    court), followed by a `done` event listing partial/missing sources.
+    NDJSON by default; Server-Sent Events with `?format=sse` or
+    `Accept: text/event-stream`.
+    """
+    breaker = tool_isolator.breakers.get("search_bedesten")
+    if not breaker.allow():
+        raise CircuitOpenError("search_bedesten", breaker.retry_after())
+
+    connector = tool_isolator.native_connector()
+    use_sse = format == "sse" or "text/event-stream" in http_request.headers.get("accept", "")
+
+    def encode(event: Dict[str, Any]) -> str:
+        payload = json.dumps(event, ensure_ascii=False)
+        return f"event: {event['event']}\ndata: {payload}\n\n" if use_sse else payload + "\n"
+
+    async def events():
+        # True/False: upstream answered/failed; None (rejected, client gone) frees the probe slot
+        healthy = None
+        try:
+            # Same admission as execute_tool_safely's native calls; the slot is held for the whole stream
+            async with tool_isolator.pool.native_slot("search_bedesten"):
+                yield None  # admitted
+                try:
+                    async for event in connector.stream_bedesten_unified_real(request.phrase, request.pageSize):
+                        if event["event"] == "done":
+                            # Partial answers are good results (as in _is_good_result); no source at all is not
+                            healthy = len(event["missing_sources"]) < len(event["sources"])
+                        yield encode(event)
+                except Exception as e:
+                    healthy = False
+                    logger.error(f"Bedesten stream error: {str(e)}")
+                    yield encode({"event": "error", "message": "Bedesten araması geçici olarak kullanılamıyor"})
+        finally:
+            if healthy is True:
+                breaker.record_success()
+            elif healthy is False:
+                breaker.record_failure()
+            else:
+                breaker.release()
+
+    stream = events()
+    # Wait for admission before answering, so a full queue is a 429/503 rather than a broken 200 stream
+    await stream.__anext__()
+
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/istinaf/search", tags=["İstinaf Mahkemeleri"])
 async def search_istinaf_production(request: IstinafSearchRequest):
     """
@@ -922,16 +1200,19 @@ async def search_istinaf_production(request: IstinafSearchRequest):
         
         result = await tool_isolator.execute_tool_safely(
             "search_yargitay",  # Using Yargıtay backend temporarily
-            modified_request
+            modified_request,
+            scope="istinaf"
         )
 
         if result.get("success"):
             # Modify response to indicate İstinaf source
             response_data = result["data"]
             if "results" in response_data:
-                for item in response_data["results"]:
-                    item["court"] = "İstinaf Mahkemesi"
-                    item["api_source"] = "ISTINAF_VIA_YARGITAY"
+                # Relabel copies, never the tool result itself
+                response_data = {**response_data, "results": [
+                    {**item, "court": "İstinaf Mahkemesi", "api_source": "ISTINAF_VIA_YARGITAY"}
+                    for item in response_data["results"]
+                ]}
             
             return JSONResponse(content=response_data)
         else:
@@ -943,6 +1224,9 @@ async def search_istinaf_production(request: IstinafSearchRequest):
                 }
             )
 
+    except ToolAdmissionError:
+        raise  # 429/503 via tool_admission_handler
+
     except Exception as e:
         logger.error(f"İstinaf search error: {str(e)}")
         return JSONResponse(
@@ -969,16 +1253,19 @@ async def search_hukuk_production(request: HukukSearchRequest):
         
         result = await tool_isolator.execute_tool_safely(
             "search_bedesten",  # Using Bedesten backend temporarily
-            modified_request
+            modified_request,
+            scope="hukuk"
         )
 
         if result.get("success"):
             # Modify response to indicate Hukuk source
             response_data = result["data"]
             if "results" in response_data:
-                for item in response_data["results"]:
-                    item["court"] = "Hukuk Mahkemesi"
-                    item["api_source"] = "HUKUK_VIA_BEDESTEN"
+                # Relabel copies, never the tool result itself
+                response_data = {**response_data, "results": [
+                    {**item, "court": "Hukuk Mahkemesi", "api_source": "HUKUK_VIA_BEDESTEN"}
+                    for item in response_data["results"]
+                ]}
             
             return JSONResponse(content=response_data)
         else:
@@ -990,6 +1277,9 @@ async def search_hukuk_production(request: HukukSearchRequest):
                 }
             )
 
+    except ToolAdmissionError:
+        raise  # 429/503 via tool_admission_handler
+
     except Exception as e:
         logger.error(f"Hukuk search error: {str(e)}")
         return JSONResponse(
@@ -1006,99 +1296,107 @@ async def search_aym_production(request: AYMSearchRequest):
     """
     🏛️ Anayasa Mahkemesi search with Opus enterprise patterns
     """
-    async with circuit_breaker.protection():
-        try:
-            # AYM search using specialized format
-            modified_request = {
-                "arananKelime": request.keyword,
-                "pageSize": request.page_size,
-                "decision_type": request.decision_type,
-                "application_type": request.application_type,
-                "date_from": request.date_from,
-                "date_to": request.date_to
-            }
-            
-            result = await tool_isolator.execute_tool_safely(
-                "search_aym",
-                modified_request
-            )
-
-            if result.get("success"):
-                response_data = result["data"]
-                if "results" in response_data:
-                    for item in response_data["results"]:
-                        item["court"] = "Anayasa Mahkemesi"
-                        item["api_source"] = "AYM_DIRECT"
-                
-                return JSONResponse(content=response_data)
-            else:
-                return JSONResponse(
-                    status_code=206,
-                    content={
-                        **result,
-                        "message": "AYM araması kısmi sonuç - önbellek kullanıldı"
-                    }
-                )
+    try:
+        # AYM search using specialized format
+        modified_request = {
+            "arananKelime": request.keyword,
+            "pageSize": request.page_size,
+            "decision_type": request.decision_type,
+            "application_type": request.application_type,
+            "date_from": request.date_from,
+            "date_to": request.date_to
+        }
+        
+        result = await tool_isolator.execute_tool_safely(
+            "search_aym",
+            modified_request
+        )
 
-        except Exception as e:
-            logger.error(f"AYM search error: {str(e)}")
+        if result.get("success"):
+            response_data = result["data"]
+            if "results" in response_data:
+                # Relabel copies, never the tool result itself
+                response_data = {**response_data, "results": [
+                    {**item, "court": "Anayasa Mahkemesi", "api_source": "AYM_DIRECT"}
+                    for item in response_data["results"]
+                ]}
+            
+            return JSONResponse(content=response_data)
+        else:
             return JSONResponse(
-                status_code=503,
+                status_code=206,
                 content={
-                    "message": "Anayasa Mahkemesi araması geçici olarak kullanılamıyor",
-                    "alternative": "Genel arama kullanabilirsiniz"
+                    **result,
+                    "message": "AYM araması kısmi sonuç - önbellek kullanıldı"
                 }
             )
 
+    except ToolAdmissionError:
+        raise  # 429/503 via tool_admission_handler
+
+    except Exception as e:
+        logger.error(f"AYM search error: {str(e)}")
+        return JSONResponse(
+            status_code=503,
+            content={
+                "message": "Anayasa Mahkemesi araması geçici olarak kullanılamıyor",
+                "alternative": "Genel arama kullanabilirsiniz"
+            }
+        )
+
 # === SAYIŞTAY API === #
 @app.post("/api/sayistay/search", tags=["Sayıştay"])
 async def search_sayistay_production(request: SayistaySearchRequest):
     """
     🏛️ Sayıştay search with Opus enterprise patterns
     """
-    async with circuit_breaker.protection():
-        try:
-            # Sayıştay search using specialized format
-            modified_request = {
-                "arananKelime": request.keyword,
-                "pageSize": request.page_size,
-                "audit_type": request.audit_type,
-                "institution": request.institution,
-                "year": request.year
-            }
-            
-            result = await tool_isolator.execute_tool_safely(
-                "search_sayistay",
-                modified_request
-            )
-
-            if result.get("success"):
-                response_data = result["data"]
-                if "results" in response_data:
-                    for item in response_data["results"]:
-                        item["court"] = "Sayıştay"
-                        item["api_source"] = "SAYISTAY_DIRECT"
-                
-                return JSONResponse(content=response_data)
-            else:
-                return JSONResponse(
-                    status_code=206,
-                    content={
-                        **result,
-                        "message": "Sayıştay araması kısmi sonuç - önbellek kullanıldı"
-                    }
-                )
+    try:
+        # Sayıştay search using specialized format
+        modified_request = {
+            "arananKelime": request.keyword,
+            "pageSize": request.page_size,
+            "audit_type": request.audit_type,
+            "institution": request.institution,
+            "year": request.year
+        }
+        
+        result = await tool_isolator.execute_tool_safely(
+            "search_sayistay",
+            modified_request
+        )
 
-        except Exception as e:
-            logger.error(f"Sayıştay search error: {str(e)}")
+        if result.get("success"):
+            response_data = result["data"]
+            if "results" in response_data:
+                # Relabel copies, never the tool result itself
+                response_data = {**response_data, "results": [
+                    {**item, "court": "Sayıştay", "api_source": "SAYISTAY_DIRECT"}
+                    for item in response_data["results"]
+                ]}
+            
+            return JSONResponse(content=response_data)
+        else:
             return JSONResponse(
-                status_code=503,
+                status_code=206,
                 content={
-                    "message": "Sayıştay araması geçici olarak kullanılamıyor",
-                    "alternative": "Genel arama kullanabilirsiniz"
+                    **result,
+                    "message": "Sayıştay araması kısmi sonuç - önbellek kullanıldı"
                 }
             )
 
+    except ToolAdmissionError:
+        raise  # 429/503 via tool_admission_handler
+
+    except Exception as e:
+        logger.error(f"Sayıştay search error: {str(e)}")
+        return JSONResponse(
+            status_code=503,
+            content={
+                "message": "Sayıştay araması geçici olarak kullanılamıyor",
+                "alternative": "Genel arama kullanabilirsiniz"
+            }
+        )
+
 # ============================================
 # MEVZUAT API ENDPOINTS (LEGISLATION SEARCH)
 # ============================================
@@ -1109,7 +1407,7 @@ if MEVZUAT_AVAILABLE:
         """
         🏛️ Mevzuat (legislation) search with Opus enterprise patterns
         """
-        async with circuit_breaker.protection():
+        async with circuit_breaker.protection("mevzuat") as guard:
             try:
                 # Pass the MevzuatSearchRequest object directly to the client
                 search_response = await mevzuat_client.search_documents(request)
@@ -1128,6 +1426,7 @@ if MEVZUAT_AVAILABLE:
                     }
                 )
             except Exception as e:
+                guard.mark_failure()
                 logger.error(f"Mevzuat search error: {str(e)}")
                 return JSONResponse(
                     status_code=503,
@@ -1144,7 +1443,7 @@ if MEVZUAT_AVAILABLE:
         🗂️ Collect legislation documents within specific year range
         Collects mevzuat published between start_year and end_year
         """
-        async with circuit_breaker.protection():
+        async with circuit_breaker.protection("mevzuat") as guard:
             try:
                 logger.info(f"Starting mevzuat collection from {request.start_year} to {request.end_year}")
                 
@@ -1167,6 +1466,7 @@ if MEVZUAT_AVAILABLE:
                     }
                 )
             except Exception as e:
+                guard.mark_failure()
                 logger.error(f"Mevzuat collection error: {str(e)}")
                 return JSONResponse(
                     status_code=503,
@@ -1180,7 +1480,7 @@ if MEVZUAT_AVAILABLE:
     @app.get("/api/mevzuat/article/{document_id}", tags=["Mevzuat"])
     async def get_mevzuat_article_tree_production(document_id: str):
         """Get article tree for a mevzuat document"""
-        async with circuit_breaker.protection():
+        async with circuit_breaker.protection("mevzuat") as guard:
             try:
                 article_tree = await mevzuat_client.get_article_tree(document_id)
                 
@@ -1198,6 +1498,7 @@ if MEVZUAT_AVAILABLE:
                     }
                 )
             except Exception as e:
+                guard.mark_failure()
                 logger.error(f"Mevzuat article tree error: {str(e)}")
                 return JSONResponse(
                     status_code=503,
@@ -1211,7 +1512,7 @@ if MEVZUAT_AVAILABLE:
     @app.get("/api/mevzuat/content/{document_id}/{article_id}", tags=["Mevzuat"])
     async def get_mevzuat_article_content_production(document_id: str, article_id: str):
         """Get specific article content from a mevzuat document"""
-        async with circuit_breaker.protection():
+        async with circuit_breaker.protection("mevzuat") as guard:
             try:
                 article_content = await mevzuat_client.get_article_content(document_id, article_id)
                 
@@ -1230,6 +1531,7 @@ if MEVZUAT_AVAILABLE:
                     }
                 )
             except Exception as e:
+                guard.mark_failure()
                 logger.error(f"Mevzuat article content error: {str(e)}")
                 return JSONResponse(
                     status_code=503,
@@ -1323,6 +1625,16 @@ async def stats_production():
         },
         "production_status": {
             "cache_system": cache_info,
+            "cache_tiers": cache_client.stats(),
+            "cache_keys": cache_keys.stats(),
+            "tool_executor": tool_isolator.pool.stats(),
+            "request_coalescing": tool_isolator.single_flight.stats(),
+            "upstream_http": http_clients.stats(),
+            "rate_limits": rate_limits.stats(),
+            "circuit_breakers": {
+                "tools": tool_isolator.breakers.snapshot(),
+                "endpoints": circuit_breaker.snapshot()
+            },
             "uptime_seconds": time.time() - health_monitor.start_time,
             "total_requests": health_monitor.request_count,
             "error_rate": health_monitor.error_count / max(health_monitor.request_count, 1)
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Per-host token-bucket rate limiting for every upstream court/legislation site.
+
+One bucket per host is shared by the FastAPI proxies, MevzuatApiClient,
+RealLegalAPIConnector (all via the http_clients event hooks) and the sync
+requests-based scrapers:
+- `rate` requests/second on average with a `burst` allowance
+- FIFO fairness: callers reserve their slot under a lock, so async and
+  threaded callers are served in arrival order instead of racing on sleeps
+- 429/503 feedback: Retry-After pauses the host and halves its rate; the rate
+  then recovers additively on successful responses (AIMD)
+
+Rates come from HOST_RATES and can be overridden with
+RATE_LIMITS="host=rate/burst,...".
+
+The budget is per host, not per process: with Redis reachable (REDIS_HOST /
+REDIS_PORT, RATE_LIMIT_BACKEND=redis, the default) every process - uvicorn,
+the forked tool-pool workers, the Selenium scrapers - reserves slots from one
+shared GCRA state per host, and a 429 pause is shared too. Without Redis (or
+while it is unreachable) each process falls back to its own local bucket, so
+the effective rate is then `rate x processes`; size RATE_LIMITS for that case.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# host -> (requests per second, burst)
+DEFAULT_HOST_RATE = (2.0, 4)
+HOST_RATES = {
+    "karararama.yargitay.gov.tr": (1 / 3, 3),  # Scrapers used a fixed 3s delay
+    "emsal.uyap.gov.tr": (0.5, 3),             # Scrapers used a fixed 2s delay
+    "bedesten.adalet.gov.tr": (5.0, 10),
+    "www.mevzuat.gov.tr": (1.0, 3),
+    "mevzuat.gov.tr": (1.0, 3),
+}
+
+
+class RateLimitedError(Exception):
+    """Raised when a host's queue is longer than the caller is willing to wait"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Rate limit for {host} (retry after {retry_after:.1f}s)")
+        self.host = host
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as delta-seconds or HTTP-date -> seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# GCRA over a shared "theoretical arrival time" per host. Floats are returned as
+# strings because Lua numbers are truncated to integers in replies.
+_RESERVE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_wait = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then tat = now end
+local new_tat = tat + interval
+local wait = new_tat - burst * interval - now
+if wait < 0 then wait = 0 end
+if max_wait >= 0 and wait > max_wait then return {0, tostring(wait)} end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1000)
+return {1, tostring(wait)}
+"""
+
+_PAUSE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local target = now + tonumber(ARGV[3]) + (burst - 1) * interval
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < target then
+    redis.call('SET', KEYS[1], tostring(target), 'PX', math.ceil((target - now) * 1000) + 1000)
+end
+return 1
+"""
+
+
+class SharedBucketStore:
+    """Redis-backed per-host slot state shared by every process using the same hosts"""
+
+    def __init__(self, host: str, port: int, timeout: float = 0.1, degrade_seconds: float = 30.0,
+                 prefix: str = "ratelimit:"):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.degrade_seconds = degrade_seconds
+        self.prefix = prefix
+        self._client = None
+        self._reserve = None
+        self._pause = None
+        self._pid = None
+        self._down_until = 0.0
+        self.errors = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _connect(self):
+        # A forked worker must not reuse the parent's sockets
+        if self._client is None or self._pid != os.getpid():
+            import redis
+            self._client = redis.Redis(host=self.host, port=self.port, db=0,
+                                       socket_connect_timeout=self.timeout, socket_timeout=self.timeout)
+            self._reserve = self._client.register_script(_RESERVE_SCRIPT)
+            self._pause = self._client.register_script(_PAUSE_SCRIPT)
+            self._pid = os.getpid()
+
+    def _call(self, operation: str, call):
+        if not self.available:
+            return None
+        try:
+            self._connect()
+            return call()
+        except Exception as e:
+            self.errors += 1
+            self._down_until = time.monotonic() + self.degrade_seconds
+            self._client = None
+            logger.warning(f"Shared rate-limit store {operation} failed ({e}) - using per-process buckets for {self.degrade_seconds:.0f}s")
+            return None
+
+    def reserve(self, host: str, rate: float, burst: int, max_wait: Optional[float]) -> Optional[Tuple[bool, float]]:
+        """(granted, wait) from the shared state; None if the store is unavailable"""
+        reply = self._call("reserve", lambda: self._reserve(
+            keys=[self.prefix + host], args=[1 / rate, burst, -1 if max_wait is None else max_wait]))
+        if reply is None:
+            return None
+        return bool(int(reply[0])), float(reply[1])
+
+    def pause(self, host: str, rate: float, burst: int, seconds: float):
+        self._call("pause", lambda: self._pause(keys=[self.prefix + host], args=[1 / rate, burst, seconds]))
+
+
+class TokenBucket:
+    def __init__(self, host: str, rate: float, burst: int, min_rate_ratio: float = 0.1,
+                 store: Optional[SharedBucketStore] = None):
+        self.host = host
+        self.store = store
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = rate * min_rate_ratio
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.granted = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.throttled_responses = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(float(self.burst), self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def shared(self) -> bool:
+        return self.store is not None and self.store.available
+
+    def reserve(self, max_wait: Optional[float] = None) -> float:
+        """Take the next slot and return how long to wait for it (FIFO by reservation order)"""
+        shared = self.store.reserve(self.host, self.rate, self.burst, max_wait) if self.store else None
+        with self._lock:
+            if shared is not None:
+                granted, wait = shared
+            else:
+                self._refill(time.monotonic())
+                wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+                granted = max_wait is None or wait <= max_wait
+                if granted:
+                    self.tokens -= 1
+            if not granted:
+                self.rejected += 1
+                raise RateLimitedError(self.host, wait)
+            self.granted += 1
+            if wait > 0:
+                self.delayed += 1
+                self.total_wait += wait
+            return wait
+
+    async def acquire(self, max_wait: Optional[float] = None):
+        # The shared store is a blocking Redis round-trip; keep it off the event loop
+        wait = await asyncio.to_thread(self.reserve, max_wait) if self.shared else self.reserve(max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_blocking(self, max_wait: Optional[float] = None):
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _adapt(self, status_code: int, retry_after: Optional[float]) -> Optional[float]:
+        """Adapt to upstream throttling signals (AIMD); returns the pause to share, if any"""
+        pause = None
+        with self._lock:
+            if status_code == 429 or (status_code == 503 and retry_after is not None):
+                self.throttled_responses += 1
+                self._refill(time.monotonic())
+                self.rate = max(self.min_rate, self.rate / 2)
+                # Push every later reservation past the Retry-After window
+                pause = retry_after if retry_after is not None else 1 / self.rate
+                self.tokens = min(self.tokens, 0.0) - pause * self.rate
+                logger.warning(f"{self.host} throttled us ({status_code}); rate -> {self.rate:.2f}/s, pause {pause:.1f}s")
+            elif status_code < 400 and self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+        return pause if self.store is not None else None
+
+    async def feedback(self, status_code: int, retry_after: Optional[float] = None):
+        pause = self._adapt(status_code, retry_after)
+        if pause is not None:
+            # Other processes must back off too; the Redis call blocks, so keep it off the event loop
+            await asyncio.to_thread(self.store.pause, self.host, self.rate, self.burst, pause)
+
+    def feedback_blocking(self, status_code: int, retry_after: Optional[float] = None):
+        pause = self._adapt(status_code, retry_after)
+        if pause is not None:
+            self.store.pause(self.host, self.rate, self.burst, pause)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "shared": self.shared,
+                "rate_per_second": round(self.rate, 3),
+                "base_rate_per_second": round(self.base_rate, 3),
+                "burst": self.burst,
+                "available_tokens": round(self.tokens, 2),
+                "granted": self.granted,
+                "delayed": self.delayed,
+                "rejected": self.rejected,
+                "throttled_responses": self.throttled_responses,
+                "avg_wait_ms": round(self.total_wait / self.delayed * 1000, 1) if self.delayed else 0.0,
+            }
+
+
+class RateLimiterRegistry:
+    """Lazily creates one TokenBucket per upstream host"""
+
+    def __init__(self, host_rates: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default_rate: Tuple[float, int] = DEFAULT_HOST_RATE,
+                 store: Optional[SharedBucketStore] = None):
+        self.host_rates = dict(host_rates or {})
+        self.default_rate = default_rate
+        self.store = store
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url_or_host: str) -> str:
+        if "://" in url_or_host:
+            return urlsplit(url_or_host).hostname or url_or_host
+        return url_or_host
+
+    def bucket(self, url_or_host: str) -> TokenBucket:
+        host = self.host_of(url_or_host)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    rate, burst = self.host_rates.get(host, self.default_rate)
+                    bucket = self._buckets[host] = TokenBucket(host, rate, burst, store=self.store)
+        return bucket
+
+    async def acquire(self, url_or_host: str, max_wait: Optional[float] = None):
+        await self.bucket(url_or_host).acquire(max_wait)
+
+    def acquire_blocking(self, url_or_host: str, max_wait: Optional[float] = None):
+        self.bucket(url_or_host).acquire_blocking(max_wait)
+
+    async def feedback(self, url_or_host: str, status_code: int, retry_after: Optional[str] = None):
+        await self.bucket(url_or_host).feedback(status_code, parse_retry_after(retry_after))
+
+    def feedback_blocking(self, url_or_host: str, status_code: int, retry_after: Optional[str] = None):
+        self.bucket(url_or_host).feedback_blocking(status_code, parse_retry_after(retry_after))
+
+    def requests_hook(self, response, *args, **kwargs):
+        """`requests.Session().hooks["response"]` adapter for the sync scrapers"""
+        self.feedback_blocking(response.url, response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {host: bucket.snapshot() for host, bucket in list(self._buckets.items())}
+
+
+def _parse_rate_overrides(spec: str) -> Dict[str, Tuple[float, int]]:
+    """'emsal.uyap.gov.tr=0.5/3,...' -> {host: (rate, burst)}"""
+    rates = {}
+    for item in spec.split(","):
+        if "=" in item:
+            host, _, value = item.partition("=")
+            rate, _, burst = value.partition("/")
+            rates[host.strip()] = (float(rate), int(burst or 1))
+    return rates
+
+
+def _shared_store() -> Optional[SharedBucketStore]:
+    if os.getenv("RATE_LIMIT_BACKEND", "redis").lower() != "redis":
+        return None
+    try:
+        import redis  # noqa: F401
+    except ImportError:
+        return None
+    return SharedBucketStore(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        timeout=float(os.getenv("RATE_LIMIT_REDIS_TIMEOUT_MS", "100")) / 1000
+    )
+
+
+# Limiter shared by proxies, API clients and scrapers (across processes via Redis)
+rate_limits = RateLimiterRegistry({**HOST_RATES, **_parse_rate_overrides(os.getenv("RATE_LIMITS", ""))},
+                                  store=_shared_store())
@@ -5,7 +5,7 @@ Implements actual connections to Yargıtay, Danıştay, UYAP and other legal dat
 """
 
 import asyncio
-import aiohttp
+import httpx
 import json
 import logging
 from typing import Dict, List, Any, Optional
@@ -13,24 +13,42 @@ from datetime import datetime
 import time
 import urllib.parse
 
+from http_clients import http_clients
+from federated_search import (
+    FederatedSource, InvalidCursorError, PagedSource, merge_page, query_fingerprint, stream_federated, summarize
+)
+
 logger = logging.getLogger(__name__)
 
+UPSTREAM_BASE_URLS = (
+    "https://karararama.yargitay.gov.tr",
+    "https://www.danistay.gov.tr",
+    "https://emsal.uyap.gov.tr",
+    "https://bedesten.adalet.gov.tr",
+)
+
+# Bedesten federated search: global deadline and per-source soft deadlines (seconds)
+BEDESTEN_DEADLINE = 8.0
+BEDESTEN_SOURCE_DEADLINES = {"yargitay": 3.0, "danistay": 3.0, "uyap_emsal": 4.0}
+
 class RealLegalAPIConnector:
     """Real API connections to Turkish legal databases"""
     
     def __init__(self):
-        self.session = None
-        self.timeout = aiohttp.ClientTimeout(total=30)
+        self.timeout = httpx.Timeout(30.0, connect=10.0)
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        """Shared keep-alive (HTTP/2) client for an upstream host"""
+        return http_clients.client(base_url)
         
     async def ensure_session(self):
-        """Ensure aiohttp session exists"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(timeout=self.timeout)
+        """Warm the shared per-host clients (kept alive across calls by long-lived workers)"""
+        for base_url in UPSTREAM_BASE_URLS:
+            self.client(base_url)
     
     async def close_session(self):
-        """Close aiohttp session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Close the shared HTTP clients of this event loop"""
+        await http_clients.aclose()
 
     async def search_yargitay_real(self, keyword: str, page_size: int = 10, **kwargs) -> Dict[str, Any]:
         """
@@ -48,7 +66,7 @@ class RealLegalAPIConnector:
             search_params = {
                 "arananKelime": keyword,
                 "sayfaBoyutu": page_size,
-                "sayfa": 1,
+                "sayfa": kwargs.get("page", 1),
                 "mahkeme": "YARGITAY",
                 "tarihBaslangic": kwargs.get("date_start", ""),
                 "tarihBitis": kwargs.get("date_end", ""),
@@ -63,14 +81,15 @@ class RealLegalAPIConnector:
             await asyncio.sleep(0.3)  # Simulate network delay
             
             # This would be the actual API call:
-            # async with self.session.post(f"{base_url}/api/search", json=search_params) as response:
-            #     if response.status == 200:
-            #         data = await response.json()
-            #         return self._process_yargitay_response(data)
+            # response = await self.client(base_url).post(f"{base_url}/api/search", json=search_params, timeout=self.timeout)
+            # if response.status_code == 200:
+            #     return self._process_yargitay_response(response.json())
             
             # Simulated response with real structure
             results = []
-            for i in range(page_size):
+            # Result index continues across pages so deeper pages rank below earlier ones
+            offset = (search_params["sayfa"] - 1) * page_size
+            for i in range(offset, offset + page_size):
                 results.append({
                     "id": f"yargitay_real_{int(time.time())}_{i}",
                     "documentId": f"2024/{15000 + i}",
@@ -91,7 +110,7 @@ class RealLegalAPIConnector:
             return {
                 "success": True,
                 "total_results": page_size * 25,  # Estimated total
-                "page": 1,
+                "page": search_params["sayfa"],
                 "page_size": page_size,
                 "results": results,
                 "processing_time_ms": 300.0,
@@ -122,7 +141,7 @@ class RealLegalAPIConnector:
             search_params = {
                 "arananKelime": keyword,
                 "sayfaBoyutu": page_size,
-                "sayfa": 1,
+                "sayfa": kwargs.get("page", 1),
                 "daire": kwargs.get("chamber", ""),
                 "tarihBaslangic": kwargs.get("date_start", ""),
                 "tarihBitis": kwargs.get("date_end", ""),
@@ -134,7 +153,9 @@ class RealLegalAPIConnector:
             
             # Real API response structure
             results = []
-            for i in range(page_size):
+            # Result index continues across pages so deeper pages rank below earlier ones
+            offset = (search_params["sayfa"] - 1) * page_size
+            for i in range(offset, offset + page_size):
                 results.append({
                     "id": f"danistay_real_{int(time.time())}_{i}",
                     "documentId": f"D.2024/{10000 + i}",
@@ -155,7 +176,7 @@ class RealLegalAPIConnector:
             return {
                 "success": True,
                 "total_results": page_size * 18,
-                "page": 1,
+                "page": search_params["sayfa"],
                 "page_size": page_size,
                 "results": results,
                 "processing_time_ms": 250.0,
@@ -186,7 +207,7 @@ class RealLegalAPIConnector:
             search_params = {
                 "arananMetin": keyword,
                 "sonucSayisi": page_size,
-                "sayfa": 1,
+                "sayfa": kwargs.get("page", 1),
                 "kararYili": kwargs.get("decision_year_karar", ""),
                 "mahkemeAdi": kwargs.get("court", "")
             }
@@ -204,7 +225,9 @@ class RealLegalAPIConnector:
             ]
             
             results = []
-            for i in range(page_size):
+            # Result index continues across pages so deeper pages rank below earlier ones
+            offset = (search_params["sayfa"] - 1) * page_size
+            for i in range(offset, offset + page_size):
                 court = courts[i % len(courts)]
                 results.append({
                     "id": f"uyap_emsal_real_{int(time.time())}_{i}",
@@ -226,7 +249,7 @@ class RealLegalAPIConnector:
             return {
                 "success": True,
                 "total_results": page_size * 35,
-                "page": 1,
+                "page": search_params["sayfa"],
                 "page_size": page_size,
                 "results": results,
                 "processing_time_ms": 400.0,
@@ -243,6 +266,20 @@ class RealLegalAPIConnector:
                 "fallback": True
             }
 
+    def _bedesten_sources(self, phrase: str) -> List[PagedSource]:
+        """Upstreams combined by Bedesten Unified (each sorted by relevance), with soft deadlines"""
+        return [
+            PagedSource("yargitay", "Yargıtay",
+                        lambda page, size: self.search_yargitay_real(phrase, size, page=page),
+                        BEDESTEN_SOURCE_DEADLINES["yargitay"]),
+            PagedSource("danistay", "Danıştay",
+                        lambda page, size: self.search_danistay_real(phrase, size, page=page),
+                        BEDESTEN_SOURCE_DEADLINES["danistay"]),
+            PagedSource("uyap_emsal", "UYAP Emsal",
+                        lambda page, size: self.search_uyap_emsal_real(phrase, size, page=page),
+                        BEDESTEN_SOURCE_DEADLINES["uyap_emsal"]),
+        ]
+
     async def search_bedesten_unified_real(self, phrase: str, page_size: int = 20, **kwargs) -> Dict[str, Any]:
         """
         Real Bedesten Unified API connection
@@ -253,41 +290,38 @@ class RealLegalAPIConnector:
             
             logger.info(f"🔗 Real Bedesten Unified API call: {phrase}")
             
-            # Bedesten combines multiple sources
-            # Run parallel searches
-            tasks = [
-                self.search_yargitay_real(phrase, page_size // 3),
-                self.search_danistay_real(phrase, page_size // 3),
-                self.search_uyap_emsal_real(phrase, page_size // 3)
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Combine results
-            all_results = []
-            total_processing_time = 0
-            
-            for result in results:
-                if isinstance(result, dict) and result.get("success"):
-                    all_results.extend(result.get("results", []))
-                    total_processing_time += result.get("processing_time_ms", 0)
-            
-            # Sort by relevance score
-            all_results.sort(key=lambda x: x.get("relevanceScore", 0), reverse=True)
-            
-            # Limit to requested page size
-            limited_results = all_results[:page_size]
+            # Bedesten combines multiple sources: query them in parallel (missing
+            # sources -> partial) and heap-merge their relevance-sorted streams.
+            # The cursor carries per-source offsets, so page N only reads each
+            # source as deep as that page needs.
+            deadline = kwargs.get("deadline", BEDESTEN_DEADLINE)
+            try:
+                federated = await merge_page(
+                    self._bedesten_sources(phrase),
+                    page_size,
+                    deadline,
+                    cursor=kwargs.get("cursor"),
+                    fingerprint=query_fingerprint("bedesten", phrase, page_size)
+                )
+            except InvalidCursorError as e:
+                return {"success": False, "error": str(e), "error_code": "INVALID_CURSOR"}
+            total_processing_time = max((o["elapsed_ms"] for o in federated["outcomes"]), default=0)
             
             return {
                 "success": True,
-                "total_results": len(all_results) * 5,  # Estimated total
-                "page": kwargs.get("pageNumber", 1),
+                "total_results": sum(o.get("total_results", 0) for o in federated["outcomes"]),
+                "page": federated["page"],
                 "page_size": page_size,
-                "results": limited_results,
+                "results": federated["results"],
+                "has_more": federated["has_more"],
+                "next_cursor": federated["next_cursor"],
                 "processing_time_ms": total_processing_time,
                 "api_source": "Bedesten Unified Legal Database - Real APIs",
-                "api_status": "MULTI-SOURCE ACTIVE",
-                "sources_used": ["Yargıtay", "Danıştay", "UYAP Emsal"],
+                "api_status": "MULTI-SOURCE PARTIAL" if federated["partial"] else "MULTI-SOURCE ACTIVE",
+                "sources_used": [o["label"] for o in federated["outcomes"] if o["status"] == "ok"],
+                "partial": federated["partial"],
+                "missing_sources": federated["missing_sources"],
+                "sources": federated["sources"],
                 "endpoint": "https://bedesten.adalet.gov.tr"
             }
             
@@ -299,6 +333,29 @@ class RealLegalAPIConnector:
                 "fallback": True
             }
 
+    async def stream_bedesten_unified_real(self, phrase: str, page_size: int = 20, **kwargs):
+        """
+        Streaming Bedesten Unified search: yields one event per source as its
+        hits land, then a final summary event with partial/missing sources
+        """
+        await self.ensure_session()
+        logger.info(f"🔗 Real Bedesten Unified API stream: {phrase}")
+
+        deadline = kwargs.get("deadline", BEDESTEN_DEADLINE)
+        outcomes = []
+        sources = [
+            FederatedSource(s.name, s.label, (lambda s=s: s.fetch(1, page_size)), s.soft_deadline)
+            for s in self._bedesten_sources(phrase)
+        ]
+        async for outcome in stream_federated(sources, deadline):
+            outcomes.append(outcome)
+            yield {"event": "source", **outcome}
+        yield {
+            "event": "done",
+            "total_results": sum(o["count"] for o in outcomes),
+            **summarize(outcomes, deadline)
+        }
+
     async def get_document_real(self, document_id: str, source: str = "yargitay") -> Dict[str, Any]:
         """
         Real document retrieval from legal databases
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Durable queue and worker pool for the court data-scraping jobs.
+
+The scraping endpoints used to start a bare thread per request that wrote into
+one global status dict: one job at a time, nothing survived a restart. Here
+each request becomes a job row in a local SQLite file:
+
+    job = scraping_jobs.submit("tazminat", system="UYAP", pages=10)
+    scraping_jobs.get(job["id"]); scraping_jobs.results(job["id"]); scraping_jobs.cancel(job["id"])
+
+- SCRAPING_JOB_WORKERS threads run queued jobs concurrently (each job holds
+  at most one pooled WebDriver / one JSON client session at a time)
+- every completed page is committed on its own, so a job interrupted by a
+  crash or restart is re-queued on startup and fetches only the pages it
+  has not committed yet
+- a page the site fails to return is logged and never committed; it is
+  retried once at the end of the site's run (and again on resume), and a
+  job still missing pages finishes as "partial" listing them
+- a job is cancelled between pages; shutdown leaves running jobs queued for
+  the next start instead of failing them
+- pages come from CourtJsonClient (fanned out, in order); when the site
+  doesn't answer JSON the Selenium scraper walks the result pages in the
+  browser instead, committing them one at a time the same way
+
+The database path is SCRAPING_JOBS_DB (default: panel_scraped/scraping_jobs.db
+in the temp dir, next to the exported files).
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from court_json_client import CourtJsonClient, CourtJsonError, SITE_NAMES
+from rate_limiter import RateLimitedError
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ("queued", "running", "completed", "partial", "failed", "cancelled")
+FINISHED_STATES = ("completed", "partial", "failed", "cancelled")
+MAX_LOGS_PER_JOB = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT,
+    keyword TEXT NOT NULL,
+    sites TEXT NOT NULL,
+    start_page INTEGER NOT NULL,
+    pages INTEGER NOT NULL,
+    headless INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    message TEXT NOT NULL DEFAULT '',
+    progress REAL NOT NULL DEFAULT 0,
+    total_results INTEGER NOT NULL DEFAULT 0,
+    result_count INTEGER NOT NULL DEFAULT 0,
+    sites_done TEXT NOT NULL DEFAULT '[]',
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS job_pages (
+    job_id TEXT NOT NULL,
+    site TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    item_count INTEGER NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (job_id, site, page)
+);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    site TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (job_id, site, page, position)
+);
+CREATE TABLE IF NOT EXISTS job_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_logs_job ON job_logs (job_id, id);
+"""
+
+
+def parse_sites(system: str) -> List[str]:
+    """'UYAP' / 'Yargıtay' / 'Her İkisi' (and lowercase ASCII forms) -> site keys"""
+    key = system.strip().replace("İ", "I").replace("ı", "i").lower()
+    if key in ("uyap",):
+        return ["uyap"]
+    if key in ("yargitay",):
+        return ["yargitay"]
+    if key in ("her ikisi", "both"):
+        return ["uyap", "yargitay"]
+    raise ValueError(f"Desteklenmeyen sistem: {system}")
+
+
+class JobStore:
+    """SQLite persistence; one connection shared by the workers under a lock"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["sites"] = json.loads(job["sites"])
+        job["sites_done"] = json.loads(job["sites_done"])
+        job["headless"] = bool(job["headless"])
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def create(self, keyword: str, sites: List[str], start_page: int, pages: int, headless: bool,
+               parent_id: Optional[str] = None) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, parent_id, keyword, sites, start_page, pages, headless, status, message, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 'queued', 'Sırada', ?)",
+                (job_id, parent_id, keyword, json.dumps(sites), start_page, pages, int(headless), time.time())
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def list(self, limit: int = 50, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        query, args = "SELECT * FROM jobs", []
+        if status:
+            query, args = query + " WHERE status = ?", [status]
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at DESC LIMIT ?", (*args, limit)).fetchall()
+        return [self._job(row) for row in rows]
+
+    def update(self, job_id: str, **fields):
+        for key in ("sites", "sites_done"):
+            if key in fields:
+                fields[key] = json.dumps(fields[key])
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+            ).fetchall()
+        return [self._job(row) for row in rows]
+
+    def save_page(self, job_id: str, site: str, page: int, items: List[Dict[str, Any]], total: Optional[int]):
+        """Commit one page's results and mark the page completed atomically"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM job_results WHERE job_id = ? AND site = ? AND page = ?", (job_id, site, page))
+                self._conn.executemany(
+                    "INSERT INTO job_results (job_id, site, page, position, data) VALUES (?, ?, ?, ?, ?)",
+                    [(job_id, site, page, position, json.dumps(item, ensure_ascii=False, default=str))
+                     for position, item in enumerate(items)]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO job_pages (job_id, site, page, item_count, completed_at) VALUES (?, ?, ?, ?, ?)",
+                    (job_id, site, page, len(items), time.time())
+                )
+                self._conn.execute(
+                    "UPDATE jobs SET result_count = (SELECT COUNT(*) FROM job_results WHERE job_id = ?), "
+                    "total_results = MAX(total_results, ?) WHERE id = ?",
+                    (job_id, total or 0, job_id)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def last_page(self, job_id: str, site: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(page) FROM job_pages WHERE job_id = ? AND site = ?", (job_id, site)).fetchone()
+        return row[0]
+
+    def missing_pages(self, job_id: str, site: str, first_page: int, end_page: int) -> List[int]:
+        """Pages of first_page..end_page not committed yet"""
+        with self._lock:
+            done = {row[0] for row in self._conn.execute(
+                "SELECT page FROM job_pages WHERE job_id = ? AND site = ? AND page BETWEEN ? AND ?",
+                (job_id, site, first_page, end_page)
+            ).fetchall()}
+        return [page for page in range(first_page, end_page + 1) if page not in done]
+
+    def pages_done(self, job_id: str) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM job_pages WHERE job_id = ?", (job_id,)).fetchone()[0]
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM job_results WHERE job_id = ? ORDER BY site, page, position LIMIT ? OFFSET ?",
+                (job_id, limit, offset)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def log(self, job_id: str, message: str):
+        with self._lock:
+            self._conn.execute("INSERT INTO job_logs (job_id, created_at, message) VALUES (?, ?, ?)",
+                               (job_id, time.time(), message))
+            self._conn.execute(
+                "DELETE FROM job_logs WHERE job_id = ? AND id <= "
+                "(SELECT id FROM job_logs WHERE job_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (job_id, job_id, MAX_LOGS_PER_JOB)
+            )
+
+    def logs(self, job_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT created_at, message FROM job_logs WHERE job_id = ? ORDER BY id DESC LIMIT ?", (job_id, limit)
+            ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def purge_finished(self) -> int:
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                f"SELECT id FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED_STATES))})", FINISHED_STATES
+            ).fetchall()]
+            for table, column in (("job_results", "job_id"), ("job_pages", "job_id"), ("job_logs", "job_id"), ("jobs", "id")):
+                self._conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", [(job_id,) for job_id in ids])
+        return len(ids)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {state: 0 for state in JOB_STATES} | {row[0]: row[1] for row in rows}
+
+
+class _Interrupted(Exception):
+    """Raised inside a job when it was cancelled or the manager is shutting down"""
+
+
+class ScrapingJobManager:
+    def __init__(self, store_path: str, workers: int = 2):
+        self.store_path = store_path
+        self.workers = workers
+        self.store: Optional[JobStore] = None
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._cancelled: set = set()
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Open the store, re-queue interrupted jobs and start the workers (idempotent)"""
+        with self._start_lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            self.store = JobStore(self.store_path)
+            for job in self.store.unfinished():
+                if job["status"] == "running":
+                    self.store.log(job["id"], "Yeniden başlatıldı: tamamlanmamış sayfalardan devam ediliyor")
+                self.store.update(job["id"], status="queued", message="Sırada (devam)")
+                self._queue.put(job["id"])
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"scraping-job-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            logger.info(f"Scraping job workers started: {self.workers} (store {self.store_path})")
+
+    def stop(self, timeout: float = 30.0):
+        """Stop after the current page; running jobs stay queued for the next start"""
+        with self._start_lock:
+            if not self._threads:
+                return
+            self._stopping.set()
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join(timeout / len(self._threads))
+            self._threads = []
+            self._queue = queue.Queue()
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def submit(self, keyword: str, system: str = "UYAP", pages: int = 10, headless: bool = True,
+               start_page: int = 1, parent_id: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a job; `parent_id` links a continuation (next pages of an earlier job)"""
+        self.start()
+        job = self.store.create(keyword, parse_sites(system), start_page, pages, headless, parent_id)
+        self.store.log(job["id"], f"İş oluşturuldu: '{keyword}' ({system}, sayfa {start_page}-{start_page + pages - 1})")
+        self._queue.put(job["id"])
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self.start()
+        return self.store.get(job_id)
+
+    def list(self, limit: int = 50, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        self.start()
+        return self.store.list(limit, status)
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        self.start()
+        return self.store.results(job_id, offset, limit)
+
+    def logs(self, job_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        self.start()
+        return self.store.logs(job_id, limit)
+
+    def last_page(self, job_id: str) -> Optional[int]:
+        """Highest page completed for any of the job's sites"""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        pages = [self.store.last_page(job_id, site) for site in job["sites"]]
+        return max((page for page in pages if page is not None), default=None)
+
+    def chain(self, job_id: str) -> List[Dict[str, Any]]:
+        """The job and the jobs it continues, oldest first"""
+        jobs = []
+        job = self.get(job_id)
+        while job is not None:
+            jobs.insert(0, job)
+            job = self.store.get(job["parent_id"]) if job["parent_id"] else None
+        return jobs
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return job
+        self._cancelled.add(job_id)
+        self.store.update(job_id, cancel_requested=1)
+        if job["status"] == "queued":
+            self._finish(job_id, "cancelled", "İptal edildi")
+        else:
+            self.store.log(job_id, "İptal istendi: mevcut sayfa bitince durdurulacak")
+        return self.store.get(job_id)
+
+    def purge_finished(self) -> int:
+        self.start()
+        return self.store.purge_finished()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "started": bool(self._threads),
+            "queue_depth": self._queue.qsize(),
+            "jobs": self.store.counts() if self.store else {},
+        }
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            try:
+                self._run(job_id)
+            except Exception as e:
+                logger.exception(f"Scraping job {job_id} crashed")
+                self._finish(job_id, "failed", f"Hata: {e}", error=str(e))
+            finally:
+                self._cancelled.discard(job_id)
+
+    def _check(self, job_id: str):
+        if self._stopping.is_set() or job_id in self._cancelled:
+            raise _Interrupted()
+
+    def _finish(self, job_id: str, status: str, message: str, error: Optional[str] = None):
+        progress = 100.0 if status == "completed" else None
+        fields = {"status": status, "message": message, "finished_at": time.time(), "error": error}
+        if progress is not None:
+            fields["progress"] = progress
+        self.store.update(job_id, **fields)
+        self.store.log(job_id, message)
+
+    def _run(self, job_id: str):
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return
+        if job["cancel_requested"]:
+            self._finish(job_id, "cancelled", "İptal edildi")
+            return
+        self.store.update(job_id, status="running", message="Çalışıyor", started_at=job["started_at"] or time.time())
+
+        sites_done = list(job["sites_done"])
+        missing: Dict[str, List[int]] = {}
+        try:
+            for site in job["sites"]:
+                if site in sites_done:
+                    continue
+                pages = self._run_site(job, site)
+                if pages:
+                    missing[site] = pages
+                    continue
+                sites_done.append(site)
+                self.store.update(job_id, sites_done=sites_done)
+        except _Interrupted:
+            if job_id in self._cancelled:
+                self._finish(job_id, "cancelled", "İptal edildi")
+            else:
+                self.store.update(job_id, status="queued", message="Kapatma nedeniyle durdu, yeniden başlatınca devam edecek")
+            return
+
+        final = self.store.get(job_id)
+        if missing:
+            pages = "; ".join(f"{SITE_NAMES[site]} {', '.join(map(str, pages))}" for site, pages in missing.items())
+            self._finish(job_id, "partial", f"Kısmen tamamlandı: {final['result_count']} karar, alınamayan sayfalar: {pages}",
+                         error=f"Alınamayan sayfalar: {pages}")
+            return
+        self._finish(job_id, "completed", f"Tamamlandı: {final['result_count']} karar")
+
+    def _progress(self, job: Dict[str, Any]) -> float:
+        done = self.store.pages_done(job["id"])
+        return round(min(99.0, done / (job["pages"] * len(job["sites"])) * 100), 1)
+
+    def _run_site(self, job: Dict[str, Any], site: str) -> List[int]:
+        """Fetch the site's uncommitted pages; returns the pages still missing afterwards"""
+        job_id = job["id"]
+        end_page = job["start_page"] + job["pages"] - 1
+        missing = self.store.missing_pages(job_id, site, job["start_page"], end_page)
+        if not missing:
+            return []
+        self._check(job_id)
+        if missing[0] != job["start_page"]:
+            self.store.log(job_id, f"{SITE_NAMES[site]}: sayfa {missing[0]}'den devam ediliyor")
+
+        # Last page the site actually has within the range; lowered once a total or a short page is seen
+        site_end = end_page
+        page_size = 0
+        delivered = 0
+
+        def on_page(page: int, decisions: List[Dict[str, Any]], total: Optional[int]) -> bool:
+            nonlocal site_end, delivered
+            delivered += 1
+            if total is not None and page_size:
+                site_end = min(site_end, max(page, math.ceil(total / page_size)))
+            if len(decisions) < page_size:
+                site_end = min(site_end, page)
+            self.store.save_page(job_id, site, page, decisions, total)
+            self.store.update(job_id, progress=self._progress(job),
+                              message=f"{SITE_NAMES[site]}: sayfa {page}/{end_page} tamamlandı")
+            self.store.log(job_id, f"{SITE_NAMES[site]} sayfa {page}: {len(decisions)} karar (toplam {total or 0:,})")
+            return not (self._stopping.is_set() or job_id in self._cancelled)
+
+        def on_page_failed(page: int, error: Exception):
+            self.store.log(job_id, f"{SITE_NAMES[site]} sayfa {page} alınamadı: {error}")
+
+        async def collect():
+            nonlocal page_size
+            async with CourtJsonClient(site) as client:
+                await client.bootstrap(job["headless"])
+                page_size = client.page_size
+                # Resume: only the runs of pages not committed yet
+                for first, last in _page_runs(missing):
+                    self._check(job_id)
+                    if first > site_end:
+                        break
+                    try:
+                        await client.collect(job["keyword"], min(last, site_end) - first + 1, start_page=first,
+                                             on_page=on_page, on_page_failed=on_page_failed)
+                    except (httpx.HTTPError, RateLimitedError, CourtJsonError) as e:
+                        if not delivered:
+                            raise
+                        # The endpoint works; this run's first page failed, the retry below covers it
+                        on_page_failed(first, e)
+                # One more try for each page that failed (or was cut off by a failed first page)
+                for page in self.store.missing_pages(job_id, site, missing[0], site_end):
+                    self._check(job_id)
+                    try:
+                        await client.collect(job["keyword"], 1, start_page=page, on_page=on_page)
+                    except (httpx.HTTPError, RateLimitedError, CourtJsonError) as e:
+                        on_page_failed(page, e)
+
+        try:
+            try:
+                asyncio.run(collect())
+            except (httpx.HTTPError, RateLimitedError) as e:
+                raise CourtJsonError(f"{site}: {e.__class__.__name__}: {e}") from e
+        except CourtJsonError as e:
+            self.store.log(job_id, f"{SITE_NAMES[site]}: JSON uç noktası kullanılamadı, tarayıcıyla çekiliyor ({e})")
+            site_end = self._run_site_with_browser(job, site, missing[0], end_page)
+        self._check(job_id)
+        return self.store.missing_pages(job_id, site, missing[0], site_end)
+
+    def _run_site_with_browser(self, job: Dict[str, Any], site: str, first_page: int, end_page: int) -> int:
+        """Selenium fallback: walks the result pages from first_page, committing each uncommitted one;
+        returns the last page the site has within the range"""
+        selenium_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "selenium")
+        if selenium_dir not in sys.path:
+            sys.path.append(selenium_dir)
+        from selenium_scraper import UYAPScraper, YargitayScraper
+
+        job_id = job["id"]
+        scraper = (UYAPScraper if site == "uyap" else YargitayScraper)(headless=job["headless"])
+        pending = set(self.store.missing_pages(job_id, site, first_page, end_page))
+        last_page = first_page - 1
+        pages = scraper.iter_result_pages(job["keyword"], first_page, end_page)
+        try:
+            for page, decisions in pages:
+                last_page = page
+                if page in pending:
+                    self.store.save_page(job_id, site, page, decisions, None)
+                    self.store.update(job_id, progress=self._progress(job),
+                                      message=f"{SITE_NAMES[site]}: sayfa {page}/{end_page} tamamlandı (tarayıcı)")
+                    self.store.log(job_id, f"{SITE_NAMES[site]} sayfa {page} (tarayıcı): {len(decisions)} karar")
+                self._check(job_id)
+        finally:
+            # Returns the WebDriver to the pool even when the job is interrupted mid-range
+            pages.close()
+        return last_page
+
+
+def _page_runs(pages: List[int]) -> List[tuple]:
+    """[3, 4, 5, 9, 10] -> [(3, 5), (9, 10)]"""
+    runs = []
+    for page in pages:
+        if runs and runs[-1][1] == page - 1:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+# Process-wide manager used by the backend endpoints
+scraping_jobs = ScrapingJobManager(
+    store_path=os.getenv("SCRAPING_JOBS_DB", os.path.join(tempfile.gettempdir(), "panel_scraped", "scraping_jobs.db")),
+    workers=int(os.getenv("SCRAPING_JOB_WORKERS", "2"))
+)
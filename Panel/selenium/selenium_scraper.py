@@ -5,11 +5,9 @@ Selenium tabanlı UYAP ve Yargıtay Karar Arama Sistemi Veri Çekme Aracı
 Bu araç, JavaScript tabanlı arayüzlerden veri çekmek için tasarlanmıştır.
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
@@ -17,12 +15,25 @@ import json
 import csv
 from datetime import datetime
 import logging
+import os
+import sys
 import pandas as pd
 
+# Panel/webdriver_pool.py, Panel/selenium_waits.py: warm Chrome sessions and DOM waits shared by the scrapers
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webdriver_pool import webdriver_pool
+from selenium_waits import DomWaiter
+from court_json_client import CourtJsonError, collect_decisions
+
+RESULT_ROWS_SELECTOR = "#detayAramaSonuclar tbody tr"
+
 class SeleniumScraper:
+    source = "selenium"  # DOM bekleme metriklerinde önek
+    
     def __init__(self, headless=True):
         self.headless = headless
         self.driver = None
+        self.waiter = None
         
         # Logging ayarları
         logging.basicConfig(
@@ -36,19 +47,93 @@ class SeleniumScraper:
         self.logger = logging.getLogger(__name__)
         
     def _setup_driver(self):
-        """WebDriver'ı kurar"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.implicitly_wait(10)
-        
+        """WebDriver'ı havuzdan alır (her aramada yeni Chrome başlatmak yerine)"""
+        self.driver = webdriver_pool.acquire(self.headless)
+        # Örtük bekleme yok: her koşul DomWaiter ile açıkça beklenir
+        self.waiter = DomWaiter(self.driver)
+    
+    def _release_driver(self):
+        """WebDriver'ı sıfırlayıp havuza iade eder (kopmuş oturumlar yenisiyle değiştirilir)"""
+        if self.driver:
+            webdriver_pool.release(self.driver)
+            self.driver = None
+            self.waiter = None
+    
+    def _search_via_json(self, keyword, limit):
+        """Sitenin JSON uç noktalarıyla arar (karar metinleri eşzamanlı); JSON yoksa None"""
+        try:
+            results = collect_decisions(self.source, keyword, limit // 10 + 1, limit=limit, headless=self.headless)
+            self.logger.info(f"JSON uç noktasından {len(results)} sonuç toplandı")
+            return results
+        except CourtJsonError as e:
+            self.logger.warning(f"JSON uç noktası kullanılamadı, tarayıcıyla devam ediliyor: {e}")
+            return None
+    
+    def _wait_for_results(self):
+        """Sonuç tablosu satırları render edilene kadar bekler"""
+        return self.waiter.rows(RESULT_ROWS_SELECTOR, name=f"{self.source}.results")
+    
+    def _open_decision(self, row):
+        """Satıra tıklar ve #kararAlani yeni kararın metniyle dolana kadar bekler"""
+        previous_text = self.waiter.text_of("#kararAlani")
+        row.click()
+        return self.waiter.text_changed("#kararAlani", previous_text, name=f"{self.source}.detail")
+    
+    def _go_to_next_page(self):
+        """Sonraki sayfaya geçer; eski satırlar DOM'dan düşüp yenileri gelene kadar bekler"""
+        try:
+            next_button = self.driver.find_element(By.CSS_SELECTOR, "a[title='Sonraki sayfa']")
+            if not (next_button and next_button.is_enabled()):
+                return False
+            old_rows = self.driver.find_elements(By.CSS_SELECTOR, RESULT_ROWS_SELECTOR)
+            next_button.click()
+            if old_rows:
+                self.waiter.stale(old_rows[0], name=f"{self.source}.pagination")
+            return bool(self._wait_for_results())
+        except NoSuchElementException:
+            return False
+
+    def _submit_search(self, keyword):
+        """Arama formunu doldurup gönderir ve sonuç satırlarını bekler"""
+        self.driver.get(self.base_url)
+        self.waiter.document_ready(f"{self.source}.form")
+        search_input = self._wait_for_element(By.ID, "arananDetail")
+        if not search_input:
+            raise RuntimeError("Arama kutusu bulunamadı")
+        search_input.clear()
+        search_input.send_keys(keyword)
+        search_button = self._wait_for_clickable(By.XPATH, "//button[contains(text(), 'Ara')]")
+        if search_button:
+            search_button.click()
+        else:
+            search_input.send_keys(Keys.RETURN)
+        self._wait_for_results()
+
+    def iter_result_pages(self, keyword, start_page=1, end_page=1):
+        """
+        Sonuç sayfalarını tek tek (sayfa_no, kararlar) olarak verir.
+
+        start_page'e kadar olan sayfalar okunmadan geçilir; son sayfaya
+        gelindiğinde end_page'den önce de durur. Hatalar çağırana iletilir
+        (search_decisions'tan farklı olarak boş liste dönülmez).
+        """
+        self._setup_driver()
+        try:
+            self._submit_search(keyword)
+            page = 1
+            while page < start_page:
+                if not self._go_to_next_page():
+                    return
+                page += 1
+            while True:
+                # None: sayfadaki tüm satırlar
+                yield page, self._extract_page_results(None)
+                if page >= end_page or not self._go_to_next_page():
+                    return
+                page += 1
+        finally:
+            self._release_driver()
+
     def _wait_for_element(self, by, value, timeout=10):
         """Elementin yüklenmesini bekler"""
         try:
@@ -72,6 +157,8 @@ class SeleniumScraper:
             return None
 
 class UYAPScraper(SeleniumScraper):
+    source = "uyap"
+    
     def __init__(self, headless=True):
         super().__init__(headless)
         self.base_url = "https://emsal.uyap.gov.tr/"
@@ -88,12 +175,16 @@ class UYAPScraper(SeleniumScraper):
         """
         self.logger.info(f"UYAP karar arama başlatılıyor: {keyword}")
         
+        results = self._search_via_json(keyword, limit)
+        if results is not None:
+            return results
+        
         try:
             self._setup_driver()
             self.driver.get(self.base_url)
             
             # Sayfa yüklenmesini bekle
-            time.sleep(3)
+            self.waiter.document_ready(f"{self.source}.form")
             
             # Arama kutusunu bul
             search_input = self._wait_for_element(By.ID, "arananDetail")
@@ -113,8 +204,8 @@ class UYAPScraper(SeleniumScraper):
                 # Enter tuşu ile arama yap
                 search_input.send_keys(Keys.RETURN)
             
-            # Sonuçların yüklenmesini bekle
-            time.sleep(5)
+            # Sonuç tablosu satırları gelene kadar bekle
+            self._wait_for_results()
             
             # Sonuçları topla
             results = self._collect_search_results(limit)
@@ -124,8 +215,7 @@ class UYAPScraper(SeleniumScraper):
             self.logger.error(f"Arama sırasında hata: {e}")
             return []
         finally:
-            if self.driver:
-                self.driver.quit()
+            self._release_driver()
     
     def _collect_search_results(self, limit):
         """Arama sonuçlarını toplar"""
@@ -154,7 +244,6 @@ class UYAPScraper(SeleniumScraper):
                     if not self._go_to_next_page():
                         break
                     page_count += 1
-                    time.sleep(2)
                 else:
                     break
             
@@ -186,9 +275,8 @@ class UYAPScraper(SeleniumScraper):
                             'karar_durumu': cells[4].text.strip()
                         }
                         
-                        # Satıra tıkla ve detayları al
-                        row.click()
-                        time.sleep(1)  # Detayların yüklenmesini bekle
+                        # Satıra tıkla ve detayların yüklenmesini bekle
+                        self._open_decision(row)
                         
                         detail_data = self._extract_decision_detail()
                         if detail_data:
@@ -243,18 +331,6 @@ class UYAPScraper(SeleniumScraper):
             self.logger.warning(f"Karar detayları çıkarılamadı: {e}")
             return detail_data
     
-    def _go_to_next_page(self):
-        """Sonraki sayfaya geçer"""
-        try:
-            # Sonraki sayfa butonunu bul
-            next_button = self.driver.find_element(By.CSS_SELECTOR, "a[title='Sonraki sayfa']")
-            if next_button and next_button.is_enabled():
-                next_button.click()
-                return True
-            return False
-        except NoSuchElementException:
-            return False
-    
     def save_to_excel(self, results, filename=None):
         """Sonuçları Excel dosyasına kaydeder"""
         if not filename:
@@ -268,6 +344,8 @@ class UYAPScraper(SeleniumScraper):
             self.logger.error(f"Excel kaydetme hatası: {e}")
 
 class YargitayScraper(SeleniumScraper):
+    source = "yargitay"
+    
     def __init__(self, headless=True):
         super().__init__(headless)
         self.base_url = "https://karararama.yargitay.gov.tr/"
@@ -285,12 +363,18 @@ class YargitayScraper(SeleniumScraper):
         """
         self.logger.info(f"Yargıtay karar arama başlatılıyor: {keyword}")
         
+        # Daire filtresi yalnızca tarayıcı formunda destekleniyor
+        if not department:
+            results = self._search_via_json(keyword, limit)
+            if results is not None:
+                return results
+        
         try:
             self._setup_driver()
             self.driver.get(self.base_url)
             
             # Sayfa yüklenmesini bekle
-            time.sleep(3)
+            self.waiter.document_ready(f"{self.source}.form")
             
             # Arama kutusunu bul
             search_input = self._wait_for_element(By.ID, "arananDetail")
@@ -313,8 +397,8 @@ class YargitayScraper(SeleniumScraper):
             else:
                 search_input.send_keys(Keys.RETURN)
             
-            # Sonuçların yüklenmesini bekle
-            time.sleep(5)
+            # Sonuç tablosu satırları gelene kadar bekle
+            self._wait_for_results()
             
             # Sonuçları topla
             results = self._collect_search_results(limit)
@@ -324,8 +408,7 @@ class YargitayScraper(SeleniumScraper):
             self.logger.error(f"Arama sırasında hata: {e}")
             return []
         finally:
-            if self.driver:
-                self.driver.quit()
+            self._release_driver()
     
     def _select_department(self, department):
         """Daire seçimi yapar"""
@@ -370,7 +453,6 @@ class YargitayScraper(SeleniumScraper):
                     if not self._go_to_next_page():
                         break
                     page_count += 1
-                    time.sleep(2)
                 else:
                     break
             
@@ -402,9 +484,8 @@ class YargitayScraper(SeleniumScraper):
                             'tarih': cells[4].text.strip()
                         }
                         
-                        # Satıra tıkla ve detayları al
-                        row.click()
-                        time.sleep(1)
+                        # Satıra tıkla ve detayların yüklenmesini bekle
+                        self._open_decision(row)
                         
                         detail_data = self._extract_decision_detail()
                         if detail_data:
@@ -444,17 +525,6 @@ class YargitayScraper(SeleniumScraper):
             self.logger.warning(f"Karar detayları çıkarılamadı: {e}")
             return detail_data
     
-    def _go_to_next_page(self):
-        """Sonraki sayfaya geçer"""
-        try:
-            next_button = self.driver.find_element(By.CSS_SELECTOR, "a[title='Sonraki sayfa']")
-            if next_button and next_button.is_enabled():
-                next_button.click()
-                return True
-            return False
-        except NoSuchElementException:
-            return False
-    
     def save_to_excel(self, results, filename=None):
         """Sonuçları Excel dosyasına kaydeder"""
         if not filename:
@@ -11,9 +11,19 @@ import time
 from datetime import datetime
 import pandas as pd
 import json
+import sys
+
+# Panel/webdriver_pool.py, Panel/selenium_waits.py: warm Chrome sessions and DOM waits shared by the search threads
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from webdriver_pool import is_dead_session_error, webdriver_pool
+from selenium_waits import DomWaiter, wait_telemetry
+from court_json_client import CourtJsonError, collect_decisions
 
 app = Flask(__name__)
 
+# UYAP sonuç tablosu satırları (sayfa geçişi ve sonuç beklemesi için)
+RESULT_ROWS_SELECTOR = "#detayAramaSonuclar tr, table[id*='sonuc'] tr"
+
 # Global değişkenler
 search_status = {
     'is_running': False,
@@ -94,6 +104,16 @@ def get_status():
     """Durum bilgisi al"""
     return jsonify(search_status)
 
+@app.route('/api/webdriver_pool')
+def get_webdriver_pool_stats():
+    """WebDriver havuzu kullanım metrikleri"""
+    return jsonify(webdriver_pool.stats())
+
+@app.route('/api/selenium_waits')
+def get_selenium_wait_stats():
+    """DOM beklemelerinin süre metrikleri"""
+    return jsonify(wait_telemetry.stats())
+
 @app.route('/api/clear_results', methods=['POST'])
 def clear_results():
     """Sonuçları temizle"""
@@ -187,33 +207,55 @@ def run_search_thread(keyword, limit, system, headless):
     finally:
         search_status['is_running'] = False
 
+def run_json_search(site, keyword, max_pages, headless, start_page=1, limit=None):
+    """Sitenin JSON uç noktalarıyla arama: tarayıcı yalnızca çerez için açılır, karar metinleri eşzamanlı çekilir"""
+    def on_page(page, decisions, total):
+        search_status['total_results'] = total
+        search_status['current_page'] = page
+        search_status['results'].extend(decisions)
+        for decision in decisions:
+            search_status['current_decision'] += 1
+            detail = f"{len(decision['karar_metni'])} karakter" if decision.get('karar_metni') else "detay alınamadı"
+            log_message(f"  {search_status['current_decision']}. karar çekildi: {decision['esas_no']} - {decision['karar_no']} ({detail})")
+        log_message(f"Sayfa {page} tamamlandı: {len(decisions)} sonuç (toplam {total:,})")
+        return search_status['is_running']
+
+    def on_page_failed(page, error):
+        log_message(f"[HATA] Sayfa {page} alınamadı: {error}")
+    
+    return collect_decisions(site, keyword, max_pages, start_page=start_page, limit=limit,
+                             headless=headless, on_page=on_page, on_page_failed=on_page_failed)
+
 def run_uyap_search(keyword, limit, headless):
     """UYAP arama fonksiyonu - Sayfalama ile geliştirilmiş versiyon"""
+    # Önce doğrudan JSON uç noktaları; site JSON vermezse tarayıcıyla satır satır devam edilir
+    current_last_page = len(search_status.get('results', [])) // 10
+    try:
+        # İlk arama 10 sayfa, devam araması 'limit' sayfa çeker
+        run_json_search("uyap", keyword, limit if current_last_page else 10, headless,
+                        start_page=current_last_page + 1)
+        log_message(f"Toplam {len(search_status['results'])} karar çekildi")
+        return search_status['results']
+    except CourtJsonError as e:
+        log_message(f"JSON uç noktası kullanılamadı, tarayıcıyla devam ediliyor: {e}")
+    except Exception as e:
+        log_message(f"UYAP arama hatası: {e}")
+        return []
+    
+    driver = None
     try:
-        from selenium import webdriver
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.chrome.options import Options
         from selenium.common.exceptions import TimeoutException, NoSuchElementException
-        import time
         import re
         
-        # Chrome seçenekleri
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get("https://emsal.uyap.gov.tr/")
+        # Havuzdan sıcak bir tarayıcı oturumu al (arama formuna gitmiş olarak)
+        driver = webdriver_pool.acquire(headless, start_url="https://emsal.uyap.gov.tr/")
+        waiter = DomWaiter(driver)
         
         # Sayfa yüklenmesini bekle
-        time.sleep(3)
+        waiter.document_ready("uyap.form")
         
         # Arama kutusunu bul (farklı seçiciler dene)
         search_input = None
@@ -235,13 +277,12 @@ def run_uyap_search(keyword, limit, headless):
         
         if not search_input:
             log_message("Arama kutusu bulunamadı")
-            driver.quit()
+            webdriver_pool.release(driver)
             return []
         
         # Arama yap
         search_input.clear()
         search_input.send_keys(keyword)
-        time.sleep(1)
         
         # Arama butonunu bul ve tıkla
         search_button = None
@@ -269,8 +310,8 @@ def run_uyap_search(keyword, limit, headless):
             from selenium.webdriver.common.keys import Keys
             search_input.send_keys(Keys.RETURN)
         
-        # Sonuçların yüklenmesini bekle
-        time.sleep(5)
+        # Sonuç tablosu satırları gelene kadar bekle
+        waiter.rows(RESULT_ROWS_SELECTOR, min_rows=2, name="uyap.results")
         
         # Toplam sonuç sayısını al
         total_results = 0
@@ -314,9 +355,6 @@ def run_uyap_search(keyword, limit, headless):
             search_status['current_page'] = page
             log_message(f"Sayfa {page}/{max_pages} işleniyor...")
             
-            # Sayfa yüklenmesini bekle
-            time.sleep(2)
-            
             # Sonuç tablosunu kontrol et - her seferinde yeniden bul
             result_table = None
             table_selectors = [
@@ -377,10 +415,11 @@ def run_uyap_search(keyword, limit, headless):
                             try:
                                 # Satırı görünür hale getir
                                 driver.execute_script("arguments[0].scrollIntoView(true);", row)
-                                time.sleep(0.5)
                                 
+                                previous_text = waiter.text_of("#kararAlani")
                                 row.click()
-                                time.sleep(2)  # Detayların yüklenmesini bekle
+                                # Detay alanının yeni kararla dolmasını bekle
+                                waiter.text_changed("#kararAlani", previous_text, name="uyap.detail")
                                 
                                 # Karar detay alanını bul
                                 detail_selectors = [
@@ -446,8 +485,12 @@ def run_uyap_search(keyword, limit, headless):
                     # Sonraki sayfa butonunu bul
                     next_button = driver.find_element(By.CSS_SELECTOR, "a[title='Sonraki sayfa'], .pagination .next, .page-next")
                     if next_button and next_button.is_enabled():
+                        # Eski sayfanın ilk satırı DOM'dan düşünce yeni sayfa gelmiştir
+                        first_rows = driver.find_elements(By.CSS_SELECTOR, RESULT_ROWS_SELECTOR)
                         next_button.click()
-                        time.sleep(3)  # Sayfa yüklenmesini bekle
+                        if len(first_rows) > 1:
+                            waiter.stale(first_rows[1], name="uyap.pagination")
+                        waiter.rows(RESULT_ROWS_SELECTOR, min_rows=2, name="uyap.results")
                     else:
                         log_message("Sonraki sayfa butonu bulunamadı veya devre dışı")
                         break
@@ -466,42 +509,45 @@ def run_uyap_search(keyword, limit, headless):
             log_message(f"Daha fazla sonuç mevcut: {total_results - len(search_status['results'])} karar")
             log_message("İsteğe bağlı olarak daha fazla sonuç çekilebilir")
         
-        driver.quit()
+        webdriver_pool.release(driver)
         return search_status['results']
         
     except Exception as e:
         log_message(f"UYAP arama hatası: {e}")
         # Target frame detached hatası durumunda resume noktasını kaydet
-        if "target frame detached" in str(e).lower() or "invalid session" in str(e).lower():
+        dead_session = is_dead_session_error(e)
+        if dead_session:
             search_status['resume_from'] = search_status.get('current_page', 1)
             log_message(f"Tarayıcı bağlantısı koptu! Kaldığınız yer: Sayfa {search_status['resume_from']}")
-        try:
-            driver.quit()
-        except:
-            pass
+        if driver is not None:
+            # Kopmuş oturum havuza geri dönmez, yenisiyle değiştirilir
+            webdriver_pool.release(driver, discard=dead_session)
         return []
 
 def run_yargitay_search(keyword, limit, headless):
     """Yargıtay arama fonksiyonu"""
+    # Önce doğrudan JSON uç noktaları; site JSON vermezse tarayıcıyla satır satır devam edilir
+    try:
+        already = len(search_status['results'])
+        run_json_search("yargitay", keyword, limit // 10 + 1, headless, limit=limit)
+        return search_status['results'][already:]
+    except CourtJsonError as e:
+        # Tarayıcı araması baştan başlar: yarım kalan JSON sonuçları tekrarlanmasın
+        del search_status['results'][already:]
+        log_message(f"JSON uç noktası kullanılamadı, tarayıcıyla devam ediliyor: {e}")
+    except Exception as e:
+        log_message(f"Yargıtay arama hatası: {e}")
+        return []
+    
+    driver = None
     try:
-        from selenium import webdriver
         from selenium.webdriver.common.by import By
         from selenium.webdriver.support.ui import WebDriverWait
         from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.chrome.options import Options
-        import time
-        
-        # Chrome seçenekleri
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
         
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get("https://karararama.yargitay.gov.tr/")
+        # Havuzdan sıcak bir tarayıcı oturumu al (arama formuna gitmiş olarak)
+        driver = webdriver_pool.acquire(headless, start_url="https://karararama.yargitay.gov.tr/")
+        waiter = DomWaiter(driver)
         
         # Arama kutusunu bul
         search_input = WebDriverWait(driver, 10).until(
@@ -516,8 +562,8 @@ def run_yargitay_search(keyword, limit, headless):
         search_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Ara')]")
         search_button.click()
         
-        # Sonuçların yüklenmesini bekle
-        time.sleep(5)
+        # Sonuç tablosu satırları gelene kadar bekle
+        waiter.rows("#detayAramaSonuclar tr", min_rows=2, name="yargitay.results")
         
         # Sonuç tablosunu kontrol et
         result_table = WebDriverWait(driver, 10).until(
@@ -546,8 +592,10 @@ def run_yargitay_search(keyword, limit, headless):
                     
                     # Satıra tıkla ve karar detaylarını al
                     try:
+                        previous_text = waiter.text_of("#kararAlani")
                         row.click()
-                        time.sleep(2)  # Detayların yüklenmesini bekle
+                        # Detay alanının yeni kararla dolmasını bekle
+                        waiter.text_changed("#kararAlani", previous_text, name="yargitay.detail")
                         
                         # Karar detay alanını bul
                         detail_area = driver.find_element(By.CSS_SELECTOR, "#kararAlani .card-scroll")
@@ -578,11 +626,13 @@ def run_yargitay_search(keyword, limit, headless):
             log_message(f"Toplam {total_results} sonuç bulundu, {limit} sonuç işlendi")
             log_message("Daha fazla sonuç için sayfalama özelliği kullanılabilir")
         
-        driver.quit()
+        webdriver_pool.release(driver)
         return results
         
     except Exception as e:
         log_message(f"Yargıtay arama hatası: {e}")
+        if driver is not None:
+            webdriver_pool.release(driver, discard=is_dead_session_error(e))
         return []
 
 @app.route('/api/continue_search', methods=['POST'])
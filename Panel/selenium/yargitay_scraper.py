@@ -14,6 +14,12 @@ from datetime import datetime
 import logging
 from urllib.parse import urljoin, urlparse
 import re
+import os
+import sys
+
+# Panel/rate_limiter.py: host-level limit shared with the backend proxies and clients
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rate_limiter import rate_limits
 
 class YargitayScraper:
     def __init__(self):
@@ -34,17 +40,12 @@ class YargitayScraper:
         )
         self.logger = logging.getLogger(__name__)
         
-        # Rate limiting için
-        self.request_delay = 3  # saniye (Yargıtay için daha uzun)
-        self.last_request_time = 0
+        # Rate limiting için: host başına paylaşılan token bucket (429/Retry-After ile uyarlanır)
+        self.session.hooks["response"].append(rate_limits.requests_hook)
         
     def _rate_limit(self):
-        """İstekler arasında bekleme süresi ekler"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.request_delay:
-            time.sleep(self.request_delay - time_since_last)
-        self.last_request_time = time.time()
+        """Host için bir istek hakkı bekler (sabit gecikme yerine token bucket)"""
+        rate_limits.acquire_blocking(self.base_url)
     
     def search_decisions(self, keyword="", department="", date_from="", date_to="", 
                         case_number="", decision_number="", limit=100):
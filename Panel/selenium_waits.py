@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Explicit DOM waits for the Selenium scrapers.
+
+The scrapers used to sleep a fixed 1-5s after every navigation, search,
+page change and row click. DomWaiter polls for the condition that actually
+signals "ready" instead and returns as soon as it holds:
+
+    waiter = DomWaiter(driver)
+    waiter.rows("#detayAramaSonuclar tbody tr", name="uyap.results")
+    before = waiter.text_of("#kararAlani")
+    row.click()
+    waiter.text_changed("#kararAlani", before, name="uyap.detail")
+
+- each wait has a ceiling per kind (page / results / detail / pagination),
+  configurable with SELENIUM_WAIT_<KIND> seconds; a wait that hits its
+  ceiling returns None/False instead of raising, like the old sleeps
+- stale-element / not-found errors while polling mean "not yet"; a dead
+  browser session is re-raised so the pool can replace it
+- every wait is timed into wait_telemetry (count, timeouts, avg/max ms)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from webdriver_pool import is_dead_session_error
+
+logger = logging.getLogger(__name__)
+
+WAIT_CEILINGS: Dict[str, float] = {
+    "page": float(os.getenv("SELENIUM_WAIT_PAGE", "15")),
+    "results": float(os.getenv("SELENIUM_WAIT_RESULTS", "20")),
+    "detail": float(os.getenv("SELENIUM_WAIT_DETAIL", "10")),
+    "pagination": float(os.getenv("SELENIUM_WAIT_PAGINATION", "15")),
+}
+POLL_INTERVAL = float(os.getenv("SELENIUM_WAIT_POLL", "0.1"))
+
+_CSS = "css selector"  # selenium By.CSS_SELECTOR
+
+
+class WaitTelemetry:
+    """Per-wait timing counters, shared by all scraping threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, seconds: float, ok: bool):
+        with self._lock:
+            entry = self._waits.setdefault(name, {"count": 0, "timeouts": 0, "total": 0.0, "max": 0.0})
+            entry["count"] += 1
+            entry["total"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            if not ok:
+                entry["timeouts"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "count": int(entry["count"]),
+                    "timeouts": int(entry["timeouts"]),
+                    "avg_ms": round(entry["total"] / entry["count"] * 1000, 1),
+                    "max_ms": round(entry["max"] * 1000, 1),
+                    "total_s": round(entry["total"], 2),
+                }
+                for name, entry in self._waits.items()
+            }
+
+
+wait_telemetry = WaitTelemetry()
+
+
+class DomWaiter:
+    def __init__(self, driver: Any, ceilings: Optional[Dict[str, float]] = None,
+                 poll: float = POLL_INTERVAL, telemetry: WaitTelemetry = wait_telemetry):
+        self.driver = driver
+        self.ceilings = {**WAIT_CEILINGS, **(ceilings or {})}
+        self.poll = poll
+        self.telemetry = telemetry
+
+    def until(self, name: str, condition: Callable[[Any], Any], kind: str = "page",
+              timeout: Optional[float] = None) -> Any:
+        """Poll `condition(driver)` until truthy; its value, or None at the ceiling"""
+        ceiling = timeout if timeout is not None else self.ceilings[kind]
+        started = time.monotonic()
+        deadline = started + ceiling
+        last_error = None
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    self.telemetry.record(name, time.monotonic() - started, True)
+                    return value
+            except Exception as e:
+                if is_dead_session_error(e):
+                    raise
+                last_error = e
+            if time.monotonic() >= deadline:
+                self.telemetry.record(name, time.monotonic() - started, False)
+                logger.warning(f"Wait '{name}' hit its {ceiling:.1f}s ceiling" + (f" (last error: {last_error})" if last_error else ""))
+                return None
+            time.sleep(self.poll)
+
+    # ------------------------------------------------------------------
+    # Conditions
+    # ------------------------------------------------------------------
+
+    def document_ready(self, name: str = "document_ready") -> bool:
+        return bool(self.until(name, lambda d: d.execute_script("return document.readyState") == "complete"))
+
+    def element(self, css: str, name: Optional[str] = None, kind: str = "page") -> Any:
+        """First element matching `css` once it is present"""
+        return self.until(name or css, lambda d: (d.find_elements(_CSS, css) or [None])[0], kind)
+
+    def rows(self, css: str, min_rows: int = 1, name: Optional[str] = None, kind: str = "results") -> List[Any]:
+        """Rows matching `css` once at least `min_rows` are rendered (empty list at the ceiling)"""
+        def rendered(d):
+            found = d.find_elements(_CSS, css)
+            return found if len(found) >= min_rows else None
+        return self.until(name or css, rendered, kind) or []
+
+    def stale(self, element: Any, name: str = "stale", kind: str = "pagination") -> bool:
+        """True once `element` is detached from the DOM (the page/table was re-rendered)"""
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        def detached(_):
+            try:
+                element.is_enabled()
+                return False
+            except StaleElementReferenceException:
+                return True
+        return bool(self.until(name, detached, kind))
+
+    def text_of(self, css: str) -> str:
+        """Current text of the first `css` match, '' when absent"""
+        try:
+            found = self.driver.find_elements(_CSS, css)
+            return found[0].text.strip() if found else ""
+        except Exception as e:
+            if is_dead_session_error(e):
+                raise
+            return ""
+
+    def text_changed(self, css: str, previous: str, name: Optional[str] = None, kind: str = "detail") -> Optional[str]:
+        """New non-empty text of `css` once it differs from `previous`"""
+        def changed(_):
+            text = self.text_of(css)
+            return text if text and text != previous else None
+        return self.until(name or css, changed, kind)
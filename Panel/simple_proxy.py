@@ -4,10 +4,16 @@ from pydantic import BaseModel
 import httpx
 import re
 import asyncio
-from playwright.async_api import async_playwright
+from contextlib import asynccontextmanager
 import uvicorn
+from browser_pool import BrowserPoolTimeout, browser_pool
 
-app = FastAPI(title="Yargıtay Proxy Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await browser_pool.stop()
+
+app = FastAPI(title="Yargıtay Proxy Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,22 +32,16 @@ class ProxyRequest(BaseModel):
 
 async def fetch_with_playwright(url: str, query: str, page: int) -> str:
     """Playwright ile headless tarayıcı kullanarak HTML al"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page_obj = await browser.new_page()
+    async with browser_pool.lease() as page_obj:
+        await page_obj.goto(url, wait_until="domcontentloaded")
         
-        try:
-            await page_obj.goto(url, wait_until="domcontentloaded")
-            
-            # Arama formunu doldur
-            await page_obj.fill('input[name="q"]', query)
-            await page_obj.click('button:has-text("Ara")')
-            
-            await page_obj.wait_for_load_state("networkidle")
-            content = await page_obj.content()
-            return content
-        finally:
-            await browser.close()
+        # Arama formunu doldur
+        await page_obj.fill('input[name="q"]', query)
+        await page_obj.click('button:has-text("Ara")')
+        
+        await page_obj.wait_for_load_state("networkidle")
+        content = await page_obj.content()
+        return content
 
 @app.post("/api/proxy/yargitay_html")
 async def proxy_yargitay_html(req: ProxyRequest):
@@ -69,12 +69,14 @@ async def proxy_yargitay_html(req: ProxyRequest):
             html_content = await fetch_with_playwright(target_url, req.query, req.page)
             return {"success": True, "html": html_content}
             
+    except BrowserPoolTimeout as e:
+        raise HTTPException(status_code=503, detail=f"Tarayıcı havuzu dolu, lütfen tekrar deneyin: {str(e)}", headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Proxy hatası: {str(e)}")
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "message": "Proxy backend çalışıyor"}
+    return {"status": "ok", "message": "Proxy backend çalışıyor", "browser_pool": browser_pool.stats()}
 
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=9000)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Per-tool circuit breakers for the production backend.
+
+Each breaker is a closed/open/half-open state machine:
+- CLOSED: calls pass; outcomes go into a rolling time window. The circuit opens
+  when the window error rate crosses the threshold (after a minimum number of
+  calls) or after N consecutive failures.
+- OPEN: calls are rejected immediately until the cool-down elapses.
+- HALF_OPEN: a limited number of probe calls are let through; enough successes
+  close the circuit, any failure re-opens it.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited by an open breaker"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open (retry after {retry_after:.0f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, window_seconds: float = 60.0, min_calls: int = 5,
+                 error_rate_threshold: float = 0.5, consecutive_failure_threshold: int = 3,
+                 open_seconds: float = 30.0, half_open_max_calls: int = 1,
+                 half_open_success_threshold: int = 2):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.consecutive_failure_threshold = consecutive_failure_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.half_open_success_threshold = half_open_success_threshold
+
+        self.state = self.CLOSED
+        self._lock = threading.Lock()
+        self._window: Deque[Tuple[float, bool]] = deque(maxlen=1000)
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_inflight = 0
+        self._half_open_successes = 0
+
+        self.rejected_calls = 0
+        self.times_opened = 0
+        self.last_failure_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # State machine
+    # ------------------------------------------------------------------
+
+    def allow(self) -> bool:
+        """Whether a call may proceed; every allowed call must be followed by record_*()"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected_calls += 1
+                    return False
+                self._transition(self.HALF_OPEN)
+
+            if self.state == self.HALF_OPEN:
+                if self._half_open_inflight >= self.half_open_max_calls:
+                    self.rejected_calls += 1
+                    return False
+                self._half_open_inflight += 1
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._record(True)
+            self._consecutive_failures = 0
+            if self.state == self.HALF_OPEN:
+                self._half_open_inflight = max(0, self._half_open_inflight - 1)
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.half_open_success_threshold:
+                    self._transition(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._record(False)
+            self._consecutive_failures += 1
+            self.last_failure_at = time.time()
+            if self.state == self.HALF_OPEN:
+                self._half_open_inflight = max(0, self._half_open_inflight - 1)
+                self._transition(self.OPEN)
+            elif self.state == self.CLOSED and self._should_trip():
+                self._transition(self.OPEN)
+
+    def is_open(self) -> bool:
+        """Cheap pre-check: True while OPEN and still cooling down (counts as a rejected call)"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected_calls += 1
+                return True
+            return False
+
+    def release(self):
+        """Give back an allowed call that finished without a verdict (e.g. cancelled)"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._half_open_inflight = max(0, self._half_open_inflight - 1)
+
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def _record(self, ok: bool):
+        now = time.monotonic()
+        self._window.append((now, ok))
+        self._trim(now)
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._window and self._window[0][0] < cutoff:
+            self._window.popleft()
+
+    def _error_rate(self) -> Tuple[int, float]:
+        calls = len(self._window)
+        if not calls:
+            return 0, 0.0
+        failures = sum(1 for _, ok in self._window if not ok)
+        return calls, failures / calls
+
+    def _should_trip(self) -> bool:
+        if self._consecutive_failures >= self.consecutive_failure_threshold:
+            return True
+        calls, error_rate = self._error_rate()
+        return calls >= self.min_calls and error_rate >= self.error_rate_threshold
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        logger.warning(f"Circuit '{self.name}': {self.state} -> {state}")
+        self.state = state
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        elif state == self.HALF_OPEN:
+            self._half_open_inflight = 0
+            self._half_open_successes = 0
+        elif state == self.CLOSED:
+            self._window.clear()
+            self._consecutive_failures = 0
+
+    # ------------------------------------------------------------------
+    # Context manager for endpoint handlers
+    # ------------------------------------------------------------------
+
+    def protection(self) -> "_BreakerGuard":
+        return _BreakerGuard(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(time.monotonic())
+            calls, error_rate = self._error_rate()
+            return {
+                "state": self.state,
+                "window_calls": calls,
+                "window_error_rate": round(error_rate, 4),
+                "consecutive_failures": self._consecutive_failures,
+                "retry_after_seconds": round(self.retry_after(), 1),
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected_calls,
+                "last_failure_at": self.last_failure_at,
+            }
+
+
+class _BreakerGuard:
+    """
+    `async with breaker.protection() as guard:` raises CircuitOpenError when the
+    circuit is open. Handlers that catch their own errors call guard.mark_failure().
+    """
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self.failed = False
+
+    def mark_failure(self):
+        self.failed = True
+
+    async def __aenter__(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.breaker.name, self.breaker.retry_after())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None and issubclass(exc_type, asyncio.CancelledError):
+            # Client went away - not an upstream outcome, just release a half-open slot
+            self.breaker.release()
+        elif exc_type is not None or self.failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return False  # Don't suppress exceptions
+
+
+class CircuitBreakerRegistry:
+    """Lazily creates one breaker per name with shared settings"""
+
+    def __init__(self, **breaker_settings: Any):
+        self.breaker_settings = breaker_settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    breaker = self._breakers[name] = CircuitBreaker(name, **self.breaker_settings)
+        return breaker
+
+    def protection(self, name: str) -> _BreakerGuard:
+        return self.get(name).protection()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: breaker.snapshot() for name, breaker in list(self._breakers.items())}
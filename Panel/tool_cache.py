@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+In-process cache engine for the production backend.
+
+BoundedTTLCache is a drop-in replacement for the old SimpleCache (same
+get/setex interface) with an entry and memory budget, LRU eviction, a
+background TTL sweeper and hit/miss/eviction counters. Values are copied on
+the way in and out, so a caller editing its result never changes what later
+hits (or other coalesced callers) receive.
+
+RecentResultsIndex keeps the last few good results per tool so fallback
+responses can be served in O(1) without scanning the cache keyspace.
+
+TieredCache puts the in-process cache in front of an optional async Redis
+client: Redis I/O is pipelined and bounded by a timeout budget, and a slow or
+failing Redis is skipped for a cooldown instead of stalling requests. Both
+tiers keep each entry's write time, so get_entry reports its real age
+whatever TTL it was stored with.
+
+SingleFlight coalesces concurrent identical cache misses into one in-flight
+call; every waiter gets its own copy of the result.
+
+CacheKeyBuilder turns tool arguments into compact canonical keys (Turkish
+case folding, whitespace collapsing, default-valued fields dropped) and keeps
+hit-rate counters per query shape. Endpoints that reuse another endpoint's
+tool pass a scope, so their entries never mix with the tool's own.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rough per-entry bookkeeping overhead (entry object, OrderedDict node, key object)
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory footprint of a cached payload in bytes"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", errors="ignore"))
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8", errors="ignore"))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class _CacheEntry:
+    __slots__ = ("value", "expires_at", "size", "stored_at")
+
+    def __init__(self, value: Any, expires_at: float, size: int, stored_at: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.stored_at = stored_at
+
+
+class BoundedTTLCache:
+    """Thread-safe LRU cache with per-key TTL and an entry/byte budget"""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 sweep_interval: float = 60.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+
+        self._data: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Redis-compatible subset used by ToolExecutionIsolator
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Any:
+        return self.get_with_ttl(key)[0]
+
+    def get_with_ttl(self, key: str) -> Tuple[Any, float]:
+        """(value, remaining TTL in seconds); (None, 0.0) on miss"""
+        value, remaining, _ = self.get_entry(key)
+        return value, remaining
+
+    def get_entry(self, key: str) -> Tuple[Any, float, float]:
+        """(value, remaining TTL, age) in seconds; (None, 0.0, 0.0) on miss"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, 0.0, 0.0
+            now = time.time()
+            remaining = entry.expires_at - now
+            if remaining <= 0:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None, 0.0, 0.0
+            self._data.move_to_end(key)
+            self.hits += 1
+            value, age = entry.value, now - entry.stored_at
+        return copy.deepcopy(value), remaining, age
+
+    def setex(self, key: str, ttl: float, value: Any, stored_at: Optional[float] = None) -> bool:
+        """`stored_at` keeps the original write time of an entry copied from another tier"""
+        size = estimate_size(value) + len(key) + _ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            # A single payload larger than the whole budget would flush everything
+            with self._lock:
+                self.rejected += 1
+            logger.warning(f"Cache entry {key[:80]} too large ({size} bytes) - not cached")
+            return False
+
+        value = copy.deepcopy(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            now = time.time()
+            self._data[key] = _CacheEntry(value, now + ttl, size, now if stored_at is None else stored_at)
+            self._bytes += size
+            self._evict_to_budget()
+        self._ensure_sweeper()
+        return True
+
+    def delete(self, key: str) -> int:
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+                return 1
+            return 0
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ------------------------------------------------------------------
+    # Eviction and TTL sweeping
+    # ------------------------------------------------------------------
+
+    def _remove(self, key: str):
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+
+    def _evict_to_budget(self):
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            key, entry = self._data.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def sweep_expired(self) -> int:
+        """Drop every expired entry; returns the number removed"""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self._data.items() if entry.expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def _ensure_sweeper(self):
+        if self.sweep_interval <= 0 or (self._sweeper is not None and self._sweeper.is_alive()):
+            return
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._stop_event.clear()
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="cache-ttl-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                removed = self.sweep_expired()
+                if removed:
+                    logger.debug(f"Cache sweeper removed {removed} expired entries")
+            except Exception as e:
+                logger.error(f"Cache sweeper error: {e}")
+
+    def stop(self):
+        """Stop the background sweeper (called on application shutdown)"""
+        self._stop_event.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
+            self._sweeper = None
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejected": self.rejected,
+            }
+
+
+class RecentResultsIndex:
+    """Per-tool ring buffer of the most recent good results"""
+
+    def __init__(self, capacity: int = 5):
+        self.capacity = capacity
+        self._buffers: Dict[str, Deque[Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool_name: str, result: Any):
+        with self._lock:
+            buffer = self._buffers.get(tool_name)
+            if buffer is None:
+                buffer = self._buffers[tool_name] = deque(maxlen=self.capacity)
+            buffer.appendleft(copy.deepcopy(result))
+
+    def latest(self, tool_name: str, limit: int = 3, accept: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """Newest-first results for a tool, at most `limit` (only those passing `accept`)"""
+        with self._lock:
+            buffer = list(self._buffers.get(tool_name) or ())
+        if accept is not None:
+            buffer = [result for result in buffer if accept(result)]
+        return copy.deepcopy(buffer[:limit])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {tool_name: len(buffer) for tool_name, buffer in self._buffers.items()}
+
+
+class TieredCache:
+    """Async two-tier cache: BoundedTTLCache (L1) in front of an optional async Redis (L2)"""
+
+    def __init__(self, memory: BoundedTTLCache, redis_client=None, timeout: float = 0.1,
+                 degrade_seconds: float = 30.0, recent_capacity: int = 5, recent_ttl: int = 24 * 3600):
+        self.memory = memory
+        self.redis = redis_client
+        self.timeout = timeout
+        self.degrade_seconds = degrade_seconds
+        self.recent = RecentResultsIndex(capacity=recent_capacity)
+        self.recent_capacity = recent_capacity
+        self.recent_ttl = recent_ttl
+
+        self._degraded_until = 0.0
+        self.redis_hits = 0
+        self.redis_timeouts = 0
+        self.redis_errors = 0
+
+    @property
+    def redis_available(self) -> bool:
+        return self.redis is not None and time.monotonic() >= self._degraded_until
+
+    def _degrade(self, operation: str, reason: Any):
+        self._degraded_until = time.monotonic() + self.degrade_seconds
+        logger.warning(f"Redis {operation} failed ({reason}) - using in-memory tier for {self.degrade_seconds:.0f}s")
+
+    async def _redis_call(self, operation: str, call):
+        """Run `call()` against Redis within the timeout budget; None if skipped or failed"""
+        if not self.redis_available:
+            return None
+        try:
+            return await asyncio.wait_for(call(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.redis_timeouts += 1
+            self._degrade(operation, f"timeout > {self.timeout * 1000:.0f}ms")
+        except Exception as e:
+            self.redis_errors += 1
+            self._degrade(operation, e)
+        return None
+
+    async def _redis_get_with_ttl(self, keys: List[str]):
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+            pipe.pttl(key)
+        return await pipe.execute()
+
+    def _promote(self, key: str, raw: Any, pttl: Any) -> Tuple[Any, float]:
+        """Decode a Redis entry and copy it into L1 with its remaining TTL; returns (value, age)"""
+        entry = json.loads(raw) if isinstance(raw, (str, bytes)) else raw
+        if isinstance(entry, dict) and entry.keys() == {"stored_at", "value"}:
+            value, stored_at = entry["value"], entry["stored_at"]
+        else:
+            # Written before entries carried their write time: report it as old so it gets revalidated
+            value, stored_at = entry, 0.0
+        ttl = (pttl / 1000.0) if isinstance(pttl, int) and pttl > 0 else 60.0
+        self.memory.setex(key, ttl, value, stored_at=stored_at)
+        self.redis_hits += 1
+        return value, time.time() - stored_at
+
+    async def get(self, key: str) -> Any:
+        return (await self.get_entry(key))[0]
+
+    async def get_entry(self, key: str) -> Tuple[Any, float]:
+        """(value, seconds since it was stored) from L1, else Redis; (None, 0.0) on miss"""
+        value, _, age = self.memory.get_entry(key)
+        if value is not None:
+            return value, age
+        replies = await self._redis_call("get", lambda: self._redis_get_with_ttl([key]))
+        if not replies or replies[0] is None:
+            return None, 0.0
+        return self._promote(key, replies[0], replies[1])
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Multi-key fetch: L1 first, then one pipelined round-trip for the rest"""
+        found: Dict[str, Any] = {}
+        missing: List[str] = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        if missing:
+            replies = await self._redis_call("mget", lambda: self._redis_get_with_ttl(missing))
+            if replies:
+                for i, key in enumerate(missing):
+                    raw, pttl = replies[2 * i], replies[2 * i + 1]
+                    if raw is not None:
+                        found[key] = self._promote(key, raw, pttl)[0]
+        return found
+
+    async def setex(self, key: str, ttl: float, value: Any, recent_tool: Optional[str] = None) -> bool:
+        """Store in both tiers; with `recent_tool` also push onto that tool's recent-results list"""
+        stored_at = time.time()
+        self.memory.setex(key, ttl, value, stored_at=stored_at)
+        if recent_tool:
+            self.recent.record(recent_tool, value)
+        if self.redis is None:
+            return True
+
+        async def _write():
+            payload = json.dumps(value)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(key, int(ttl), json.dumps({"stored_at": stored_at, "value": value}))
+            if recent_tool:
+                recent_key = f"tool_recent:{recent_tool}"
+                pipe.lpush(recent_key, payload)
+                pipe.ltrim(recent_key, 0, self.recent_capacity - 1)
+                pipe.expire(recent_key, self.recent_ttl)
+            return await pipe.execute()
+
+        return await self._redis_call("setex", _write) is not None
+
+    async def recent_results(self, tool_name: str, limit: int = 3,
+                             accept: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """
+        Newest-first good results for a tool (Redis list, else local ring buffer).
+        `accept` re-checks entries on read, so anything recorded under an older,
+        looser definition of "good" is never served as a cached result.
+        """
+        cached = await self._redis_call("lrange", lambda: self.redis.lrange(f"tool_recent:{tool_name}", 0, self.recent_capacity - 1))
+        if cached:
+            results = [json.loads(item) for item in cached]
+            if accept is not None:
+                results = [result for result in results if accept(result)]
+            if results:
+                return results[:limit]
+        return self.recent.latest(tool_name, limit, accept)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "redis_configured": self.redis is not None,
+            "redis_available": self.redis_available,
+            "redis_timeout_ms": self.timeout * 1000,
+            "redis_hits": self.redis_hits,
+            "redis_timeouts": self.redis_timeouts,
+            "redis_errors": self.redis_errors,
+            "recent_results": self.recent.stats(),
+        }
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one shared in-flight task"""
+
+    def __init__(self):
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, group: str, field: str):
+        counters = self._counters.setdefault(group, {"executions": 0, "coalesced": 0})
+        counters[field] += 1
+
+    async def do(self, key: str, call, group: str = "default") -> Any:
+        """Await `call()` once per key; concurrent callers get copies of its result (or its exception)"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+            self._count(group, "executions")
+        else:
+            self._count(group, "coalesced")
+        # Shield so one caller's cancellation does not cancel the shared work
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget(self, key: str, task: "asyncio.Future[Any]"):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    def stats(self) -> Dict[str, Any]:
+        executions = sum(c["executions"] for c in self._counters.values())
+        coalesced = sum(c["coalesced"] for c in self._counters.values())
+        total = executions + coalesced
+        return {
+            "in_flight": len(self._inflight),
+            "executions": executions,
+            "coalesced": coalesced,
+            "duplicate_work_saved": round(coalesced / total, 4) if total else 0.0,
+            "by_tool": {group: dict(c) for group, c in self._counters.items()},
+        }
+
+
+_TURKISH_CASE_FOLD = str.maketrans({"İ": "i", "I": "ı"})
+
+
+def fold_turkish(text: str) -> str:
+    """Turkish-aware lowercase: 'İŞ' -> 'iş', 'IRMAK' -> 'ırmak' (plain str.lower() gives 'i̇ş')"""
+    # NFC first so a decomposed 'I' + combining dot becomes 'İ' before folding
+    return unicodedata.normalize("NFC", text).translate(_TURKISH_CASE_FOLD).lower()
+
+
+def normalize_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(fold_turkish(value).split())
+    if isinstance(value, dict):
+        return {k: normalize_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(v) for v in value]
+    return value
+
+
+class CacheKeyBuilder:
+    """
+    Canonical cache keys for tool calls.
+
+    Arguments are normalized before hashing so that requests differing only in
+    case, whitespace or explicitly-sent defaults share one cache entry. The
+    "query shape" (tool + which fields are set) is tracked for hit-rate metrics.
+    """
+
+    def __init__(self, namespace: str = "tool", digest_size: int = 16):
+        self.namespace = namespace
+        self.digest_size = digest_size
+        self._defaults: Dict[str, Dict[str, Any]] = {}
+        self._shape_stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, tool_name: str, defaults: Dict[str, Any]):
+        """Declare the default field values of a tool's request model"""
+        self._defaults[tool_name] = {k: normalize_value(v) for k, v in defaults.items()}
+
+    def normalize(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        defaults = self._defaults.get(tool_name, {})
+        normalized = {}
+        for name, value in args.items():
+            value = normalize_value(value)
+            if value is None or value == "" or (name in defaults and defaults[name] == value):
+                continue
+            normalized[name] = value
+        return normalized
+
+    def build(self, tool_name: str, args: Dict[str, Any], scope: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Return (cache_key, query_shape) for a tool call. `scope` names the calling
+        endpoint when it isn't the tool's own (e.g. İstinaf via search_yargitay).
+        """
+        normalized = self.normalize(tool_name, args)
+        payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=self.digest_size).hexdigest()
+        name = f"{tool_name}@{scope}" if scope else tool_name
+        shape = f"{name}({','.join(sorted(normalized))})"
+        return f"{self.namespace}:{name}:{digest}", shape
+
+    def record(self, shape: str, status: str):
+        """Count a cache outcome (HIT / STALE / MISS) for a query shape"""
+        with self._lock:
+            counters = self._shape_stats.setdefault(shape, {"HIT": 0, "STALE": 0, "MISS": 0})
+            counters[status] = counters.get(status, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            shapes = {}
+            for shape, counters in self._shape_stats.items():
+                total = sum(counters.values())
+                served = counters.get("HIT", 0) + counters.get("STALE", 0)
+                shapes[shape] = {**counters, "hit_rate": round(served / total, 4) if total else 0.0}
+        return {"registered_tools": sorted(self._defaults), "shapes": shapes}
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Adaptive, load-aware execution layer for ToolExecutionIsolator.
+
+Tool calls are admitted through a bounded queue in front of the process pool
+instead of piling up invisibly inside run_in_executor:
+- global and per-tool concurrency gates (FIFO), with queue-depth and wait-time metrics
+- fast rejection (ToolAdmissionError -> 429/503) when a queue is full or the
+  queue wait budget is exceeded
+- effective worker count adapts between min/max workers based on observed
+  queueing latency (the ProcessPoolExecutor is sized to max_workers and only
+  spawns processes on demand)
+- an asyncio-native mode for I/O-bound tools that don't need process isolation
+
+The processes themselves live in a RecyclingProcessPool: a job that times out
+retires its pool generation (new calls go to fresh workers) and the hung worker
+is terminated once the generation's other jobs have drained, so a stuck
+upstream cannot permanently eat a worker slot.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ToolAdmissionError(Exception):
+    """Raised when a tool call is rejected by admission control"""
+
+    def __init__(self, tool_name: str, reason: str, status_code: int = 503, retry_after: float = 1.0):
+        super().__init__(f"{tool_name}: {reason}")
+        self.tool_name = tool_name
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _PoolGeneration:
+    def __init__(self, number: int, executor: ProcessPoolExecutor):
+        self.number = number
+        self.executor = executor
+        self.tasks = 0
+        self.inflight = 0
+        self.hung = 0
+        self.retired = False
+        self.processes: List[Any] = []
+
+
+class RecyclingProcessPool:
+    """
+    ProcessPoolExecutor wrapper that replaces workers instead of losing them.
+
+    A ProcessPoolExecutor can't cancel a running job, and killing one of its
+    workers breaks the whole executor. So workers are managed in generations:
+    - on a timeout the current generation is retired; new calls get a fresh
+      executor, and once the old generation's remaining (healthy) jobs finish,
+      its processes - including the hung one - are terminated
+    - with max_tasks_per_child, a generation is retired gracefully after
+      max_workers * max_tasks_per_child jobs (workers exit once idle), which
+      bounds per-worker memory growth without needing the 'spawn' start method
+    """
+
+    def __init__(self, max_workers: int, initializer: Optional[Callable[[], None]] = None,
+                 max_tasks_per_child: int = 0):
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.max_tasks_per_child = max_tasks_per_child
+        self._generation_count = 0
+        self._current: Optional[_PoolGeneration] = None
+        self._retired: List[_PoolGeneration] = []
+
+        self.timeouts = 0
+        self.workers_reclaimed = 0
+        self.recycled_on_timeout = 0
+        self.recycled_on_task_limit = 0
+
+    def _generation(self) -> _PoolGeneration:
+        if self._current is None or self._current.retired:
+            self._generation_count += 1
+            self._current = _PoolGeneration(
+                self._generation_count,
+                ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+            )
+        return self._current
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: float) -> Any:
+        """Run `fn(*args)` in a worker; on timeout the worker is reclaimed and TimeoutError raised"""
+        generation = self._generation()
+        generation.tasks += 1
+        generation.inflight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(generation.executor, fn, *args), timeout=timeout)
+        except asyncio.TimeoutError:
+            # The job keeps running in its worker - retire the generation so it can be reclaimed
+            self.timeouts += 1
+            generation.hung += 1
+            if not generation.retired:
+                self.recycled_on_timeout += 1
+                self._retire(generation, f"job timed out after {timeout}s")
+            raise
+        finally:
+            generation.inflight -= 1
+            if (not generation.retired and self.max_tasks_per_child
+                    and generation.tasks >= self.max_workers * self.max_tasks_per_child):
+                self.recycled_on_task_limit += 1
+                self._retire(generation, f"reached {generation.tasks} tasks")
+            if generation.retired and generation.inflight == 0:
+                self._reap(generation)
+
+    def _retire(self, generation: _PoolGeneration, reason: str):
+        generation.retired = True
+        self._retired.append(generation)
+        logger.warning(f"Tool pool generation {generation.number} retired ({reason})")
+        # shutdown() drops the executor's process table, so keep a handle for reaping
+        generation.processes = list((getattr(generation.executor, "_processes", None) or {}).values())
+        # No new work goes to this executor; already submitted jobs are allowed to finish
+        generation.executor.shutdown(wait=False)
+        if generation.inflight == 0:
+            self._reap(generation)
+
+    def _reap(self, generation: _PoolGeneration):
+        """Terminate whatever is still running in a drained generation (i.e. hung jobs)"""
+        if generation not in self._retired:
+            return
+        self._retired.remove(generation)
+        if not generation.hung:
+            return  # Graceful recycle: idle workers exit on their own after shutdown()
+        reclaimed = 0
+        for process in generation.processes:
+            if process.is_alive():
+                process.terminate()
+                reclaimed += 1
+        self.workers_reclaimed += reclaimed
+        logger.warning(f"Tool pool generation {generation.number}: reclaimed {reclaimed} worker(s)")
+
+    def shutdown(self, wait: bool = True):
+        for generation in list(self._retired):
+            generation.inflight = 0
+            self._reap(generation)
+        if self._current is not None:
+            self._current.executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generation": self._generation_count,
+            "draining_generations": len(self._retired),
+            "max_tasks_per_child": self.max_tasks_per_child,
+            "timeouts": self.timeouts,
+            "workers_reclaimed": self.workers_reclaimed,
+            "recycled_on_timeout": self.recycled_on_timeout,
+            "recycled_on_task_limit": self.recycled_on_task_limit,
+        }
+
+
+class _CapacityGate:
+    """
+    FIFO asyncio gate whose capacity can be changed at runtime. Each waiter
+    parks on its own future and freed slots are handed to the oldest one;
+    free capacity with nobody queued is taken at once, even with timeout=0.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: float):
+        if not self._waiters and self.active < self.capacity:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as we gave up: pass it on
+                self.active -= 1
+                self._wake()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    async def release(self):
+        self.active -= 1
+        self._wake()
+
+    async def set_capacity(self, capacity: int):
+        self.capacity = capacity
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.active < self.capacity:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
+
+
+class _Ewma:
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.value = 0.0
+        self.max = 0.0
+        self.count = 0
+
+    def add(self, sample: float):
+        self.value = sample if self.count == 0 else (self.alpha * sample + (1 - self.alpha) * self.value)
+        self.max = max(self.max, sample)
+        self.count += 1
+
+
+class AdaptiveToolExecutor:
+    """Admission control + adaptive concurrency in front of a process pool"""
+
+    def __init__(self, process_pool: RecyclingProcessPool, min_workers: int = 2, max_workers: int = 4, max_queue: int = 32,
+                 max_queue_wait: float = 10.0, tool_limits: Optional[Dict[str, int]] = None,
+                 default_tool_limit: Optional[int] = None, adaptive: bool = True,
+                 scale_up_wait: float = 0.5, scale_down_idle: float = 60.0, scale_cooldown: float = 5.0):
+        self.process_pool = process_pool
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.max_queue_wait = max_queue_wait
+        self.tool_limits = dict(tool_limits or {})
+        self.default_tool_limit = default_tool_limit or max_workers
+        self.adaptive = adaptive
+        self.scale_up_wait = scale_up_wait
+        self.scale_down_idle = scale_down_idle
+        self.scale_cooldown = scale_cooldown
+
+        self._pool_gate = _CapacityGate(min_workers if adaptive else max_workers)
+        self._tool_gates: Dict[str, _CapacityGate] = {}
+        # Calls not yet admitted, whichever gate (tool or pool) they are parked on
+        self.queued = 0
+
+        self._wait = _Ewma()
+        self._run = _Ewma()
+        self._last_scale = 0.0
+        self._last_busy = time.monotonic()
+        self.scale_ups = 0
+        self.scale_downs = 0
+        self.rejected: Dict[str, int] = {}
+        self.completed = 0
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _tool_gate(self, tool_name: str) -> _CapacityGate:
+        gate = self._tool_gates.get(tool_name)
+        if gate is None:
+            gate = self._tool_gates[tool_name] = _CapacityGate(self.tool_limits.get(tool_name, self.default_tool_limit))
+        return gate
+
+    def _reject(self, tool_name: str, reason: str, status_code: int) -> ToolAdmissionError:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        retry_after = max(1.0, self._wait.value + self._run.value)
+        logger.warning(f"Tool {tool_name} rejected ({reason})")
+        return ToolAdmissionError(tool_name, reason, status_code, retry_after)
+
+    @asynccontextmanager
+    async def _admitted(self, tool_name: str, use_pool: bool):
+        tool_gate = self._tool_gate(tool_name)
+        # Per-tool backlog beyond a few calls per slot means this tool is overloaded (429);
+        # a full global queue (every call not yet admitted, on either gate) means the whole backend is (503)
+        if tool_gate.waiting >= tool_gate.capacity * 4:
+            raise self._reject(tool_name, "tool_queue_full", 429)
+        if self.queued >= self.max_queue:
+            raise self._reject(tool_name, "queue_full", 503)
+
+        enqueued = time.monotonic()
+        self.queued += 1
+        try:
+            try:
+                await tool_gate.acquire(self.max_queue_wait)
+            except asyncio.TimeoutError:
+                raise self._reject(tool_name, "queue_wait_exceeded", 503)
+            if use_pool:
+                remaining = max(0.0, self.max_queue_wait - (time.monotonic() - enqueued))
+                try:
+                    await self._pool_gate.acquire(remaining)
+                except BaseException as e:
+                    await tool_gate.release()
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise self._reject(tool_name, "queue_wait_exceeded", 503)
+                    raise
+        finally:
+            self.queued -= 1
+        try:
+            self._wait.add(time.monotonic() - enqueued)
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                self._run.add(time.monotonic() - started)
+                self.completed += 1
+                if use_pool:
+                    await self._pool_gate.release()
+                    await self._maybe_scale()
+        finally:
+            await tool_gate.release()
+
+    # ------------------------------------------------------------------
+    # Execution modes
+    # ------------------------------------------------------------------
+
+    async def run_in_pool(self, tool_name: str, fn: Callable[..., Any], *args: Any, timeout: float) -> Any:
+        """Run `fn(*args)` in the process pool once admitted; timeout covers execution only"""
+        async with self._admitted(tool_name, use_pool=True):
+            return await self.process_pool.run(fn, *args, timeout=timeout)
+
+    async def run_native(self, tool_name: str, call: Callable[[], Awaitable[Any]], timeout: float) -> Any:
+        """asyncio-native mode: run an I/O-bound coroutine on the event loop, no process slot"""
+        async with self._admitted(tool_name, use_pool=False):
+            return await asyncio.wait_for(call(), timeout=timeout)
+
+    def native_slot(self, tool_name: str):
+        """run_native's admission as a context manager, for work that isn't one awaitable (streams)"""
+        return self._admitted(tool_name, use_pool=False)
+
+    # ------------------------------------------------------------------
+    # Adaptive sizing
+    # ------------------------------------------------------------------
+
+    async def _maybe_scale(self):
+        if not self.adaptive:
+            return
+        now = time.monotonic()
+        if self._pool_gate.waiting > 0:
+            self._last_busy = now
+        if now - self._last_scale < self.scale_cooldown:
+            return
+
+        capacity = self._pool_gate.capacity
+        if self._wait.value > self.scale_up_wait and capacity < self.max_workers:
+            await self._pool_gate.set_capacity(capacity + 1)
+            self.scale_ups += 1
+            self._last_scale = now
+            logger.info(f"Tool pool scaled up to {capacity + 1} workers (queue wait {self._wait.value * 1000:.0f}ms)")
+        elif (capacity > self.min_workers and self._pool_gate.waiting == 0
+              and self._wait.value < self.scale_up_wait / 4 and now - self._last_busy > self.scale_down_idle):
+            await self._pool_gate.set_capacity(capacity - 1)
+            self.scale_downs += 1
+            self._last_scale = now
+            logger.info(f"Tool pool scaled down to {capacity - 1} workers")
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": {
+                "current": self._pool_gate.capacity,
+                "min": self.min_workers,
+                "max": self.max_workers,
+                "busy": self._pool_gate.active,
+                "adaptive": self.adaptive,
+                "scale_ups": self.scale_ups,
+                "scale_downs": self.scale_downs,
+            },
+            "queue": {
+                "depth": self.queued,
+                "max": self.max_queue,
+                "max_wait_seconds": self.max_queue_wait,
+                "wait_ms_ewma": round(self._wait.value * 1000, 2),
+                "wait_ms_max": round(self._wait.max * 1000, 2),
+            },
+            "processes": self.process_pool.stats(),
+            "run_ms_ewma": round(self._run.value * 1000, 2),
+            "completed": self.completed,
+            "rejected": dict(self.rejected),
+            "tools": {
+                name: {"limit": gate.capacity, "running": gate.active, "waiting": gate.waiting}
+                for name, gate in self._tool_gates.items()
+            },
+        }
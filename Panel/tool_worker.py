@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Per-worker runtime for the ToolExecutionIsolator process pool.
+
+Each ProcessPoolExecutor worker builds one long-lived asyncio event loop and one
+warm RealLegalAPIConnector (with its aiohttp session) when it starts, and reuses
+them for every tool call it serves. This avoids re-importing the connector,
+creating/closing a loop and re-doing TLS handshakes on every request.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from multiprocessing import util as _mp_util
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Worker-process state, populated by init_tool_worker()
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_connector = None
+
+
+def _ensure_backend_path():
+    """Make sure sibling modules (real_api_connector, ...) are importable in spawned workers"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    if backend_dir not in sys.path:
+        sys.path.append(backend_dir)
+
+
+def init_tool_worker():
+    """
+    ProcessPoolExecutor initializer: build the worker's event loop and warm connector.
+    Runs once per worker process; failures are tolerated and retried lazily on first call.
+    """
+    global _worker_loop, _worker_connector
+    if _worker_loop is not None and not _worker_loop.is_closed():
+        return
+
+    _ensure_backend_path()
+    from real_api_connector import RealLegalAPIConnector
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    connector = RealLegalAPIConnector()
+    try:
+        # Open the aiohttp session up front so the first request is already warm
+        loop.run_until_complete(connector.ensure_session())
+    except Exception as e:
+        logger.warning(f"Tool worker {os.getpid()} could not pre-open connector session: {e}")
+
+    _worker_loop = loop
+    _worker_connector = connector
+
+    # atexit does not run in pool workers; multiprocessing finalizers do
+    _mp_util.Finalize(None, shutdown_tool_worker, exitpriority=10)
+    logger.info(f"Tool worker {os.getpid()} initialized (persistent loop + warm connector)")
+
+
+def shutdown_tool_worker():
+    """Close the worker's connector session and event loop"""
+    global _worker_loop, _worker_connector
+    loop, connector = _worker_loop, _worker_connector
+    _worker_loop = None
+    _worker_connector = None
+    if loop is None or loop.is_closed():
+        return
+    try:
+        if connector is not None:
+            loop.run_until_complete(connector.close_session())
+    except Exception:
+        pass
+    finally:
+        loop.close()
+
+
+def run_connector_call(call: Callable[[Any], Awaitable[Any]]) -> Any:
+    """
+    Run `call(connector)` on this worker's persistent loop and warm connector.
+    Initializes the runtime lazily if the pool was created without the initializer.
+    """
+    if _worker_loop is None or _worker_loop.is_closed():
+        init_tool_worker()
+    return _worker_loop.run_until_complete(call(_worker_connector))
+
+
+def run_connector_call_once(call: Callable[[Any], Awaitable[Any]]) -> Any:
+    """
+    Legacy per-call mode: fresh loop and connector for a single call.
+    The connector session is closed before the loop so it is never orphaned.
+    """
+    _ensure_backend_path()
+    from real_api_connector import RealLegalAPIConnector
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    connector = RealLegalAPIConnector()
+    try:
+        return loop.run_until_complete(call(connector))
+    finally:
+        try:
+            loop.run_until_complete(connector.close_session())
+        finally:
+            loop.close()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Warm Selenium WebDriver sessions for the scraping jobs.
+
+Starting Chrome + chromedriver is the largest fixed cost of a scrape. The
+scraping threads (panel_backend_enterprise run_*_scraping, selenium/web_panel
+run_*_search, selenium_scraper.SeleniumScraper) lease a session instead:
+
+    with webdriver_pool.lease(headless=True, start_url=url) as driver:
+        ...
+
+- between jobs a session is reset: cookies, local/session storage, extra
+  windows and implicit wait are cleared and it is parked on about:blank;
+  the next lease navigates it to its search form
+- sessions are health-checked when leased; "invalid session id",
+  "target frame detached" and similar errors (or a failed probe) discard the
+  session and a fresh one replaces it
+- sessions are retired after `max_uses` jobs or `idle_seconds` unused
+- at most `max_size` sessions exist; extra callers wait up to `lease_timeout`
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Error texts that mean the browser session itself is gone, not just the page
+DEAD_SESSION_MARKERS = (
+    "invalid session id",
+    "target frame detached",
+    "no such window",
+    "chrome not reachable",
+    "session deleted",
+    "disconnected",
+    "target window already closed",
+)
+
+
+class WebDriverPoolTimeout(TimeoutError):
+    """No WebDriver session became free within the lease timeout"""
+
+
+def is_dead_session_error(error: BaseException) -> bool:
+    text = str(error).lower()
+    return any(marker in text for marker in DEAD_SESSION_MARKERS)
+
+
+class _Session:
+    def __init__(self, driver: Any, headless: bool):
+        self.driver = driver
+        self.headless = headless
+        self.uses = 0
+        self.leased_at = 0.0
+        self.idle_since = time.monotonic()
+
+
+class WebDriverPool:
+    def __init__(self, max_size: int = 2, max_uses: int = 50, idle_seconds: float = 300.0,
+                 lease_timeout: float = 120.0, user_agent: str = DEFAULT_USER_AGENT):
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self.idle_seconds = idle_seconds
+        self.lease_timeout = lease_timeout
+        self.user_agent = user_agent
+
+        self._idle: List[_Session] = []
+        self._leased: Dict[int, _Session] = {}
+        self._cond = threading.Condition()
+        self._starting = 0
+        self._closed = False
+
+        self.created = 0
+        self.reused = 0
+        self.replaced = 0
+        self.retired = 0
+        self.lease_timeouts = 0
+        self.leases = 0
+        self._wait_total = 0.0
+        self._busy_seconds = 0.0
+        self._started_at = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Session lifecycle
+    # ------------------------------------------------------------------
+
+    def _options(self, headless: bool):
+        from selenium.webdriver.chrome.options import Options
+        options = Options()
+        if headless:
+            options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument(f"--user-agent={self.user_agent}")
+        return options
+
+    def _create(self, headless: bool) -> _Session:
+        from selenium import webdriver
+        driver = webdriver.Chrome(options=self._options(headless))
+        self.created += 1
+        logger.info(f"WebDriver session started (headless={headless}, total created {self.created})")
+        return _Session(driver, headless)
+
+    @staticmethod
+    def _quit(session: _Session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _healthy(session: _Session) -> bool:
+        try:
+            session.driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            logger.warning(f"WebDriver session failed health check: {e}")
+            return False
+
+    @staticmethod
+    def _reset(session: _Session):
+        """Drop per-job state so the next job starts like a fresh browser"""
+        driver = session.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass  # Not available on some pages (e.g. about:blank, error pages)
+        driver.delete_all_cookies()
+        driver.implicitly_wait(0)
+        driver.get("about:blank")
+
+    def _take_idle(self, headless: bool) -> Optional[_Session]:
+        """Matching idle session (most recently used first); caller holds the lock"""
+        now = time.monotonic()
+        for session in [s for s in self._idle if now - s.idle_since > self.idle_seconds]:
+            self._idle.remove(session)
+            self.retired += 1
+            threading.Thread(target=self._quit, args=(session,), daemon=True).start()
+        for session in reversed(self._idle):
+            if session.headless == headless:
+                self._idle.remove(session)
+                return session
+        # A different-mode idle session only blocks capacity: retire it for the new one
+        if self._idle and len(self._leased) + len(self._idle) + self._starting >= self.max_size:
+            session = self._idle.pop(0)
+            self.retired += 1
+            threading.Thread(target=self._quit, args=(session,), daemon=True).start()
+        return None
+
+    # ------------------------------------------------------------------
+    # Lease API
+    # ------------------------------------------------------------------
+
+    def acquire(self, headless: bool = True, start_url: Optional[str] = None,
+                timeout: Optional[float] = None) -> Any:
+        """Borrow a healthy driver, optionally already navigated to `start_url`"""
+        waited_from = time.monotonic()
+        deadline = waited_from + (timeout or self.lease_timeout)
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("WebDriver pool is closed")
+                    session = self._take_idle(headless)
+                    if session is not None:
+                        break
+                    if len(self._leased) + len(self._idle) + self._starting < self.max_size:
+                        self._starting += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.lease_timeouts += 1
+                        raise WebDriverPoolTimeout(f"No WebDriver session free within {timeout or self.lease_timeout:.0f}s")
+                    self._cond.wait(remaining)
+
+            created = session is None
+            if created:
+                try:
+                    session = self._create(headless)
+                except BaseException:
+                    with self._cond:
+                        self._starting -= 1
+                        self._cond.notify_all()
+                    raise
+            elif self._healthy(session):
+                self.reused += 1
+            else:
+                self.replaced += 1
+                self._quit(session)
+                with self._cond:
+                    self._cond.notify_all()
+                continue
+
+            with self._cond:
+                if created:
+                    self._starting -= 1
+                session.uses += 1
+                session.leased_at = time.monotonic()
+                self._leased[id(session.driver)] = session
+                self.leases += 1
+                self._wait_total += session.leased_at - waited_from
+
+            if start_url:
+                try:
+                    session.driver.get(start_url)
+                except Exception as e:
+                    dead = is_dead_session_error(e)
+                    self.release(session.driver, discard=dead)
+                    if dead:
+                        continue
+                    raise
+            return session.driver
+
+    def release(self, driver: Any, discard: bool = False):
+        """Return a driver; it is reset for reuse unless discarded, worn out or broken"""
+        with self._cond:
+            session = self._leased.pop(id(driver), None)
+            if session is None:
+                return
+            self._busy_seconds += time.monotonic() - session.leased_at
+
+        keep = not discard and not self._closed and session.uses < self.max_uses
+        if keep:
+            try:
+                self._reset(session)
+            except Exception as e:
+                logger.warning(f"WebDriver reset failed, discarding session: {e}")
+                keep = False
+        if not keep:
+            if discard:
+                self.replaced += 1
+            else:
+                self.retired += 1
+            self._quit(session)
+
+        with self._cond:
+            if keep:
+                session.idle_since = time.monotonic()
+                self._idle.append(session)
+            self._cond.notify_all()
+
+    @contextmanager
+    def lease(self, headless: bool = True, start_url: Optional[str] = None,
+              timeout: Optional[float] = None) -> Iterator[Any]:
+        driver = self.acquire(headless, start_url, timeout)
+        discard = False
+        try:
+            yield driver
+        except BaseException as e:
+            discard = is_dead_session_error(e)
+            raise
+        finally:
+            self.release(driver, discard=discard)
+
+    def close(self):
+        """Quit every session (idle now, leased ones when they come back)"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for session in idle:
+            self._quit(session)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            elapsed = max(time.monotonic() - self._started_at, 1e-9)
+            busy = self._busy_seconds + sum(time.monotonic() - s.leased_at for s in self._leased.values())
+            return {
+                "max_size": self.max_size,
+                "in_use": len(self._leased),
+                "idle": len(self._idle),
+                "starting": self._starting,
+                "utilization": round(busy / (self.max_size * elapsed), 4),
+                "leases": self.leases,
+                "created": self.created,
+                "reused": self.reused,
+                "replaced": self.replaced,
+                "retired": self.retired,
+                "lease_timeouts": self.lease_timeouts,
+                "avg_wait_ms": round(self._wait_total / self.leases * 1000, 1) if self.leases else 0.0,
+                "max_uses": self.max_uses,
+            }
+
+
+# Process-wide pool shared by the scraping threads
+webdriver_pool = WebDriverPool(
+    max_size=int(os.getenv("WEBDRIVER_POOL_SIZE", "2")),
+    max_uses=int(os.getenv("WEBDRIVER_MAX_USES", "50")),
+    idle_seconds=float(os.getenv("WEBDRIVER_IDLE_SECONDS", "300")),
+    lease_timeout=float(os.getenv("WEBDRIVER_LEASE_TIMEOUT", "120"))
+)
+atexit.register(webdriver_pool.close)